@@ -1,5 +1,6 @@
 docker run --rm -it \
   -v "$(pwd)/calc-vpts.py":/app/calc-vpts.py:ro \
+  -v "$(pwd)/vptc":/app/vptc:ro \
   -v "$(pwd)/output":/app/output \
   vptc-calculator
 
@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from vptc import Params, batch, preview
+from vptc.batch import design_name, run_batch
+
+
+def test_default_names_differ_in_any_parameter():
+    assert design_name(Params()) == "8_7.83_6_28_70"
+    assert design_name(Params(resolution=1000)) != design_name(Params(resolution=2000))
+
+
+def test_preview_figure_is_reused(tmp_path, monkeypatch):
+    pytest.importorskip("matplotlib")
+    created = []
+    original = preview.PreviewRenderer.__init__
+
+    def counting(self, *args, **kwargs):
+        created.append(self)
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(preview.PreviewRenderer, "__init__", counting)
+    # Фигура процесса, созданная тестом, не должна остаться в модуле после него
+    monkeypatch.setattr(batch, "_renderer", None)
+    manifest = tmp_path / "designs.jsonl"
+    manifest.write_text("\n".join(json.dumps({"i": 8, "resolution": r}) for r in (100, 200, 300)) + "\n")
+    records = list(run_batch(str(manifest), str(tmp_path / "out"), jobs=1,
+                             options={"preview_format": "png"}))
+    assert [r["status"] for r in records] == ["ok"] * 3
+    assert all(any(f.endswith(".png") for f in r["files"]) for r in records)
+    assert len(created) == 1
@@ -0,0 +1,51 @@
+import os
+from dataclasses import fields
+
+import numpy as np
+import pytest
+
+from vptc import Design, Params
+from vptc.cache import DESIGN_FILE, DesignCache, cache_key
+
+PARAMS = Params(resolution=200)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DesignCache(str(tmp_path / "cache"))
+
+
+@pytest.mark.parametrize("name, data", [(DESIGN_FILE, b'{"e": 1.5'), ("x_rigid.npy", b""),
+                                        ("x_rigid.npy", b"\x93NUMPY\x01\x00")])
+def test_corrupt_entry_is_a_miss(cache, name, data):
+    cache.design(PARAMS)
+    entry = cache.path(cache_key(PARAMS))
+    with open(os.path.join(entry, name), "wb") as f:
+        f.write(data)
+    assert cache.load(PARAMS) is None
+    assert not os.path.exists(entry)
+    # Следующий запрос строит и кладёт запись заново
+    cache.design(PARAMS)
+    assert cache.load(PARAMS) is not None
+
+
+def test_entry_without_design_file_is_rebuilt(cache):
+    cache.design(PARAMS)
+    entry = cache.path(cache_key(PARAMS))
+    os.remove(os.path.join(entry, DESIGN_FILE))
+    assert cache.load(PARAMS) is None
+    cache.design(PARAMS)
+    assert os.path.exists(os.path.join(entry, DESIGN_FILE))
+
+
+def test_store_load_round_trip(cache):
+    d = cache.design(PARAMS)
+    loaded = cache.load(PARAMS)
+    assert loaded is not None
+    for f in fields(Design):
+        value, restored = getattr(d, f.name), getattr(loaded, f.name)
+        if f.type is np.ndarray:
+            np.testing.assert_array_equal(restored, value)
+        elif f.name != "scad_text":
+            assert restored == value, f.name
+    assert loaded.scad == d.scad
@@ -0,0 +1,36 @@
+import json
+
+from vptc.check import check_lines
+from vptc.cli import main
+
+LINES = [
+    "{}",
+    "",
+    "# комментарий",
+    '{"name": "мелкий", "Rout": 10}',
+    '{"i": 8,',
+    "[1]",
+    '{"foo": 1}',
+]
+
+
+def test_check_lines():
+    records = list(check_lines(LINES))
+    assert len(records) == 5
+    assert records[0]["feasible"] and records[0]["bearing_name"] == "6808-2RS"
+    assert records[1]["name"] == "мелкий"
+    assert not records[1]["feasible"] and "Rin" in records[1]["error"]
+    for record, line_no in zip(records[2:], (5, 6, 7)):
+        assert not record["feasible"]
+        assert record["error"].startswith(f"Строка {line_no}:")
+
+
+def test_check_exit_code(tmp_path, capsys):
+    valid = tmp_path / "valid.jsonl"
+    valid.write_text('{}\n{"i": 12, "d_roller": 4, "Rout": 34, "D": 90}\n', encoding="utf-8")
+    assert main(["check", str(valid)]) == 0
+    assert all(json.loads(line)["feasible"] for line in capsys.readouterr().out.splitlines())
+    invalid = tmp_path / "invalid.jsonl"
+    invalid.write_text("{}\nне JSON\n", encoding="utf-8")
+    assert main(["check", str(invalid)]) == 1
+    assert [json.loads(line)["feasible"] for line in capsys.readouterr().out.splitlines()] == [True, False]
@@ -0,0 +1,10 @@
+from vptc import Params, design
+from vptc.clearance import CONTACT_TOLERANCE, design_clearances
+
+
+def test_nominal_design_has_no_interference():
+    checks = {c.name: c for c in design_clearances(design(Params()))}
+    assert set(checks) == {"roller_profile", "roller_roller", "roller_separator", "separator_profile"}
+    # Профиль нарезан под ролики: касание с точностью до прогиба хорд
+    assert abs(checks["roller_profile"].value) < CONTACT_TOLERANCE
+    assert all(c.ok for c in checks.values())
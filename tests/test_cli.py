@@ -0,0 +1,16 @@
+import pytest
+
+from vptc.cli import main
+
+
+# Некорректные аргументы режимов дают сообщение и код 1, а не трассировку
+@pytest.mark.parametrize("argv", [
+    ["simulate", "--resolution", "200", "--steps", "0"],
+    ["optimize", "--rout", "10:80:0"],
+    ["optimize", "--rout", "80:10:0.5"],
+    ["tolerance", "--resolution", "200", "--samples", "0"],
+    ["tolerance", "--resolution", "200", "--samples", "10", "-j", "-1"],
+])
+def test_bad_arguments_fail_cleanly(argv, capsys):
+    assert main(argv) == 1
+    assert "Ошибка:" in capsys.readouterr().out
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from vptc import Params, design
+from vptc import kinematics
+from vptc.kinematics import simulate
+
+
+@pytest.fixture(scope="module")
+def fine():
+    # При 6000 точках кинематика сошлась: результат не зависит от способа поиска концов
+    return design(Params(resolution=6000))
+
+
+def test_steps_must_be_positive(fine):
+    with pytest.raises(ValueError):
+        simulate(fine, steps=0)
+
+
+def test_warm_start_matches_grid_search(fine, monkeypatch):
+    warm = simulate(fine, 1.0, 3600)
+    monkeypatch.setattr(kinematics, "WARM_STRIDE", 1)
+    grid = simulate(fine, 1.0, 3600)
+    assert warm.summary()["unresolved_steps"] == 0
+    np.testing.assert_allclose(warm.backlash, grid.backlash, atol=1e-9)
+    np.testing.assert_allclose(warm.clearance, grid.clearance, atol=1e-9)
+
+
+def test_unresolved_steps_are_nan(fine):
+    # Ролик на 2% больше, чем нарезан профиль: натяг во всём окне на каждом шаге
+    sim = simulate(fine, 1.0, 360, r_roller=fine.r_roller * 1.02)
+    assert not sim.resolved.any()
+    assert np.isnan(sim.backlash).all()
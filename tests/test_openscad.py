@@ -0,0 +1,8 @@
+from vptc import openscad
+from vptc.cli import main
+
+
+def test_missing_openscad_fails(tmp_path, monkeypatch):
+    monkeypatch.setenv(openscad.OPENSCAD_ENV, str(tmp_path / "нет-openscad"))
+    assert openscad.find_openscad() is None
+    assert main(["openscad", str(tmp_path)]) == 1
@@ -0,0 +1,20 @@
+import pytest
+
+from vptc.optimize import optimize
+
+
+@pytest.mark.parametrize("Rout_range", [(10.0, 80.0, 0.0), (10.0, 80.0, -0.5), (80.0, 10.0, 0.5)])
+def test_bad_rout_range(Rout_range):
+    with pytest.raises(ValueError):
+        optimize(8, [7.83], Rout_range, wall=7.0)
+
+
+def test_empty_rollers():
+    with pytest.raises(ValueError):
+        optimize(8, [], (10.0, 80.0, 0.5), wall=7.0)
+
+
+def test_finds_housing():
+    d = optimize(8, [7.83], (10.0, 80.0, 0.5), wall=7.0, resolution=200)
+    assert d is not None
+    assert d.params.D / 2 - d.params.Rout >= 7.0 - 1e-9
@@ -0,0 +1,26 @@
+import os
+import re
+
+from vptc.cli import main
+
+BASELINE = os.path.join(os.path.dirname(__file__), "data", "baseline_default.scad")
+
+
+def _inline_holes(text):
+    """Возвращает координаты отверстий A на место обращений hole_x[i]/hole_y[i], как в исходном скрипте."""
+    lists = dict(re.findall(r"^(hole_[xy]) = (\[.*\]);$", text, re.M))
+    text = re.sub(r"// === Группа A: крепёжные отверстия корпуса и крышки ===\nhole_x = .*\nhole_y = .*\n\n", "",
+                  text)
+    for name, values in lists.items():
+        text = text.replace(f"{name}[i]", f"{values}[i]")
+    return text
+
+
+def test_default_scad_matches_baseline(tmp_path):
+    # Эталон — вывод исходного calc-vpts.py с параметрами по умолчанию
+    output = tmp_path / "vptc_roller.scad"
+    assert main(["-q", "-o", str(output)]) == 0
+    text = output.read_text(encoding="utf-8")
+    assert "hole_x = [" in text
+    with open(BASELINE, encoding="utf-8") as f:
+        assert _inline_holes(text) == f.read()
@@ -0,0 +1,29 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from vptc import Params, design
+from vptc.stl import PART_MESHES, STL_PARTS
+
+DESIGNS = [Params(), Params(i=12, d_roller=4, Rout=34, D=90)]
+
+
+@pytest.fixture(scope="module", params=DESIGNS, ids=["default", "i12"])
+def model(request):
+    return design(request.param)
+
+
+@pytest.mark.parametrize("part", STL_PARTS)
+def test_mesh_is_watertight(model, part):
+    tris = PART_MESHES[part](model, 60)
+    # Замкнутая ориентированная поверхность: каждому ребру ровно одно встречное
+    points = [tuple(p) for p in np.round(tris, 6).reshape(-1, 3)]
+    edges = Counter()
+    for k in range(0, len(points), 3):
+        a, b, c = points[k:k + 3]
+        edges.update(((a, b), (b, c), (c, a)))
+    assert max(edges.values()) == 1
+    assert all(edges[b, a] == 1 for a, b in edges)
+    volume = np.einsum("ij,ij->i", tris[:, 0], np.cross(tris[:, 1], tris[:, 2])).sum() / 6
+    assert volume > 0
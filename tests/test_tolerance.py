@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from vptc import Params, design
+from vptc.tolerance import analyze
+
+ZERO = {name: "0" for name in ("d_roller", "e", "Rout", "rd")}
+
+
+@pytest.fixture(scope="module")
+def nominal():
+    return design(Params())
+
+
+def test_zero_tolerances_do_not_jam(nominal):
+    result = analyze(nominal, samples=100, tolerances=ZERO)
+    assert not np.any(result.jammed)
+    assert result.summary()["jam_fraction"] == 0.0
+
+
+@pytest.mark.parametrize("kwargs", [{"samples": 0}, {"samples": 10, "angles": 0}, {"samples": 10, "jobs": -1}])
+def test_bad_arguments(nominal, kwargs):
+    with pytest.raises(ValueError):
+        analyze(nominal, **kwargs)
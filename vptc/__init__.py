@@ -0,0 +1,15 @@
+"""Калькулятор ВПТК: расчёт профиля жёсткого колеса и генерация OpenSCAD-модели."""
+
+__version__ = "0.1.0"
+
+from .rules import Params, GeometryError
+
+__all__ = ["Params", "Design", "GeometryError", "design", "__version__"]
+
+
+def __getattr__(name):
+    # Расчёт (и numpy) загружается при первом обращении: vptc.check обходится без него
+    if name in ("Design", "design"):
+        from . import core
+        return getattr(core, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,246 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import traceback
+from dataclasses import fields
+from multiprocessing import Pool
+
+from . import dxf, preview, scad, stl
+from .cache import DesignCache, add_cache_arguments, cache_key
+from .core import GeometryError, Params, design
+
+RESULTS_FILE = "results.jsonl"
+SCAD_NAME = "vptc_roller.scad"
+# Статусы, после которых вариант при повторном запуске не пересчитывается:
+# "error" — параметры недопустимы, повтор даст то же; "failed" (сбой) пересчитывается
+DONE_STATUSES = ("ok", "error")
+# Параметры, входящие в имя варианта по умолчанию явно; остальные, если отличаются от умолчаний, — хэшем
+NAME_FIELDS = ("i", "d_roller", "h_roller", "Rout", "D")
+
+
+def design_name(p):
+    """i_d_h_Rout_D; если заданы и другие параметры — с короткой меткой от всех параметров,
+    чтобы варианты, различающиеся, например, только resolution, не писались в один каталог."""
+    name = preview.preview_name(p)[len("vptc_roller_"):]
+    defaults = Params()
+    if any(getattr(p, f.name) != getattr(defaults, f.name) for f in fields(p) if f.name not in NAME_FIELDS):
+        text = json.dumps(p.to_dict(), sort_keys=True)
+        name += "_" + hashlib.sha256(text.encode("utf-8")).hexdigest()[:8]
+    return name
+
+
+def read_manifest(path):
+    """Задачи манифеста по одной: (номер строки, имя, Params или текст ошибки).
+
+    Строка манифеста — JSON-объект с параметрами Params и необязательным
+    полем "name" (каталог результатов, по умолчанию design_name).
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            try:
+                values = json.loads(line)
+                name = values.pop("name", None)
+                p = Params.from_dict({**Params().to_dict(), **values})
+            except (ValueError, TypeError, AttributeError) as exc:
+                yield line_no, f"line{line_no}", f"Строка {line_no}: {exc}"
+                continue
+            name = str(name or design_name(p))
+            if os.path.basename(name) != name or name.startswith("."):
+                yield line_no, f"line{line_no}", f"Строка {line_no}: недопустимое имя каталога {name!r}"
+                continue
+            yield line_no, name, p
+
+
+def read_results(path):
+    """Уже обработанные варианты из журнала: имя -> (ключ параметров, статус)."""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Оборванная последняя строка прерванного запуска
+                continue
+            done[record["name"]] = (record.get("key"), record["status"])
+    return done
+
+
+def write_artifacts(d, directory, stl_parts=(), fn=stl.DEFAULT_FN, dxf_file=False, dxf_spline=False,
+                    preview_format=None, scad_parts=False, store=None, renderer=None):
+    """Файлы модели в directory; возвращает (список файлов, предупреждения).
+
+    renderer — PreviewRenderer для эскиза; без него фигура строится заново.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, SCAD_NAME)
+    with open(path, "w") as f:
+        d.write_scad(f)
+    files, warnings = [path], []
+    prefix = os.path.splitext(path)[0]
+    if scad_parts:
+        scad.write_parts(d, prefix + "_parts")
+        files.append(prefix + "_parts")
+    if dxf_file or dxf_spline:
+        try:
+            files.append(dxf.write_dxf(d, prefix + ".dxf", spline=dxf_spline))
+        except RuntimeError as exc:
+            warnings.append(f"DXF: {exc}")
+    if preview_format:
+        try:
+            path = f"{prefix}.{preview_format}"
+            files.append(renderer.save(d, path) if renderer else preview.write_preview(d, path))
+        except RuntimeError as exc:
+            warnings.append(f"Эскиз: {exc}")
+    for part in stl_parts:
+        try:
+            if store:
+                part_path = f"{prefix}_{part}.stl"
+                with open(part_path, "wb") as f:
+                    f.write(store.stl(d, part, fn))
+            else:
+                part_path, = stl.export_stl(d, prefix, [part], fn)
+        except ValueError as exc:
+            warnings.append(f"{part}: {exc}")
+            continue
+        files.append(part_path)
+    return files, warnings
+
+
+# Фигура эскизов процесса: создаётся один раз инициализатором пула и переиспользуется всеми вариантами
+_renderer = None
+
+
+def _init_worker(preview_format):
+    global _renderer
+    if preview_format:
+        try:
+            _renderer = preview.PreviewRenderer()
+        except RuntimeError:
+            # Без matplotlib write_artifacts сообщит об этом предупреждением у каждого варианта
+            _renderer = None
+
+
+def run_task(task):
+    """Расчёт и запись одного варианта; возвращает строку журнала.
+
+    Файлы пишутся во временный каталог, который после записи переименовывается
+    в каталог варианта: прерванный запуск не оставляет полузаписанных результатов.
+    """
+    line_no, name, p, out_dir, options, cache = task
+    if isinstance(p, str):
+        return {"line": line_no, "name": name, "key": None, "status": "error", "error": p}
+    record = {"line": line_no, "name": name, "key": cache_key(p), "params": p.to_dict()}
+    started = time.perf_counter()
+    directory = os.path.join(out_dir, name)
+    partial = os.path.join(out_dir, f".{name}.partial")
+    try:
+        store = DesignCache(*cache) if cache else None
+        d = store.design(p) if store else design(p)
+        shutil.rmtree(partial, ignore_errors=True)
+        files, warnings = write_artifacts(d, partial, store=store, renderer=_renderer, **options)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(partial, directory)
+        record.update(status="ok", files=[os.path.join(directory, os.path.relpath(f, partial)) for f in files])
+        if warnings:
+            record["warnings"] = warnings
+    except GeometryError as exc:
+        record.update(status="error", error=str(exc))
+    except Exception as exc:
+        shutil.rmtree(partial, ignore_errors=True)
+        record.update(status="failed", error=f"{type(exc).__name__}: {exc}",
+                      traceback=traceback.format_exc(limit=5))
+    record["seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def pending_tasks(manifest, out_dir, done, options, cache=None, retry_errors=False):
+    """Задачи манифеста, которых ещё нет в журнале с теми же параметрами."""
+    finished = DONE_STATUSES if not retry_errors else ("ok",)
+    seen = set()
+    for line_no, name, p in read_manifest(manifest):
+        if name in seen:
+            p = f"Строка {line_no}: имя {name} уже встречалось в манифесте"
+            name = f"line{line_no}"
+        seen.add(name)
+        key = None if isinstance(p, str) else cache_key(p)
+        if name in done and done[name][0] == key and done[name][1] in finished:
+            continue
+        yield line_no, name, p, out_dir, options, cache
+
+
+def run_batch(manifest, out_dir, results=None, jobs=None, options=None, cache=None, retry_errors=False):
+    """Обработка манифеста: записи журнала в порядке готовности вариантов.
+
+    cache — (каталог, предельный размер в байтах) кэша DesignCache или None.
+    Журнал results (по умолчанию out_dir/results.jsonl) дописывается построчно
+    и сбрасывается на диск после каждой записи. Варианты, уже записанные в журнал
+    с теми же параметрами и статусом ok (или error, если не задан retry_errors),
+    пропускаются, поэтому прерванный запуск продолжается с места остановки.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    results = results or os.path.join(out_dir, RESULTS_FILE)
+    options = options or {}
+    tasks = pending_tasks(manifest, out_dir, read_results(results), options, cache, retry_errors)
+    with open(results, "a", encoding="utf-8") as log:
+        if jobs == 1:
+            _init_worker(options.get("preview_format"))
+            records = map(run_task, tasks)
+        else:
+            pool = Pool(jobs or os.cpu_count(), initializer=_init_worker, initargs=(options.get("preview_format"),))
+            records = pool.imap_unordered(run_task, tasks)
+        try:
+            for record in records:
+                log.write(json.dumps(record, ensure_ascii=False) + "\n")
+                log.flush()
+                os.fsync(log.fileno())
+                yield record
+        finally:
+            if jobs != 1:
+                pool.terminate()
+                pool.join()
+
+
+# === Режим пакетного расчёта ===
+def add_arguments(parser):
+    parser.add_argument("manifest", help="JSONL: по строке параметров Params на вариант, поле name — имя каталога")
+    parser.add_argument("-o", "--output", default="./output/batch", help="каталог результатов")
+    parser.add_argument("--results", help=f"журнал результатов JSONL (по умолчанию <каталог>/{RESULTS_FILE})")
+    parser.add_argument("-j", "--jobs", type=int, help="число процессов (по умолчанию — все ядра)")
+    parser.add_argument("--retry-errors", action="store_true",
+                        help="пересчитать и варианты, отклонённые проверкой геометрии")
+    parser.add_argument("--stl", action="store_true", help="записать STL деталей: " + ", ".join(stl.STL_PARTS))
+    parser.add_argument("--fn", type=int, default=stl.DEFAULT_FN, help="число сегментов окружностей в STL ($fn)")
+    parser.add_argument("--dxf", action="store_true", help="записать профиль жёсткого колеса в DXF")
+    parser.add_argument("--dxf-spline", action="store_true", help="профиль в DXF — сплайном, а не полилинией")
+    parser.add_argument("--preview", nargs="?", const="png", choices=("png", "svg"), help="записать эскиз")
+    parser.add_argument("--scad-parts", action="store_true", help="записать каталог файлов деталей SCAD")
+    add_cache_arguments(parser)
+
+
+def run(args):
+    options = {
+        "stl_parts": stl.STL_PARTS if args.stl else (),
+        "fn": args.fn,
+        "dxf_file": args.dxf,
+        "dxf_spline": args.dxf_spline,
+        "preview_format": args.preview,
+        "scad_parts": args.scad_parts,
+    }
+    cache = (args.cache_dir, int(args.cache_size * 2**20)) if args.cache_dir else None
+    counts = {}
+    for record in run_batch(args.manifest, args.output, args.results, args.jobs, options, cache, args.retry_errors):
+        counts[record["status"]] = counts.get(record["status"], 0) + 1
+        if record["status"] == "ok":
+            print(f"✅ {record['name']} ({record['seconds']:.2f} с)")
+            for warning in record.get("warnings", ()):
+                print(f"⚠️  {record['name']}: {warning}")
+        else:
+            print(f"⚠️  {record['name']}: {record['error']}")
+    print(f"Готово: {counts.get('ok', 0)}, недопустимых: {counts.get('error', 0)}, сбоев: {counts.get('failed', 0)}")
+    return 0 if not counts.get("failed") else 1
@@ -0,0 +1,177 @@
+import gc
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from . import __version__, scad
+from .core import Params, design, motor_holes, place_holes, profile_features, rigid_profile, sampled_valleys
+from .sweep import parse_range
+
+# Этапы расчёта в порядке выполнения
+STAGES = ("profile", "features", "hole_search", "motor_holes", "format_points", "scad", "write")
+DEFAULT_RESOLUTIONS = "600,10000,100000,1000000"
+DEFAULT_RATIOS = "8,12,20"
+# Геометрия замеров: допустима для всех передаточных чисел по умолчанию (при 7.83 мм роликах i > 8 не помещается)
+BENCH_PARAMS = Params(d_roller=4.0, Rout=34.0, D=90.0)
+# Замедление считается регрессией, если время выросло больше чем в THRESHOLD раз и больше чем на NOISE_S секунд
+THRESHOLD = 1.25
+NOISE_S = 0.002
+
+
+def _stages(d, path):
+    """Этапы расчёта модели d как функции без аргументов, у каждого — свои входные данные из d."""
+    p = d.params
+    R_out = p.D / 2
+    features = d.features
+    tie_valleys = None if p.chord_tol > 0 else sampled_valleys(features, d.e, d.zg, d.rd, d.r_roller, p.resolution,
+                                                                p.clearance)
+
+    def write():
+        with open(path, "w") as f:
+            d.write_scad(f)
+
+    return {
+        "profile": lambda: rigid_profile(d.e, d.zg, d.rd, d.r_roller, p.resolution, p.chord_tol, p.clearance),
+        "features": lambda: profile_features(d.e, d.zg, d.rd, d.r_roller, p.clearance),
+        "hole_search": lambda: place_holes(features.valley_x, features.valley_y, R_out, d.min_thickness,
+                                           d.n_holes, p.hole_step, p.hole_refine, tie_valleys),
+        "motor_holes": lambda: motor_holes(d.best_angle, d.hole_x, d.hole_y, R_out),
+        "format_points": lambda: scad.format_points(d.x_rigid, d.y_rigid),
+        "scad": lambda: scad.render(d),
+        "write": write,
+    }
+
+
+def _time(stage, repeat):
+    """Наименьшее время из repeat запусков: оно меньше всего зависит от фоновой нагрузки."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        stage()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _peak(stage):
+    """Пиковый прирост памяти этапа (байт) по tracemalloc; numpy сообщает ему о своих буферах."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        stage()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_case(params, repeat=3, workdir=None):
+    """Время (с) и пиковая память (МБ) каждого этапа расчёта одной модели.
+
+    Время меряется без tracemalloc, память — отдельным запуском под ним.
+    """
+    d = design(params)
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        stages = _stages(d, os.path.join(tmp, "bench.scad"))
+        result = {}
+        for name in STAGES:
+            result[name] = {
+                "time_s": _time(stages[name], repeat),
+                "peak_mb": _peak(stages[name]) / 2**20,
+            }
+    return result
+
+
+def run_bench(ratios, resolutions, repeat=3, base=None, progress=None):
+    """Отчёт по сетке (передаточное число × число точек) в виде словаря для JSON."""
+    base = base or BENCH_PARAMS
+    cases = []
+    for i in ratios:
+        for resolution in resolutions:
+            p = Params.from_dict({**base.to_dict(), "i": i, "resolution": resolution})
+            stages = bench_case(p, repeat)
+            cases.append({"i": i, "resolution": resolution, "stages": stages})
+            if progress:
+                progress(cases[-1])
+    return {
+        "version": __version__,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "repeat": repeat,
+        "params": base.to_dict(),
+        "cases": cases,
+    }
+
+
+def compare(baseline, report, threshold=THRESHOLD, noise=NOISE_S):
+    """Замедлившиеся этапы: список (i, resolution, этап, было, стало), время в секундах.
+
+    Сравниваются только случаи и этапы, которые есть в обоих отчётах.
+    """
+    old = {(c["i"], c["resolution"]): c["stages"] for c in baseline["cases"]}
+    slower = []
+    for case in report["cases"]:
+        stages = old.get((case["i"], case["resolution"]))
+        if stages is None:
+            continue
+        for name, values in case["stages"].items():
+            if name not in stages:
+                continue
+            before, after = stages[name]["time_s"], values["time_s"]
+            if after > before * threshold and after - before > noise:
+                slower.append((case["i"], case["resolution"], name, before, after))
+    return slower
+
+
+def print_case(case):
+    cells = " ".join(f"{case['stages'][name]['time_s'] * 1000:>11.2f}" for name in STAGES)
+    print(f"{case['i']:>4} {case['resolution']:>10} {cells}")
+
+
+# === Режим замеров ===
+def add_arguments(parser):
+    parser.add_argument("-i", "--ratio", dest="i", default=DEFAULT_RATIOS, help="передаточные числа: a:b:шаг или a,b,c")
+    parser.add_argument("--resolution", default=DEFAULT_RESOLUTIONS, help="числа точек профиля: a,b,c")
+    parser.add_argument("--repeat", type=int, default=3, help="запусков каждого этапа (берётся лучшее время)")
+    parser.add_argument("-o", "--output", help="JSON-отчёт")
+    parser.add_argument("--baseline", help="JSON-отчёт для сравнения: замедлившиеся этапы печатаются, код выхода 1")
+    parser.add_argument("--report", help="не замерять, а сравнить с --baseline готовый отчёт")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="во сколько раз этап должен замедлиться, чтобы считаться регрессией")
+
+
+def run(args):
+    if args.report:
+        with open(args.report, encoding="utf-8") as f:
+            report = json.load(f)
+    else:
+        print(f"\n{'i':>4} {'resolution':>10} " + " ".join(f"{name:>11}" for name in STAGES) + "  (мс)")
+        report = run_bench(parse_range(args.i, int), parse_range(args.resolution, int), args.repeat,
+                           progress=print_case)
+    if args.output:
+        out_dir = os.path.dirname(args.output)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ Отчёт сохранён в: {args.output}")
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    slower = compare(baseline, report, args.threshold)
+    if not slower:
+        print(f"✅ Замедлений относительно {args.baseline} нет (порог ×{args.threshold:g})")
+        return 0
+    print(f"\n⚠️  Замедления относительно {args.baseline}:")
+    for i, resolution, name, before, after in slower:
+        print(f"- i = {i}, resolution = {resolution}, {name}: {before * 1000:.2f} → {after * 1000:.2f} мс "
+              f"(×{after / before:.2f})")
+    return 1
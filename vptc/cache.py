@@ -0,0 +1,292 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import fields
+
+import numpy as np
+
+from . import __version__, dxf, scad, stl
+from .core import Design, design
+
+# Меняется при изменении раскладки записи кэша или текста, который выдаёт генератор
+CACHE_FORMAT = 5
+DEFAULT_MAX_MB = 512
+CACHE_ENV = "VPTC_CACHE_DIR"
+# Временные файлы и каталоги записи старше этого срока (с) остались от упавших процессов
+TMP_MAX_AGE = 3600
+TMP_PREFIX = ".tmp-"
+
+DESIGN_FILE = "design.json"
+SCAD_FILE = "model.scad"
+
+
+def cache_key(params):
+    """SHA-256 от всех входов расчёта: параметров, констант вала и кожуха, версии генератора."""
+    payload = {
+        "format": CACHE_FORMAT,
+        "version": __version__,
+        "params": params.to_dict(),
+        "ecc_shaft": scad.ECC_SHAFT,
+        "motor_cover": scad.MOTOR_COVER,
+        "countersink": [scad.countersink_dia, scad.countersink_depth],
+    }
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _plain(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+
+def _dir_size(path):
+    size = 0
+    for name in os.listdir(path):
+        size += os.path.getsize(os.path.join(path, name))
+    return size
+
+
+class DesignCache:
+    """Кэш рассчитанных моделей на диске, адресуемый хешем входов.
+
+    Запись — каталог <root>/<ключ[:2]>/<ключ> с массивами профиля и отверстий (.npy),
+    скалярными размерами (design.json), текстом SCAD и STL деталей. Время изменения
+    каталога обновляется при каждом обращении, по нему вытесняются давно не использованные
+    записи, когда суммарный размер превышает max_bytes. Размер кэша считается обходом
+    каталога один раз, дальше к нему прибавляются записанные байты; кэш обходится
+    заново только при превышении предела.
+    """
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_MB * 2**20):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._bytes = None  # оценка размера кэша; None — ещё не считался
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def _entries(self):
+        for prefix in os.listdir(self.root):
+            prefix_dir = os.path.join(self.root, prefix)
+            if len(prefix) != 2 or not os.path.isdir(prefix_dir):
+                continue
+            for key in os.listdir(prefix_dir):
+                yield key, os.path.join(prefix_dir, key)
+
+    # === Чтение и запись ===
+    def load(self, params):
+        """Рассчитанная модель из кэша или None."""
+        entry = self.path(cache_key(params))
+        if not os.path.isdir(entry):
+            return None
+        try:
+            with open(os.path.join(entry, DESIGN_FILE), encoding="utf-8") as f:
+                values = json.load(f)
+            with open(os.path.join(entry, SCAD_FILE), encoding="utf-8") as f:
+                values["scad_text"] = f.read()
+            for f in fields(Design):
+                if f.type is np.ndarray:
+                    path = os.path.join(entry, f.name + ".npy")
+                    # Профиль в режиме low_memory не хранится
+                    values[f.name] = np.load(path) if os.path.exists(path) else None
+            os.utime(entry)
+        except (OSError, ValueError, EOFError):
+            # Запись без файла или с обрезанным файлом (переполненный диск, убитый процесс на ФС
+            # без атомарного переименования) — промах: запись удаляется и строится заново
+            shutil.rmtree(entry, ignore_errors=True)
+            self._bytes = None
+            return None
+        values["params"] = params
+        return Design(**values)
+
+    def store(self, d):
+        key = cache_key(d.params)
+        entry = self.path(key)
+        if os.path.isdir(entry):
+            return entry
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        # Запись собирается во временном каталоге и появляется в кэше одним переименованием
+        tmp = tempfile.mkdtemp(prefix=TMP_PREFIX, dir=self.root)
+        values = {}
+        for f in fields(Design):
+            value = getattr(d, f.name)
+            if f.type is np.ndarray:
+                if value is not None:
+                    np.save(os.path.join(tmp, f.name + ".npy"), value)
+            elif f.name not in ("params", "scad_text"):
+                values[f.name] = _plain(value)
+        with open(os.path.join(tmp, DESIGN_FILE), "w", encoding="utf-8") as f:
+            json.dump(values, f)
+        with open(os.path.join(tmp, SCAD_FILE), "w", encoding="utf-8") as f:
+            d.write_scad(f)
+        size = _dir_size(tmp)
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # Ту же запись уже положил другой процесс
+            shutil.rmtree(tmp, ignore_errors=True)
+            return entry
+        self._grow(size, key)
+        return entry
+
+    def design(self, params):
+        """design(params) с кэшем: повторный запрос читается с диска без пересчёта."""
+        d = self.load(params)
+        if d is None:
+            d = design(params)
+            self.store(d)
+        return d
+
+    def _artifact(self, d, name, build):
+        """Путь к файлу name в записи модели; при первом обращении он строится функцией build()."""
+        entry = self.store(d)
+        path = os.path.join(entry, name)
+        if not os.path.exists(path):
+            data = build()
+            fd, tmp = tempfile.mkstemp(prefix=TMP_PREFIX, dir=entry)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self._grow(len(data), cache_key(d.params))
+        return path
+
+    def scad_path(self, d):
+        return os.path.join(self.store(d), SCAD_FILE)
+
+    def stl_path(self, d, part, fn=stl.DEFAULT_FN):
+        """Путь к двоичному STL детали; ValueError генератора не кэшируется и пробрасывается."""
+        return self._artifact(d, f"{part}.fn{fn}.stl",
+                              lambda: stl.stl_bytes(stl.PART_MESHES[part](d, fn), f"vptc {part}"))
+
+    def stl(self, d, part, fn=stl.DEFAULT_FN):
+        with open(self.stl_path(d, part, fn), "rb") as f:
+            return f.read()
+
+    def dxf_path(self, d, spline=False):
+        """Путь к DXF профиля; RuntimeError без ezdxf пробрасывается."""
+        return self._artifact(d, "profile.spline.dxf" if spline else "profile.dxf",
+                              lambda: dxf.dxf_bytes(d, spline))
+
+    # === Очистка ===
+    def info(self):
+        entries = [_dir_size(path) for _, path in self._entries()]
+        return {"root": self.root, "entries": len(entries), "bytes": sum(entries), "max_bytes": self.max_bytes}
+
+    def _grow(self, size, keep):
+        """Учитывает записанные байты; кэш обходится и вытесняется, только когда оценка выходит за предел."""
+        if self._bytes is not None and self._bytes + size <= self.max_bytes:
+            self._bytes += size
+        else:
+            self.evict(keep=keep)
+
+    def _purge_tmp(self, now):
+        """Удаляет брошенные временные каталоги и файлы записей старше TMP_MAX_AGE."""
+        def stale(path):
+            try:
+                return now - os.path.getmtime(path) > TMP_MAX_AGE
+            except OSError:
+                return False
+
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith(TMP_PREFIX) and stale(path):
+                shutil.rmtree(path, ignore_errors=True)
+        for _, entry in self._entries():
+            try:
+                names = os.listdir(entry)
+            except OSError:
+                # Запись вытеснил другой процесс
+                continue
+            for name in names:
+                path = os.path.join(entry, name)
+                if name.startswith(TMP_PREFIX) and stale(path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+    def evict(self, keep=None):
+        """Удаляет брошенные временные файлы и самые давно использованные записи, пока кэш не уложится в max_bytes."""
+        self._purge_tmp(time.time())
+        entries = []
+        total = 0
+        for key, path in self._entries():
+            size = _dir_size(path)
+            entries.append((os.path.getmtime(path), size, key, path))
+            total += size
+        removed = 0
+        for _, size, key, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+        self._bytes = total
+        return removed
+
+    def invalidate(self, params=None):
+        """Удаляет запись для params или, без аргумента, весь кэш. Возвращает число удалённых записей."""
+        self._bytes = None
+        if params is not None:
+            entry = self.path(cache_key(params))
+            if not os.path.isdir(entry):
+                return 0
+            shutil.rmtree(entry)
+            return 1
+        removed = 0
+        for _, path in list(self._entries()):
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+        return removed
+
+
+# === Режим управления кэшем ===
+def add_cache_arguments(parser):
+    parser.add_argument("--cache-dir", default=os.environ.get(CACHE_ENV),
+                        help=f"каталог кэша рассчитанных моделей (по умолчанию ${CACHE_ENV})")
+    parser.add_argument("--cache-size", type=float, default=DEFAULT_MAX_MB,
+                        help="предельный размер кэша (МБ), старые записи вытесняются")
+
+
+def open_cache(args):
+    if not args.cache_dir:
+        return None
+    return DesignCache(args.cache_dir, int(args.cache_size * 2**20))
+
+
+def add_arguments(parser):
+    from .cli import add_param_arguments
+
+    parser.add_argument("action", choices=("info", "evict", "clear", "invalidate"),
+                        help="info — размер кэша, evict — вытеснить лишнее, clear — удалить всё, "
+                             "invalidate — удалить запись модели с заданными параметрами")
+    add_cache_arguments(parser)
+    add_param_arguments(parser)
+
+
+def run(args):
+    from .cli import params_from_args
+
+    cache = open_cache(args)
+    if cache is None:
+        print(f"Ошибка: не задан каталог кэша (--cache-dir или ${CACHE_ENV})")
+        return 1
+    if args.action == "clear":
+        print(f"Удалено записей: {cache.invalidate()}")
+    elif args.action == "invalidate":
+        print(f"Удалено записей: {cache.invalidate(params_from_args(args))}")
+    elif args.action == "evict":
+        print(f"Вытеснено записей: {cache.evict()}")
+    info = cache.info()
+    print(f"Кэш {info['root']}: {info['entries']} записей, "
+          f"{info['bytes'] / 2**20:.1f} из {info['max_bytes'] / 2**20:g} МБ")
+    return 0
@@ -0,0 +1,80 @@
+import argparse
+import json
+import sys
+
+from .rules import GeometryError, Params, check_geometry, check_ranges, derive, min_inner_radius
+
+
+# === Проверка параметров без построения профиля ===
+def check(p):
+    """Скалярные размеры и допустимость параметров: только math, без профиля, отверстий и SCAD."""
+    check_ranges(p)
+    d = derive(p)
+    result = {
+        "e": d["e"],
+        "Rin": d["Rin"],
+        "rd": d["rd"],
+        "Rsep_out": d["Rsep_out"],
+        "bearing_name": d["bearing"]["name"],
+        "n_holes": d["n_holes"],
+        "Rin_min": min_inner_radius(p.d_roller, d["zg"]),
+        "feasible": True,
+    }
+    try:
+        check_geometry(d["Rin"], p.d_roller, d["zg"])
+        if p.clearance:
+            # Эквидистанту проверяют массивы: numpy загружается, только если задан зазор печати
+            from .core import check_offset
+            check_offset(d["e"], d["zg"], d["rd"], d["r_roller"], p.clearance)
+    except GeometryError as exc:
+        result.update(feasible=False, error=str(exc))
+    return result
+
+
+def check_lines(lines):
+    """Результаты проверки по строке JSONL на строку: параметры Params и необязательное поле name.
+
+    Пустые строки и комментарии (#) пропускаются; строка с ошибкой даёт feasible = false
+    и текст ошибки, а не прерывает поток.
+    """
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        record = {}
+        try:
+            values = json.loads(line)
+            if not isinstance(values, dict):
+                raise ValueError("ожидается JSON-объект с параметрами")
+            if "name" in values:
+                record["name"] = values.pop("name")
+            record.update(check(Params.from_dict(values)))
+        except (ValueError, TypeError, AttributeError, ZeroDivisionError) as exc:
+            record.update(feasible=False, error=f"Строка {line_no}: {exc}")
+        yield record
+
+
+# === Режим проверки ===
+def add_arguments(parser):
+    parser.add_argument("input", nargs="?", default="-",
+                        help="JSONL: по строке параметров Params на проверку (по умолчанию — stdin)")
+
+
+def run(args):
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    infeasible = 0
+    try:
+        for record in check_lines(source):
+            infeasible += not record["feasible"]
+            # Ответ на каждую строку сразу: конфигуратор может держать процесс открытым и писать по строке
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 0 if not infeasible else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="calc-vpts.py check", description="Проверка параметров ВПТК без расчёта")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
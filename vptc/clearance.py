@@ -0,0 +1,172 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from .core import center_radius, profile_features
+
+# Шагов по углу эксцентрика за оборот при проверке зазоров
+CLEARANCE_STEPS = 360
+# Насколько дальше радиуса ролика индекс гарантированно находит ближайшую точку профиля (мм)
+CLEARANCE_REACH = 1.0
+# Пар (точки × рёбра-кандидаты) в одном блоке расчёта расстояний: десятки МБ временных массивов
+QUERY_BLOCK = 1 << 19
+# Ролики касаются профиля по построению: отрицательный зазор меньше этого (мм) — прогиб хорд, а не натяг
+CONTACT_TOLERANCE = 0.01
+
+
+# === Пространственный индекс профиля ===
+class AngleIndex:
+    """Рёбра замкнутого контура, упорядоченные по полярному углу.
+
+    Все точки контура не ближе reach к точке запроса лежат в пределах
+    half = asin(reach / r_min) по углу от неё, поэтому кандидаты запроса — рёбра,
+    чей угловой отрезок пересекает [θ - half, θ + half]. Рёбра отсортированы по
+    началу отрезка, так что кандидаты — один непрерывный (по кругу) диапазон,
+    границы которого находятся двоичным поиском. Пары (точки × кандидаты)
+    считаются блоками не больше QUERY_BLOCK, поэтому память не растёт с числом точек.
+    """
+
+    def __init__(self, x, y, reach, r_min=None):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        bx, by = np.roll(x, -1), np.roll(y, -1)
+        self.reach = reach
+        if r_min is None:
+            r_min = float(np.min(np.hypot(x, y)))
+        self.half = math.asin(reach / r_min) if reach < r_min else math.pi
+
+        # Угловой отрезок ребра: от меньшего из углов концов, длиной не больше π
+        start = np.mod(np.arctan2(x, y), 2 * np.pi)
+        span = np.mod(np.arctan2(bx, by) - start + np.pi, 2 * np.pi) - np.pi
+        low = np.mod(np.where(span < 0, start + span, start), 2 * np.pi)
+        self.extent = float(np.max(np.abs(span))) if len(x) else 0.0
+        order = np.argsort(low, kind="stable")
+        self.low = np.concatenate([low[order], low[order] + 2 * np.pi])
+        ax, ay = x[order], y[order]
+        ex, ey = bx[order] - ax, by[order] - ay
+        length2 = ex**2 + ey**2
+        inv_length2 = np.divide(1.0, length2, out=np.zeros_like(length2), where=length2 > 0)
+        # Массивы рёбер удвоены, как и low: диапазон кандидатов, переходящий через 2π, непрерывен;
+        # хвост до QUERY_BLOCK — чтобы окно в block рёбер от любого кандидата не выходило за массив
+        self.ax, self.ay, self.ex, self.ey, self.inv_length2 = (
+            np.concatenate([v, v, v[:QUERY_BLOCK]]) for v in (ax, ay, ex, ey, inv_length2))
+        self.edges = len(ax)
+
+    def _candidates(self, angle):
+        """Первое ребро-кандидат (в удвоенном порядке) и число кандидатов для углов angle."""
+        count = self.edges
+        if self.half >= math.pi:
+            return np.zeros(len(angle), dtype=np.intp), np.full(len(angle), count, dtype=np.intp)
+        lo = np.mod(angle - self.half - self.extent, 2 * np.pi)
+        first = np.searchsorted(self.low, lo)
+        last = np.searchsorted(self.low, lo + 2 * self.half + self.extent, side="right")
+        return first, np.minimum(last - first, count)
+
+    def distance(self, px, py):
+        """Расстояние от точек до контура; достоверно, если не превышает reach."""
+        px = np.asarray(px, dtype=float).ravel()
+        py = np.asarray(py, dtype=float).ravel()
+        result = np.full(len(px), np.inf)
+        if not self.edges:
+            return result
+        first, count = self._candidates(np.arctan2(px, py))
+        width = int(count.max(initial=0))
+        # Точек в блоке столько, чтобы блок (точки × кандидаты) не превышал QUERY_BLOCK
+        block = max(1, min(width, QUERY_BLOCK))
+        rows = max(1, QUERY_BLOCK // block)
+        # Окна по block рёбер подряд: кандидаты точки — строка окон, а не выборка по индексам
+        windows = [np.lib.stride_tricks.sliding_window_view(v, block) for v in (self.ax, self.ay, self.ex, self.ey, self.inv_length2)]
+        for start in range(0, len(px), rows):
+            part = slice(start, start + rows)
+            x, y = px[part, None], py[part, None]
+            best = np.full(len(x), np.inf)
+            for offset in range(0, width, block):
+                at = first[part] + offset
+                ax, ay, ex, ey, inv_length2 = (w[at] for w in windows)
+                dx = x - ax
+                dy = y - ay
+                t = np.clip((dx * ex + dy * ey) * inv_length2, 0.0, 1.0)
+                dx -= t * ex
+                dy -= t * ey
+                d2 = dx * dx + dy * dy
+                d2[np.arange(block)[None, :] >= (count[part] - offset)[:, None]] = np.inf
+                np.minimum(best, d2.min(axis=1), out=best)
+            result[part] = np.sqrt(best)
+        return result
+
+
+# === Проверка зазоров ===
+@dataclass
+class Clearance:
+    name: str
+    value: float            # наименьший зазор (мм), < 0 — натяг
+    psi: float              # угол эксцентрика, при котором он достигается (градусы)
+    roller: int             # номер ролика (-1 — не относится к ролику)
+
+    @property
+    def ok(self):
+        return self.value >= -CONTACT_TOLERANCE
+
+
+CLEARANCE_NAMES = {
+    "roller_profile": "ролик — профиль жёсткого колеса",
+    "roller_roller": "соседние ролики",
+    "roller_separator": "ролик — стенка сепаратора (опора паза)",
+    "separator_profile": "сепаратор — выступы профиля",
+}
+
+
+def _worst(name, values, psi):
+    """Наименьшее значение массива (углы × ролики) и где оно достигается."""
+    step, roller = np.unravel_index(np.argmin(values), values.shape)
+    return Clearance(name, float(values[step, roller]), float(np.degrees(psi[step])), int(roller))
+
+
+def check_clearances(x_rigid, y_rigid, e, zg, z_rollers, rd, r_roller, Rsep_in, Rsep_out,
+                     steps=CLEARANCE_STEPS, clearance=0.0):
+    """Наименьшие зазоры за оборот эксцентрика при номинальном положении роликов.
+
+    Ролик k стоит в пазу под углом φ = -ψ/(zg - 1) + 2πk/z и прижат эксцентриком
+    на радиус l(ψ - φ). Расстояния до профиля берутся через AngleIndex, ближайшие
+    к оси точки профиля — из точных впадин (profile_features).
+    """
+    features = profile_features(e, zg, rd, r_roller, clearance)
+    psi = np.linspace(0.0, 2 * np.pi, steps, endpoint=False)
+    phi = -psi[:, None] / (zg - 1) + 2 * np.pi * np.arange(z_rollers)[None, :] / z_rollers
+    rho, _ = center_radius(psi[:, None] - phi, e, rd + r_roller)
+    cx, cy = rho * np.sin(phi), rho * np.cos(phi)
+
+    index = AngleIndex(x_rigid, y_rigid, r_roller + CLEARANCE_REACH, features.r_min)
+    distance = index.distance(cx, cy).reshape(cx.shape)
+    # Центр за пределами профиля — натяг больше радиуса ролика
+    r_profile = np.interp(np.mod(phi, 2 * np.pi), *_polar(x_rigid, y_rigid), period=2 * np.pi)
+    distance = np.where(rho <= r_profile, distance, -distance)
+
+    gap = np.hypot(np.roll(cx, -1, axis=1) - cx, np.roll(cy, -1, axis=1) - cy) - 2 * r_roller
+    engagement = np.minimum(rho - Rsep_in, Rsep_out - rho)
+    return [
+        _worst("roller_profile", distance - r_roller, psi),
+        _worst("roller_roller", gap, psi),
+        _worst("roller_separator", engagement, psi),
+        Clearance("separator_profile", features.r_min - Rsep_out, 0.0, -1),
+    ]
+
+
+def _polar(x, y):
+    phi = np.mod(np.arctan2(x, y), 2 * np.pi)
+    order = np.argsort(phi)
+    return phi[order], np.hypot(x, y)[order]
+
+
+def design_clearances(d, steps=CLEARANCE_STEPS):
+    return check_clearances(*d.profile_xy(), d.e, d.zg, d.z_rollers, d.rd, d.r_roller,
+                            d.Rsep_in, d.Rsep_out, steps, d.params.clearance)
+
+
+def print_clearances(checks):
+    print("\n=== ЗАЗОРЫ ЗА ОБОРОТ ЭКСЦЕНТРИКА ===")
+    for c in checks:
+        where = f", ψ = {c.psi:.1f}°, ролик {c.roller + 1}" if c.roller >= 0 else ""
+        mark = "" if c.ok else "  ⚠️ натяг"
+        print(f"- {CLEARANCE_NAMES[c.name]}: {c.value:.3f} мм{where}{mark}")
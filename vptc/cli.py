@@ -0,0 +1,290 @@
+import argparse
+import json
+import os
+import sys
+from dataclasses import replace
+
+from . import (batch, bench, cache, check, clearance, contact, dxf, kinematics, openscad, optimize, preview, profiling,
+               scad, server, stl, sweep, tolerance)
+from .core import Params, GeometryError, design
+from .profiling import stage
+
+DEFAULT_OUTPUT = "./output/vptc_roller.scad"
+
+
+def prompt_value(prompt, default, value_type=float):
+    user_input = input(f"{prompt} (по умолчанию: {default}): ")
+    if user_input.strip() == "":
+        return default
+    try:
+        return value_type(user_input)
+    except ValueError:
+        print("Ошибка: некорректное значение. Используем значение по умолчанию.")
+        return default
+
+
+# === Ввод параметров ===
+def prompt_params(defaults):
+    return replace(
+        defaults,
+        resolution=prompt_value("Количество точек построения профиля жесткого колеса", defaults.resolution, int),
+        i=prompt_value("Передаточное число", defaults.i, int),
+        d_roller=prompt_value("Диаметр роликов (мм)", defaults.d_roller),
+        h_roller=prompt_value("Высота роликов (мм)", defaults.h_roller),
+        Rout=prompt_value("Внешний радиус впадин жесткого колеса (мм)", defaults.Rout),
+        D=prompt_value("Внешний диаметр редуктора (мм)", defaults.D),
+    )
+
+
+def load_config(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def add_param_arguments(parser):
+    """Флаги параметров редуктора, общие для всех режимов."""
+    parser.add_argument("-c", "--config", help="JSON-файл с параметрами редуктора")
+    parser.add_argument("--resolution", type=int, help="количество точек построения профиля жесткого колеса")
+    parser.add_argument("-i", "--ratio", dest="i", type=int, help="передаточное число")
+    parser.add_argument("--d-roller", dest="d_roller", type=float, help="диаметр роликов (мм)")
+    parser.add_argument("--h-roller", dest="h_roller", type=float, help="высота роликов (мм)")
+    parser.add_argument("--rout", dest="Rout", type=float, help="внешний радиус впадин жесткого колеса (мм)")
+    parser.add_argument("-D", "--diameter", dest="D", type=float, help="внешний диаметр редуктора (мм)")
+    parser.add_argument("--clearance", type=float,
+                        help="зазор печати (мм): профиль жесткого колеса смещается по нормали от роликов")
+    parser.add_argument("--hole-step", dest="hole_step", type=float,
+                        help="шаг перебора угла поворота отверстий A (градусы)")
+    parser.add_argument("--hole-refine", dest="hole_refine", action="store_true", default=None,
+                        help="уточнять угол отверстий A между шагами перебора")
+    parser.add_argument("--chord-tol", dest="chord_tol", type=float,
+                        help="допуск отклонения хорд профиля (мм): адаптивная разбивка вместо --resolution")
+    parser.add_argument("--float32", action="store_true", default=None, help="хранить точки профиля в float32")
+    parser.add_argument("--low-memory", dest="low_memory", action="store_true", default=None,
+                        help="не хранить профиль целиком: считать и писать его порциями (для миллионов точек)")
+
+
+def params_from_args(args):
+    """Параметры по умолчанию, поверх них — конфиг, поверх него — флаги."""
+    values = Params().to_dict()
+    if args.config:
+        values.update(load_config(args.config))
+    for name in values:
+        value = getattr(args, name, None)
+        if value is not None:
+            values[name] = value
+    return Params.from_dict(values)
+
+
+# === Отчёт ===
+def print_summary(d):
+    p = d.params
+    print("\nОсновные параметры ВПТК:")
+    print(f"- Передаточное число: {p.i}")
+    print(f"- Эксцентриситет: {d.e:.3f} мм")
+    print(f"- Радиус эксцентрика: {d.rd:.3f} мм")
+    print(f"- Внешний радиус впадин: {p.Rout} мм")
+    print(f"- Внутренний радиус: {d.Rin} мм")
+    print(f"- Число впадин: {d.zg}")
+    if p.clearance:
+        print(f"- Зазор печати профиля: {p.clearance} мм")
+    if p.chord_tol > 0:
+        print(f"- Точек профиля (допуск хорды {p.chord_tol} мм): {d.profile_size}")
+    print(f"- Число роликов: {d.z_rollers}")
+    print(f"- Диаметр роликов: {p.d_roller} мм")
+    print(f"- Высота роликов: {p.h_roller} мм")
+    print(f"- Толщина сепаратора (расчётная): {d.hc:.3f} мм")
+    print(f"- Высота сепаратора: {d.separator_h:.3f} мм")
+    print(f"- Высота эксцентрика: {d.eccentric_h:.3f} мм")
+    print(f"- Высота корпуса редуктора: {d.h_reducer:.3f} мм")
+    print(f"- Подшипник на сепараторе: {d.bearing_name} (Øвнеш = {d.bearing['outer']} мм)")
+    print(f"- Толщина крышки редуктора: {d.cap_thickness:.1f} мм")
+
+
+# === СПИСОК ДЕТАЛЕЙ, ОТВЕРСТИЙ, БОЛТОВ И ПОДШИПНИКОВ ===
+PARTS = {
+    "HW": "Жёсткое колесо (корпус редуктора)",
+    "SEP": "Сепаратор",
+    "ROL": "Ролики",
+    "ECC": "Эксцентрик",
+    "MC": "Защитный кожух мотора",
+    "CAP": "Крышка редуктора",
+    "ECC_SHAFT": "Вал эксцентрика"
+}
+
+
+def print_parts(d):
+    print("\n=== СПИСОК ДЕТАЛЕЙ ===")
+    for code, name in PARTS.items():
+        print(f"- {code}: {name}")
+
+    print("\n=== ОТВЕРСТИЯ В ДЕТАЛИ HW ===")
+    for k in range(d.n_holes):
+        print(f"- A{k+1}: Крепёжное отверстие корпуса (M3), x={d.hole_x[k]:.2f}, y={d.hole_y[k]:.2f}")
+    for k in range(4):
+        print(f"- B{k+1}: Отверстие под кожух мотора (M3), x={d.motor_x[k]:.2f}, y={d.motor_y[k]:.2f}")
+
+    print("\n=== КРЕПЁЖ И ПОДШИПНИКИ ===")
+    print("- Винты M3×10 мм: 4 шт. (для кожуха мотора)")
+    print("- Винты M3×15 мм: {} шт. (для корпуса)".format(d.n_holes))
+    print("- Гайки M3: {} шт.".format(d.n_holes + 4))
+    print("- Подшипники 6803ZZ (17×26×5 мм): 2 шт. (в корпусе и эксцентрике)")
+    print("- Подшипник 688ZZ (8×16×5 мм): 1 шт. (в сепараторе)")
+    print(f"- Подшипник {d.bearing_name}: 1 шт. (на сепараторе)")
+
+
+# === Сохранение ===
+def write_scad(d, output_file):
+    out_dir = os.path.dirname(output_file)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with open(output_file, "w") as f:
+        d.write_scad(f)
+
+
+# === Режим расчёта одной модели ===
+def add_design_arguments(parser):
+    add_param_arguments(parser)
+    parser.add_argument("--interactive", action="store_true", help="запросить параметры через input()")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="путь к SCAD-файлу")
+    parser.add_argument("-q", "--quiet", action="store_true", help="не печатать отчёт")
+    parser.add_argument("--clearance-report", action="store_true",
+                        help="напечатать наименьшие зазоры за оборот эксцентрика (долго на подробном профиле)")
+    parser.add_argument("--stl", action="store_true",
+                        help="записать рядом с SCAD двоичные STL деталей: " + ", ".join(stl.STL_PARTS))
+    parser.add_argument("--fn", type=int, default=stl.DEFAULT_FN, help="число сегментов окружностей в STL ($fn)")
+    parser.add_argument("--dxf", action="store_true",
+                        help="записать рядом с SCAD плоский профиль жёсткого колеса и отверстия в DXF")
+    parser.add_argument("--dxf-spline", action="store_true", help="профиль в DXF — сплайном, а не полилинией")
+    parser.add_argument("--preview", nargs="?", const="png", choices=("png", "svg"),
+                        help="записать рядом с SCAD эскиз вида сверху (png или svg)")
+    parser.add_argument("--scad-parts", action="store_true",
+                        help="записать рядом с SCAD каталог <имя>_parts: params.scad, modules.scad и файл на деталь")
+    parser.add_argument("--openscad", action="store_true",
+                        help="экспортировать детали из --scad-parts в STL параллельными процессами openscad")
+    parser.add_argument("--openscad-jobs", type=int, help="число процессов openscad")
+    cache.add_cache_arguments(parser)
+    parser.add_argument("--profile", action="store_true",
+                        help="замерить этапы расчёта: время, пиковая память, размеры массивов")
+    parser.add_argument("--profile-stats", metavar="FILE", help="записать статистику cProfile (pstats) в FILE")
+    parser.add_argument("--profile-json", metavar="FILE", help="записать замеры этапов в JSON")
+
+
+def run_design(args):
+    if not (args.profile or args.profile_stats or args.profile_json):
+        return design_command(args)
+    with profiling.Profiler(cprofile=bool(args.profile_stats)) as profiler:
+        code = design_command(args)
+    profiler.print_table()
+    if args.profile_stats:
+        print(f"✅ Статистика cProfile сохранена в: {profiler.write_stats(args.profile_stats)}")
+    if args.profile_json:
+        print(f"✅ Замеры этапов сохранены в: {profiler.write_json(args.profile_json)}")
+    return code
+
+
+def design_command(args):
+    p = params_from_args(args)
+    if args.interactive:
+        p = prompt_params(p)
+    store = cache.open_cache(args)
+    try:
+        with stage("design"):
+            d = store.design(p) if store else design(p)
+    except GeometryError as exc:
+        print(f"Ошибка: {exc}")
+        return 1
+    if not args.quiet:
+        print_summary(d)
+        if args.clearance_report:
+            with stage("clearances"):
+                checks = clearance.design_clearances(d)
+            clearance.print_clearances(checks)
+        print_parts(d)
+    with stage("scad_write"):
+        write_scad(d, args.output)
+    if not args.quiet:
+        print(f"\n✅ OpenSCAD-модель сохранена в: {args.output}")
+    prefix = os.path.splitext(args.output)[0]
+    if args.scad_parts or args.openscad:
+        parts_dir = prefix + "_parts"
+        with stage("scad_parts"):
+            scad.write_parts(d, parts_dir)
+        if not args.quiet:
+            print(f"✅ Файлы деталей сохранены в: {parts_dir}")
+        if args.openscad:
+            try:
+                with stage("openscad"):
+                    results = openscad.render_parts(parts_dir, jobs=args.openscad_jobs)
+            except RuntimeError as exc:
+                print(f"⚠️  {exc}")
+            else:
+                openscad.print_renders(results)
+    if args.dxf or args.dxf_spline:
+        try:
+            with stage("dxf"):
+                path = dxf.write_dxf(d, prefix + ".dxf", spline=args.dxf_spline)
+        except RuntimeError as exc:
+            print(f"⚠️  DXF: {exc}")
+        else:
+            if not args.quiet:
+                print(f"✅ DXF профиля сохранён в: {path}")
+    if args.preview:
+        try:
+            with stage("preview"):
+                path = preview.write_preview(d, f"{prefix}.{args.preview}")
+        except RuntimeError as exc:
+            print(f"⚠️  Эскиз: {exc}")
+        else:
+            if not args.quiet:
+                print(f"✅ Эскиз сохранён в: {path}")
+    if args.stl:
+        for part in stl.STL_PARTS:
+            try:
+                with stage(f"stl_{part}"):
+                    if store:
+                        path = f"{prefix}_{part}.stl"
+                        with open(path, "wb") as f:
+                            f.write(store.stl(d, part, args.fn))
+                    else:
+                        path, = stl.export_stl(d, prefix, [part], args.fn)
+            except ValueError as exc:
+                print(f"⚠️  {part}: {exc}")
+                continue
+            if not args.quiet:
+                print(f"✅ STL детали {part} сохранён в: {path}")
+    return 0
+
+
+# Режимы командной строки: имя -> (добавление аргументов, запуск)
+COMMANDS = {
+    "design": (add_design_arguments, run_design),
+    "sweep": (sweep.add_arguments, sweep.run),
+    "preview": (preview.add_arguments, preview.run),
+    "simulate": (kinematics.add_arguments, kinematics.run),
+    "optimize": (optimize.add_arguments, optimize.run),
+    "cache": (cache.add_arguments, cache.run),
+    "bench": (bench.add_arguments, bench.run),
+    "openscad": (openscad.add_arguments, openscad.run),
+    "tolerance": (tolerance.add_arguments, tolerance.run),
+    "contact": (contact.add_arguments, contact.run),
+    "batch": (batch.add_arguments, batch.run),
+    "serve": (server.add_arguments, server.run),
+    "check": (check.add_arguments, check.run),
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="calc-vpts.py", description="Калькулятор ВПТК")
+    sub = parser.add_subparsers(dest="command")
+    for name, (add_arguments, _) in COMMANDS.items():
+        add_arguments(sub.add_parser(name))
+    return parser
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # Без явного режима — расчёт одной модели
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv.insert(0, "design")
+    args = build_parser().parse_args(argv)
+    return COMMANDS[args.command][1](args)
@@ -0,0 +1,218 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .core import center_radius
+
+# Шагов по углу эксцентрика за оборот в режиме contact
+CONTACT_STEPS = 360
+# Углов на период 2π/zg для колонок перебора: картина роликов повторяется через 2π/zg
+CONTACT_PERIOD_ANGLES = 32
+# Крутящий момент на выходе по умолчанию (Н·м)
+DEFAULT_TORQUE = 1.0
+# Материалы: модуль упругости (МПа), коэффициент Пуассона, допускаемое контактное напряжение (МПа).
+# Для пластиков допускаемое напряжение — ориентир для печатных деталей, а не справочная величина
+MATERIALS = {
+    "steel": (210000.0, 0.3, 1500.0),
+    "bronze": (110000.0, 0.34, 400.0),
+    "pla": (3500.0, 0.36, 50.0),
+    "petg": (2100.0, 0.38, 35.0),
+    "nylon": (1800.0, 0.39, 40.0),
+}
+DEFAULT_MATERIALS = {"roller": "steel", "housing": "pla", "eccentric": "pla"}
+
+
+def parse_material(text):
+    """Материал: имя из MATERIALS или "E,ν,σ" (МПа, —, МПа)."""
+    text = text.strip()
+    if text.lower() in MATERIALS:
+        return MATERIALS[text.lower()]
+    values = [float(v) for v in text.split(",")]
+    if len(values) != 3 or values[0] <= 0 or values[2] <= 0:
+        raise ValueError(f"Материал задаётся именем ({', '.join(MATERIALS)}) или числами E,ν,σ: {text}")
+    return tuple(values)
+
+
+def effective_modulus(a, b):
+    """Приведённый модуль пары материалов: 1/E* = (1 - ν₁²)/E₁ + (1 - ν₂²)/E₂."""
+    return 1.0 / ((1 - a[1] ** 2) / a[0] + (1 - b[1] ** 2) / b[0])
+
+
+def hertz_stress(force, length, curvature, modulus):
+    """Наибольшее давление линейного контакта цилиндров по Герцу (МПа).
+
+    curvature — приведённая кривизна 1/R₁ ± 1/R₂ (1/мм), length — длина контакта (мм).
+    Кривизна ≤ 0 (впадина уже ролика — только при отрицательном зазоре печати) считается
+    нулевой: поверхности сопряжены, и давление по Герцу — ноль, а не NaN.
+    """
+    return np.sqrt(np.maximum(force, 0.0) * modulus * np.maximum(curvature, 0.0) / (np.pi * length))
+
+
+def hertz_length(force, curvature, modulus, allowable):
+    """Длина контакта (мм), при которой давление по Герцу не превышает allowable."""
+    return np.maximum(force, 0.0) * modulus * np.maximum(curvature, 0.0) / (np.pi * allowable**2)
+
+
+# === Распределение нагрузки ===
+def roller_loads(e, zg, z_rollers, rd, r_roller, psi, torque, clearance=0.0):
+    """Силы на роликах при моменте torque (Н·мм) на сепараторе для углов эксцентрика psi.
+
+    Ролик k стоит в пазу под углом φ = -ψ/(zg - 1) + 2πk/z на кривой центров ρ(φ) = l(zg·φ).
+    Из равновесия ролика между эксцентриком, профилем и стенкой паза его вклад в момент
+    равен W·|g'|, где W — радиальная составляющая сил, g' = ρ' + l'(α) — наклон зазора
+    по углу сепаратора (как в kinematics). При повороте нагруженного сепаратора на Δ натяг
+    ролика равен |g'|·Δ, поэтому нагрузка делится пропорционально |g'|: W = T·|g'| / Σ|g'|²,
+    нагружены ролики на одном склоне (g' < 0, как упор lag в kinematics.simulate).
+    Возвращает массивы (углы × ролики): угол давления профиля (рад, от радиуса паза),
+    нормальные силы ролик — профиль и ролик — эксцентрик (Н) и кривизну профиля (1/мм,
+    > 0 — профиль охватывает ролик).
+    """
+    psi = np.asarray(psi, dtype=float)
+    phi = -psi[:, None] / (zg - 1) + 2 * np.pi * np.arange(z_rollers)[None, :] / z_rollers
+    alpha = psi[:, None] - phi
+    R = rd + r_roller
+    a = zg * phi
+    rho, S = center_radius(a, e, R)
+    s, c = np.sin(a), np.cos(a)
+    dS = -e**2 * s * c / S
+    drho = zg * (-e * s + dS)
+    d2rho = zg**2 * (-e * c - e**2 * np.cos(2 * a) / S - dS**2 / S)
+    slope = drho - e * np.sin(alpha) * rho / S
+
+    lever = np.maximum(-slope, 0.0)
+    radial = torque * lever / np.sum(lever**2, axis=1, keepdims=True)
+    norm = np.hypot(rho, drho)
+    # Кривизна кривой центров в полярных координатах и её эквидистанты на r_roller + clearance
+    kappa = (rho**2 + 2 * drho**2 - rho * d2rho) / norm**3
+    return {
+        "angle": np.arctan2(drho, rho),
+        "force": radial * norm / rho,
+        "eccentric_force": radial * R / S,
+        "profile_curvature": kappa / (1 + kappa * (r_roller + clearance)),
+    }
+
+
+@dataclass
+class ContactResult:
+    psi: np.ndarray               # углы эксцентрика (рад)
+    contact_angle: np.ndarray     # угол давления профиля на ролик от радиуса паза (рад), (углы × ролики)
+    force: np.ndarray             # нормальная сила ролик — профиль (Н)
+    eccentric_force: np.ndarray   # нормальная сила ролик — эксцентрик (Н)
+    stress: np.ndarray            # давление по Герцу ролик — профиль (МПа)
+    eccentric_stress: np.ndarray  # давление по Герцу ролик — эксцентрик (МПа)
+    h_min: float                  # наименьшая высота ролика при допускаемых напряжениях (мм)
+
+    @property
+    def peak_stress(self):
+        return float(max(self.stress.max(), self.eccentric_stress.max()))
+
+    def summary(self):
+        loaded = np.count_nonzero(self.force > 0, axis=1)
+        worst = np.unravel_index(np.argmax(self.stress), self.stress.shape)
+        return {
+            "steps": len(self.psi),
+            "loaded_rollers_min": int(loaded.min()),
+            "loaded_rollers_max": int(loaded.max()),
+            "force_max_n": float(self.force.max()),
+            "eccentric_force_max_n": float(self.eccentric_force.max()),
+            "stress_max_mpa": float(self.stress.max()),
+            "stress_max_psi_deg": float(np.degrees(self.psi[worst[0]])),
+            "stress_max_roller": int(worst[1]) + 1,
+            "eccentric_stress_max_mpa": float(self.eccentric_stress.max()),
+            "h_roller_min_mm": self.h_min,
+        }
+
+
+def check_contacts(e, zg, z_rollers, rd, r_roller, h_roller, psi, torque, materials=None, clearance=0.0):
+    """Нагрузки и контактные напряжения роликов для углов эксцентрика psi.
+
+    torque — момент на выходе (Н·м), materials — словарь материалов roller, housing
+    и eccentric (имена или кортежи parse_material) поверх DEFAULT_MATERIALS.
+    """
+    materials = {name: parse_material(spec) if isinstance(spec, str) else spec
+                 for name, spec in {**DEFAULT_MATERIALS, **(materials or {})}.items()}
+    roller, housing, eccentric = materials["roller"], materials["housing"], materials["eccentric"]
+    loads = roller_loads(e, zg, z_rollers, rd, r_roller, psi, torque * 1000.0, clearance)
+    curvature = 1 / r_roller - loads["profile_curvature"]
+    eccentric_curvature = 1 / r_roller + 1 / rd
+    modulus = effective_modulus(roller, housing)
+    eccentric_modulus = effective_modulus(roller, eccentric)
+    h_min = max(
+        float(hertz_length(loads["force"], curvature, modulus, min(roller[2], housing[2])).max()),
+        float(hertz_length(loads["eccentric_force"], eccentric_curvature, eccentric_modulus,
+                           min(roller[2], eccentric[2])).max()),
+    )
+    return ContactResult(
+        np.asarray(psi, dtype=float), loads["angle"], loads["force"], loads["eccentric_force"],
+        hertz_stress(loads["force"], h_roller, curvature, modulus),
+        hertz_stress(loads["eccentric_force"], h_roller, eccentric_curvature, eccentric_modulus),
+        h_min,
+    )
+
+
+def period_angles(zg, angles=CONTACT_PERIOD_ANGLES):
+    """Углы эксцентрика на один период 2π/zg: за ним ролики лишь меняются местами."""
+    return np.linspace(0.0, 2 * np.pi / zg, angles, endpoint=False)
+
+
+def design_contacts(d, torque=DEFAULT_TORQUE, materials=None, steps=CONTACT_STEPS):
+    psi = np.linspace(0.0, 2 * np.pi, steps, endpoint=False)
+    return check_contacts(d.e, d.zg, d.z_rollers, d.rd, d.r_roller, d.params.h_roller, psi, torque, materials,
+                          d.params.clearance)
+
+
+# === Режим расчёта нагрузок ===
+def add_load_arguments(parser):
+    parser.add_argument("--torque", type=float, default=DEFAULT_TORQUE, help="момент на выходе (Н·м)")
+    for name, what in (("roller", "роликов"), ("housing", "корпуса"), ("eccentric", "эксцентрика")):
+        parser.add_argument(f"--{name}-material", dest=f"{name}_material", default=DEFAULT_MATERIALS[name],
+                            help=f"материал {what}: {', '.join(MATERIALS)} или E,ν,σ (МПа, —, МПа; "
+                                 f"σ — допускаемое контактное напряжение), по умолчанию {DEFAULT_MATERIALS[name]}")
+
+
+def materials_from_args(args):
+    return {name: parse_material(getattr(args, f"{name}_material")) for name in DEFAULT_MATERIALS}
+
+
+def add_arguments(parser):
+    from .cli import add_param_arguments
+
+    add_param_arguments(parser)
+    add_load_arguments(parser)
+    parser.add_argument("--steps", type=int, default=CONTACT_STEPS, help="шагов по углу эксцентрика за оборот")
+    parser.add_argument("-o", "--output", help="CSV с силами и напряжениями каждого ролика на каждом шаге")
+
+
+def run(args):
+    from .cli import params_from_args
+    from .core import GeometryError, design
+
+    try:
+        d = design(params_from_args(args))
+        materials = materials_from_args(args)
+    except (GeometryError, ValueError) as exc:
+        print(f"Ошибка: {exc}")
+        return 1
+    result = design_contacts(d, args.torque, materials, args.steps)
+    s = result.summary()
+    print(f"\nНагрузка роликов ({s['steps']} шагов, момент {args.torque} Н·м):")
+    print(f"- Нагружено роликов: {s['loaded_rollers_min']} … {s['loaded_rollers_max']} из {d.z_rollers}")
+    print(f"- Сила ролик — профиль: до {s['force_max_n']:.1f} Н, ролик — эксцентрик: до "
+          f"{s['eccentric_force_max_n']:.1f} Н")
+    print(f"- Контактное напряжение ролик — профиль: {s['stress_max_mpa']:.1f} МПа "
+          f"(угол {s['stress_max_psi_deg']:.1f}°, ролик {s['stress_max_roller']})")
+    print(f"- Контактное напряжение ролик — эксцентрик: {s['eccentric_stress_max_mpa']:.1f} МПа")
+    print(f"- Наименьшая высота роликов: {s['h_roller_min_mm']:.2f} мм (задано {d.params.h_roller} мм)")
+    if s["h_roller_min_mm"] > d.params.h_roller:
+        print("⚠️  Контактные напряжения выше допускаемых: увеличьте высоту или диаметр роликов")
+    if args.output:
+        steps, rollers = result.force.shape
+        data = np.column_stack([
+            np.repeat(np.degrees(result.psi), rollers), np.tile(np.arange(1, rollers + 1), steps),
+            np.degrees(result.contact_angle).ravel(), result.force.ravel(), result.eccentric_force.ravel(),
+            result.stress.ravel(), result.eccentric_stress.ravel(),
+        ])
+        np.savetxt(args.output, data, fmt=["%.6f", "%d"] + ["%.6f"] * 5, delimiter=",", comments="",
+                   header="psi_deg,roller,contact_angle_deg,force_n,eccentric_force_n,stress_mpa,eccentric_stress_mpa")
+        print(f"✅ Нагрузки роликов сохранены в: {args.output}")
+    return 0
@@ -0,0 +1,503 @@
+from functools import cached_property
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .profiling import stage
+# Скалярные правила без numpy живут в rules (их использует check); здесь — для прежних импортов из core
+from .rules import (BEARINGS, GeometryError, Params, cap_thickness, check_geometry, derive, dimensions, heights,
+                    hole_count, min_inner_radius, select_bearing)
+
+
+# === Результат расчёта ===
+@dataclass
+class Design:
+    params: Params
+    # Основные размеры
+    e: float
+    zg: int
+    z_rollers: int
+    Rin: float
+    r_roller: float
+    rd: float
+    hc: float
+    Rsep_m: float
+    Rsep_out: float
+    Rsep_in: float
+    separator_h: float
+    eccentric_h: float
+    h_reducer: float
+    cap_thickness: float
+    # Подшипник сепаратора
+    bearing: dict
+    # Профиль жёсткого колеса
+    theta: np.ndarray
+    x_rigid: np.ndarray
+    y_rigid: np.ndarray
+    r_rigid: np.ndarray
+    min_thickness: float
+    # Отверстия группы A
+    n_holes: int
+    best_angle: float
+    hole_x: np.ndarray
+    hole_y: np.ndarray
+    # Отверстия группы B
+    motor_angles_deg: np.ndarray
+    motor_radius: float
+    motor_x: np.ndarray
+    motor_y: np.ndarray
+    # Готовый текст OpenSCAD-модели; None — ещё не построен
+    scad_text: str = field(default=None, repr=False)
+
+    @property
+    def bearing_name(self):
+        return self.bearing["name"]
+
+    @property
+    def scad(self):
+        """Текст OpenSCAD-модели, строится при первом обращении."""
+        if self.scad_text is None:
+            from . import scad
+            self.scad_text = scad.render(self)
+        return self.scad_text
+
+    def profile_chunks(self, size=None):
+        """Профиль порциями (theta, x, y): срезы готовых массивов или, при low_memory, заново."""
+        size = size or PROFILE_CHUNK
+        if self.x_rigid is not None:
+            for start in range(0, len(self.x_rigid), size):
+                part = slice(start, start + size)
+                yield self.theta[part], self.x_rigid[part], self.y_rigid[part]
+        else:
+            p = self.params
+            yield from profile_chunks(self.e, self.zg, self.rd, self.r_roller, p.resolution, p.chord_tol,
+                                      profile_dtype(p), size, p.clearance)
+
+    def profile_xy(self):
+        """Точки профиля целиком (x, y); при low_memory собираются из порций и не сохраняются."""
+        if self.x_rigid is not None:
+            return self.x_rigid, self.y_rigid
+        parts = [(x, y) for _, x, y in self.profile_chunks()]
+        return np.concatenate([x for x, _ in parts]), np.concatenate([y for _, y in parts])
+
+    @cached_property
+    def features(self):
+        """Точные впадины и вершины профиля (profile_features)."""
+        return profile_features(self.e, self.zg, self.rd, self.r_roller, self.params.clearance)
+
+    @property
+    def profile_size(self):
+        if self.theta is not None:
+            return len(self.theta)
+        p = self.params
+        if p.chord_tol > 0:
+            return len(adaptive_theta(self.e, self.zg, self.rd, self.r_roller, p.chord_tol, p.clearance))
+        return p.resolution
+
+    def write_scad(self, f):
+        """Пишет OpenSCAD-модель в текстовый файл f, не держа весь текст в памяти."""
+        if self.scad_text is not None:
+            f.write(self.scad_text)
+        else:
+            from . import scad
+            scad.write(self, f)
+
+
+# === Проверка эквидистанты ===
+def check_offset(e, zg, rd, r_roller, clearance):
+    """Профиль со сдвигом clearance не должен самопересекаться.
+
+    Эквидистанта кривой центров роликов идёт в ту же сторону, что и сама кривая,
+    пока радиус эквидистанты меньше радиуса кривизны; там, где касательные
+    становятся встречными, у профиля появляется петля.
+    """
+    if clearance == 0:
+        return
+    t = np.linspace(0.0, np.pi / zg, FEATURE_PILOT + 1)
+    dx, dy, _, _ = profile_derivatives(t, e, zg, rd, r_roller, clearance)
+    cx, cy, _, _ = profile_derivatives(t, e, zg, rd, r_roller, -r_roller)
+    if r_roller + clearance <= 0 or np.any(dx * cx + dy * cy <= 0):
+        raise GeometryError(
+            "Зазор печати {0} мм не помещается в профиль: эквидистанта самопересекается. "
+            "Уменьшите зазор или увеличьте диаметр роликов.".format(clearance))
+
+
+# === Генерация профиля жёсткого колеса ===
+def center_radius(alpha, e, R):
+    """Расстояние от оси до центра ролика, прижатого к эксцентрику.
+
+    alpha — угол между направлением эксцентриситета и пазом сепаратора,
+    R — сумма радиусов ролика и эксцентрика. Возвращает (l, S).
+    """
+    S = np.sqrt(R ** 2 - (e * np.sin(alpha)) ** 2)
+    return e * np.cos(alpha) + S, S
+
+
+def profile_at(theta, e, zg, rd, r_roller, clearance=0.0):
+    """Точки профиля жёсткого колеса для заданных значений параметра theta.
+
+    Направление θ + Xi — нормаль к кривой центров роликов, поэтому зазор печати
+    clearance (мм) сдвигает профиль точно по нормали: радиус эквидистанты r_roller + clearance.
+    """
+    l, S = center_radius(zg * theta, e, r_roller + rd)
+    Xi = np.arctan2(e * zg * np.sin(zg * theta), S)
+    x_rigid = l * np.sin(theta) + (r_roller + clearance) * np.sin(theta + Xi)
+    y_rigid = l * np.cos(theta) + (r_roller + clearance) * np.cos(theta + Xi)
+    return x_rigid, y_rigid
+
+
+def profile_derivatives(theta, e, zg, rd, r_roller, clearance=0.0):
+    """Первая и вторая производные профиля по theta в замкнутом виде.
+
+    Профиль P = l·u(θ) + r·u(θ + Xi), где u(φ) = (sin φ, cos φ), r = r_roller + clearance;
+    возвращает (x', y', x'', y'').
+    """
+    s = np.sin(zg * theta)
+    c = np.cos(zg * theta)
+    S = np.sqrt((r_roller + rd) ** 2 - (e * s) ** 2)
+    dS = -e**2 * zg * s * c / S
+    d2S = (-e**2 * zg**2 * (c**2 - s**2) - dS**2) / S
+    l = e * c + S
+    dl = -e * zg * s + dS
+    d2l = -e * zg**2 * c + d2S
+
+    N = e * zg * s
+    dN = e * zg**2 * c
+    d2N = -e * zg**3 * s
+    den = N**2 + S**2
+    num = dN * S - N * dS
+    dXi = num / den
+    d2Xi = ((d2N * S - N * d2S) * den - num * (2 * N * dN + 2 * S * dS)) / den**2
+    Xi = np.arctan2(N, S)
+
+    phi = theta + Xi
+    r = r_roller + clearance
+    # u(φ) = (sin φ, cos φ), u' = (cos φ, -sin φ), u'' = -u
+    dx = dl * np.sin(theta) + l * np.cos(theta) + r * (1 + dXi) * np.cos(phi)
+    dy = dl * np.cos(theta) - l * np.sin(theta) - r * (1 + dXi) * np.sin(phi)
+    d2x = (d2l - l) * np.sin(theta) + 2 * dl * np.cos(theta) \
+        + r * d2Xi * np.cos(phi) - r * (1 + dXi) ** 2 * np.sin(phi)
+    d2y = (d2l - l) * np.cos(theta) - 2 * dl * np.sin(theta) \
+        - r * d2Xi * np.sin(phi) - r * (1 + dXi) ** 2 * np.cos(phi)
+    return dx, dy, d2x, d2y
+
+
+# Плотность опорной сетки на половину впадины при адаптивной разбивке
+ADAPTIVE_PILOT = 2048
+
+
+def adaptive_theta(e, zg, rd, r_roller, chord_tol, clearance=0.0):
+    """Значения theta, при которых хорды профиля отклоняются от кривой не более чем на chord_tol (мм).
+
+    Стрелка прогиба хорды на участке dθ равна |P'|·|ψ'|·dθ²/8, где ψ — угол касательной,
+    поэтому плотность точек пропорциональна sqrt(|P'|·|ψ'| / (8·chord_tol)).
+    Точки расставляются на половине впадины (от вершины до дна), затем
+    отражаются и повторяются zg раз, так что вершины и впадины попадают в сетку точно.
+    """
+    half = np.pi / zg
+    t = np.linspace(0.0, half, ADAPTIVE_PILOT + 1)
+    dx, dy, d2x, d2y = profile_derivatives(t, e, zg, rd, r_roller, clearance)
+    speed2 = dx**2 + dy**2
+    turn = np.abs(dx * d2y - dy * d2x) / speed2    # |ψ'|
+    density = np.sqrt(np.sqrt(speed2) * turn / (8 * chord_tol))
+    cumulative = np.concatenate([[0.0], np.cumsum((density[1:] + density[:-1]) / 2 * np.diff(t))])
+    n = max(2, int(np.ceil(cumulative[-1])))
+    half_theta = np.interp(np.linspace(0.0, cumulative[-1], n + 1), cumulative, t)
+    lobe = np.concatenate([half_theta[:-1], 2 * half - half_theta[:0:-1]])
+    return (lobe[None, :] + 2 * half * np.arange(zg)[:, None]).ravel()
+
+
+# Точек профиля в одной порции при потоковой обработке
+PROFILE_CHUNK = 1 << 16
+
+
+def profile_dtype(p):
+    return np.float32 if p.float32 else np.float64
+
+
+def profile_chunks(e, zg, rd, r_roller, resolution, chord_tol=0.0, dtype=np.float64, size=PROFILE_CHUNK,
+                   clearance=0.0):
+    """Профиль порциями по size точек: (theta, x, y), те же значения, что у rigid_profile.
+
+    Промежуточные массивы (S, l, Xi) живут только в пределах порции, поэтому
+    память не растёт с числом точек; x и y приводятся к dtype.
+    """
+    if chord_tol > 0:
+        theta_all = adaptive_theta(e, zg, rd, r_roller, chord_tol, clearance)
+        count = len(theta_all)
+    else:
+        theta_all = None
+        count = resolution
+        step = 2 * np.pi / resolution
+    for start in range(0, count, size):
+        if theta_all is None:
+            # Так же, как np.linspace(0, 2π, resolution, endpoint=False)
+            theta = np.arange(start, min(start + size, count)) * step
+        else:
+            theta = theta_all[start:start + size]
+        x, y = profile_at(theta, e, zg, rd, r_roller, clearance)
+        yield theta, x.astype(dtype, copy=False), y.astype(dtype, copy=False)
+
+
+def rigid_profile(e, zg, rd, r_roller, resolution, chord_tol=0.0, clearance=0.0):
+    """Профиль жёсткого колеса: равномерно по theta или адаптивно при chord_tol > 0."""
+    if chord_tol > 0:
+        theta = adaptive_theta(e, zg, rd, r_roller, chord_tol, clearance)
+    else:
+        theta = np.linspace(0, 2 * np.pi, resolution, endpoint=False)
+    x_rigid, y_rigid = profile_at(theta, e, zg, rd, r_roller, clearance)
+    return theta, x_rigid, y_rigid
+
+
+def stored_profile(e, zg, rd, r_roller, resolution, chord_tol=0.0, dtype=np.float64, clearance=0.0):
+    """Профиль для хранения в Design: (theta, x, y, r), точки в типе dtype."""
+    theta, x_rigid, y_rigid = rigid_profile(e, zg, rd, r_roller, resolution, chord_tol, clearance)
+    x_rigid = x_rigid.astype(dtype, copy=False)
+    y_rigid = y_rigid.astype(dtype, copy=False)
+    return theta, x_rigid, y_rigid, np.sqrt(x_rigid**2 + y_rigid**2)
+
+
+# === Впадины и вершины профиля ===
+# Шагов опорной сетки на половину впадины при поиске экстремумов радиуса между осями симметрии
+FEATURE_PILOT = 512
+FEATURE_BISECTIONS = 60
+
+
+@dataclass
+class ProfileFeatures:
+    """Экстремумы радиуса профиля: впадины (минимумы) и вершины (максимумы) с точными углами и координатами."""
+    valley_theta: np.ndarray
+    valley_x: np.ndarray
+    valley_y: np.ndarray
+    peak_theta: np.ndarray
+    peak_x: np.ndarray
+    peak_y: np.ndarray
+
+    @property
+    def valley_r(self):
+        return np.hypot(self.valley_x, self.valley_y)
+
+    @property
+    def peak_r(self):
+        return np.hypot(self.peak_x, self.peak_y)
+
+    @property
+    def r_min(self):
+        return float(np.min(self.valley_r))
+
+    @property
+    def r_max(self):
+        return float(np.max(self.peak_r))
+
+
+def _radial_rate(theta, e, zg, rd, r_roller, clearance=0.0):
+    """d(r²)/dθ / 2 и её производная по theta."""
+    x, y = profile_at(theta, e, zg, rd, r_roller, clearance)
+    dx, dy, d2x, d2y = profile_derivatives(theta, e, zg, rd, r_roller, clearance)
+    return x * dx + y * dy, dx**2 + dy**2 + x * d2x + y * d2y
+
+
+def profile_features(e, zg, rd, r_roller, clearance=0.0):
+    """Впадины и вершины профиля по всем zg лепесткам, не зависящие от разбивки профиля.
+
+    Профиль симметричен относительно theta = πk/zg, поэтому там радиус экстремален
+    и Xi = 0. Остальные экстремумы (если профиль подрезан) ищутся как корни
+    d(r²)/dθ на опорной сетке половины впадины и уточняются делением пополам,
+    затем отражаются и повторяются zg раз. Вид экстремума — по знаку второй производной.
+    """
+    half = np.pi / zg
+    t = np.linspace(0.0, half, FEATURE_PILOT + 1)[1:-1]
+    g, _ = _radial_rate(t, e, zg, rd, r_roller, clearance)
+    roots = np.flatnonzero(np.sign(g[:-1]) * np.sign(g[1:]) < 0)
+    lo, hi = t[roots], t[roots + 1]
+    g_lo = g[roots]
+    for _ in range(FEATURE_BISECTIONS if len(roots) else 0):
+        mid = (lo + hi) / 2
+        g_mid, _ = _radial_rate(mid, e, zg, rd, r_roller, clearance)
+        left = np.sign(g_mid) == np.sign(g_lo)
+        lo = np.where(left, mid, lo)
+        g_lo = np.where(left, g_mid, g_lo)
+        hi = np.where(left, hi, mid)
+    inner = (lo + hi) / 2
+
+    lobe = np.concatenate([[0.0], inner, [half], 2 * half - inner[::-1]])
+    _, curvature = _radial_rate(lobe, e, zg, rd, r_roller, clearance)
+    theta = (lobe[None, :] + 2 * half * np.arange(zg)[:, None]).ravel()
+    valley = np.tile(curvature > 0, zg)
+    x, y = profile_at(theta, e, zg, rd, r_roller, clearance)
+    return ProfileFeatures(theta[valley], x[valley], y[valley], theta[~valley], x[~valley], y[~valley])
+
+
+def sampled_valleys(features, e, zg, rd, r_roller, resolution, clearance=0.0):
+    """Впадины равномерного профиля из resolution точек: у каждой точной впадины — соседняя вершина
+    многоугольника с меньшим радиусом, как их находил поиск локальных минимумов по точкам."""
+    step = 2 * np.pi / resolution
+    below = np.floor(features.valley_theta / step)
+    theta = np.stack([below, below + 1]) % resolution * step
+    x, y = profile_at(theta, e, zg, rd, r_roller, clearance)
+    k = np.argmin(x * x + y * y, axis=0)
+    columns = np.arange(len(k))
+    return x[k, columns], y[k, columns]
+
+
+# Сколько углов поворота обрабатывать за один проход, чтобы массив
+# (углы × отверстия × впадины) не разрастался при мелком шаге
+ANGLE_CHUNK = 4096
+# Суммы расстояний, различающиеся меньше этого (мм), считаются равными: впадины точные и симметричные,
+# так что повороты отверстий на период симметрии равноценны. Из них берётся ближайший к впадинам из точек
+# профиля — тот же, что выбирал перебор по вершинам многоугольника, — а без них наименьший угол
+HOLE_TIE_TOLERANCE = 1e-9
+
+
+def hole_distances(angles, initial_x, initial_y, valley_x, valley_y):
+    """Сумма расстояний от отверстий до ближайших впадин для каждого угла поворота."""
+    angles = np.atleast_1d(angles)
+    if len(valley_x) == 0:
+        return np.full(len(angles), 1e6 * len(initial_x))
+    total = np.empty(len(angles))
+    for start in range(0, len(angles), ANGLE_CHUNK):
+        a = angles[start:start + ANGLE_CHUNK, None]
+        c = np.cos(a)
+        s = np.sin(a)
+        rotated_x = initial_x * c - initial_y * s
+        rotated_y = initial_x * s + initial_y * c
+        dx = rotated_x[:, :, None] - valley_x
+        dy = rotated_y[:, :, None] - valley_y
+        nearest = np.sqrt(dx * dx + dy * dy).min(axis=2)
+        # Суммируем по отверстиям по порядку: при симметричных вариантах с равной
+        # суммой так выбирается тот же угол, что и при поштучном переборе
+        chunk_total = nearest[:, 0].copy()
+        for k in range(1, nearest.shape[1]):
+            chunk_total += nearest[:, k]
+        total[start:start + ANGLE_CHUNK] = chunk_total
+    return total
+
+
+def search_hole_angle(valley_x, valley_y, radius, n_holes, step_deg=1.0, refine=False, tie_valleys=None):
+    """Угол поворота отверстий A, при котором они ближе всего к впадинам профиля.
+
+    Перебор идёт с шагом step_deg по всему кругу; при refine найденный угол
+    уточняется последовательным сужением сетки вокруг минимума. tie_valleys —
+    (x, y) впадин из точек профиля (sampled_valleys) для выбора среди равноценных углов.
+    """
+    angle_step = 2 * np.pi / n_holes
+    initial_angles = np.linspace(0, 2*np.pi - angle_step, n_holes)
+    initial_x = radius * np.cos(initial_angles)
+    initial_y = radius * np.sin(initial_angles)
+
+    n_steps = int(round(360.0 / step_deg))
+    angles = np.deg2rad(np.arange(n_steps) * step_deg)
+    total = hole_distances(angles, initial_x, initial_y, valley_x, valley_y)
+    ties = np.flatnonzero(total <= np.min(total) + HOLE_TIE_TOLERANCE)
+    k = int(ties[0])
+    if tie_valleys is not None and len(ties) > 1:
+        # Суммы по точкам профиля у равноценных углов различаются лишь округлением, но тем же,
+        # что и в переборе по вершинам: первый минимум даёт прежнюю раскладку отверстий
+        k = int(ties[np.argmin(hole_distances(angles[ties], initial_x, initial_y, *tie_valleys))])
+    best_angle = angles[k]
+    best_total = total[k]
+
+    if refine:
+        half = np.deg2rad(step_deg)
+        while half > 1e-9:
+            angles = np.linspace(best_angle - half, best_angle + half, 33)
+            total = hole_distances(angles, initial_x, initial_y, valley_x, valley_y)
+            k = int(np.argmin(total))
+            if total[k] < best_total:
+                best_angle = angles[k]
+                best_total = total[k]
+            half /= 16
+        best_angle %= 2 * np.pi
+    return float(best_angle)
+
+
+# === Генерация и поворот основных отверстий ===
+def place_holes(valley_x, valley_y, R_out, min_thickness, n_holes, step_deg=1.0, refine=False, tie_valleys=None):
+    best_angle = search_hole_angle(valley_x, valley_y, R_out * 0.8, n_holes, step_deg, refine, tie_valleys)
+
+    # Отверстия ставим посередине минимальной стенки
+    angles = best_angle + 2 * np.pi * np.arange(n_holes) / n_holes
+    target_radius = R_out - min_thickness / 2
+    hole_x = target_radius * np.cos(angles)
+    hole_y = target_radius * np.sin(angles)
+    return best_angle, hole_x, hole_y
+
+
+# === Отверстия B: 4 симметричных ===
+def motor_holes(best_angle, hole_x, hole_y, R_out):
+    base_motor_angles_deg = np.array([0.0, 90.0, 180.0, 270.0])
+    motor_angles_deg = (base_motor_angles_deg + np.degrees(best_angle)) % 360
+
+    # Проверяем, есть ли хотя бы одно отверстие B, слишком близкое к любому отверстию A
+    angles_A_deg = np.degrees(np.arctan2(hole_y, hole_x)) % 360
+    needs_shift = False
+    for ang_B in motor_angles_deg:
+        min_diff = np.min(np.abs((angles_A_deg - ang_B + 180) % 360 - 180))
+        if min_diff < 10.0:
+            needs_shift = True
+            break
+
+    # Если нужно — смещаем ВСЕ отверстия B на +15°
+    if needs_shift:
+        motor_angles_deg = (motor_angles_deg + 15.0) % 360
+
+    motor_radius = R_out - 3.0
+    motor_x = motor_radius * np.cos(np.deg2rad(motor_angles_deg))
+    motor_y = motor_radius * np.sin(np.deg2rad(motor_angles_deg))
+    return motor_angles_deg, motor_radius, motor_x, motor_y
+
+
+def design(params=None, **overrides):
+    """Полный расчёт редуктора. Функция чистая: ничего не печатает и не пишет на диск.
+
+    Текст OpenSCAD строится лениво при обращении к Design.scad.
+    """
+    p = params if params is not None else Params()
+    if overrides:
+        p = Params.from_dict({**p.to_dict(), **overrides})
+
+    with stage("derive"):
+        d = derive(p)
+        check_geometry(d["Rin"], p.d_roller, d["zg"])
+        check_offset(d["e"], d["zg"], d["rd"], d["r_roller"], p.clearance)
+
+    R_out = p.D / 2
+    # Толщина стенки и впадины берутся из точных экстремумов профиля, а не из его точек
+    with stage("features"):
+        features = profile_features(d["e"], d["zg"], d["rd"], d["r_roller"], p.clearance)
+        min_thickness = R_out - features.r_max
+    if p.low_memory:
+        # Профиль не хранится: SCAD и DXF получают его порциями при записи
+        theta = x_rigid = y_rigid = r_rigid = None
+    else:
+        with stage("profile") as s:
+            theta, x_rigid, y_rigid, r_rigid = stored_profile(d["e"], d["zg"], d["rd"], d["r_roller"], p.resolution,
+                                                              p.chord_tol, profile_dtype(p), p.clearance)
+            s.note(theta=theta, x_rigid=x_rigid, y_rigid=y_rigid, r_rigid=r_rigid)
+
+    with stage("hole_search") as s:
+        # Адаптивная сетка проходит через впадины точно: равноценные углы различать нечем
+        tie_valleys = None if p.chord_tol > 0 else sampled_valleys(features, d["e"], d["zg"], d["rd"], d["r_roller"],
+                                                                    p.resolution, p.clearance)
+        best_angle, hole_x, hole_y = place_holes(features.valley_x, features.valley_y, R_out, min_thickness, d["n_holes"],
+                                                 p.hole_step, p.hole_refine, tie_valleys)
+        s.note(hole_x=hole_x, hole_y=hole_y)
+    with stage("motor_holes"):
+        motor_angles_deg, motor_radius, motor_x, motor_y = motor_holes(best_angle, hole_x, hole_y, R_out)
+
+    return Design(
+        params=p,
+        theta=theta,
+        x_rigid=x_rigid,
+        y_rigid=y_rigid,
+        r_rigid=r_rigid,
+        min_thickness=min_thickness,
+        best_angle=best_angle,
+        hole_x=hole_x,
+        hole_y=hole_y,
+        motor_angles_deg=motor_angles_deg,
+        motor_radius=motor_radius,
+        motor_x=motor_x,
+        motor_y=motor_y,
+        **d,
+    )
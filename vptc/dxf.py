@@ -0,0 +1,72 @@
+import io
+
+import numpy as np
+
+# Слои DXF: имя -> цвет ACI
+LAYERS = {
+    "PROFILE": 1,   # профиль впадин жёсткого колеса
+    "OUTER": 7,     # наружный контур корпуса
+    "HOLES_A": 3,   # крепёжные отверстия корпуса (группа A)
+    "HOLES_B": 5,   # отверстия под кожух мотора (группа B)
+}
+
+# Радиус отверстий под M3, как в SCAD-модели
+HOLE_RADIUS = 1.6
+
+
+def _import_ezdxf():
+    try:
+        import ezdxf
+    except ImportError:
+        raise RuntimeError("Для записи DXF нужен пакет ezdxf (pip install ezdxf)")
+    return ezdxf
+
+
+def profile_document(d, spline=False):
+    """DXF-документ с плоским профилем жёсткого колеса и отверстиями в миллиметрах.
+
+    Профиль пишется одной замкнутой LWPOLYLINE по всем точкам разом либо,
+    при spline=True, сплайном через точки профиля с совпадающими касательными в точке замыкания.
+    """
+    ezdxf = _import_ezdxf()
+    doc = ezdxf.new("R2010", setup=False)
+    doc.units = ezdxf.units.MM
+    for name, color in LAYERS.items():
+        doc.layers.add(name, color=color)
+    msp = doc.modelspace()
+
+    if spline:
+        points = np.column_stack(d.profile_xy()).astype(float)
+        tangent = points[1] - points[-1]
+        fit = msp.add_spline(np.vstack([points, points[:1]]), dxfattribs={"layer": "PROFILE"})
+        fit.dxf.start_tangent = (*tangent, 0.0)
+        fit.dxf.end_tangent = (*tangent, 0.0)
+    else:
+        # add_lwpolyline() добавляет вершины по одной с копированием массива (квадратично по числу точек),
+        # поэтому вершины (x, y, ширины, кривизна) передаются массивами, по порции профиля за раз
+        polyline = msp.add_lwpolyline([], close=True, dxfattribs={"layer": "PROFILE"})
+        for _, x, y in d.profile_chunks():
+            vertices = np.zeros((len(x), 5))
+            vertices[:, 0] = x
+            vertices[:, 1] = y
+            polyline.lwpoints.extend(vertices)
+
+    msp.add_circle((0.0, 0.0), d.params.D / 2, dxfattribs={"layer": "OUTER"})
+    for x, y in zip(d.hole_x, d.hole_y):
+        msp.add_circle((float(x), float(y)), HOLE_RADIUS, dxfattribs={"layer": "HOLES_A"})
+    for x, y in zip(d.motor_x, d.motor_y):
+        msp.add_circle((float(x), float(y)), HOLE_RADIUS, dxfattribs={"layer": "HOLES_B"})
+    return doc
+
+
+def write_dxf(d, path, spline=False):
+    profile_document(d, spline).saveas(path)
+    return path
+
+
+def dxf_bytes(d, spline=False):
+    """Текст DXF в байтах — для ответа сервера или кэша без промежуточного файла."""
+    doc = profile_document(d, spline)
+    stream = io.StringIO()
+    doc.write(stream)
+    return stream.getvalue().encode(doc.output_encoding)
@@ -0,0 +1,162 @@
+from dataclasses import fields
+from operator import itemgetter
+
+import numpy as np
+
+from . import dxf, scad, stl
+from .core import (Design, Params, cap_thickness, check_geometry, check_offset, dimensions, heights, hole_count, motor_holes,
+                   place_holes, profile_features, sampled_valleys, select_bearing, stored_profile)
+from .profiling import stage
+
+PARAM_NAMES = tuple(f.name for f in fields(Params))
+# Входы графа сверх Params: настройки вывода STL и DXF
+OUTPUT_INPUTS = {"fn": stl.DEFAULT_FN, "spline": False}
+
+
+# === Узлы графа ===
+def _geometry(Rin, d_roller, zg, e, rd, r_roller, clearance):
+    check_geometry(Rin, d_roller, zg)
+    check_offset(e, zg, rd, r_roller, clearance)
+    return True
+
+
+def _profile(geometry, e, zg, rd, r_roller, clearance, resolution, chord_tol, float32, low_memory):
+    if low_memory:
+        # Профиль не хранится: SCAD и DXF получают его порциями при записи
+        return None, None, None, None
+    return stored_profile(e, zg, rd, r_roller, resolution, chord_tol, np.float32 if float32 else np.float64,
+                          clearance)
+
+
+def _holes(features, D, min_thickness, n_holes, hole_step, hole_refine, e, zg, rd, r_roller, resolution, chord_tol,
+           clearance):
+    tie_valleys = None if chord_tol > 0 else sampled_valleys(features, e, zg, rd, r_roller, resolution, clearance)
+    return place_holes(features.valley_x, features.valley_y, D / 2, min_thickness, n_holes, hole_step, hole_refine,
+                       tie_valleys)
+
+
+def _design(params, dims, heights, bearing, cap_thickness, n_holes, features, profile, min_thickness, holes, motor):
+    theta, x_rigid, y_rigid, r_rigid = profile
+    best_angle, hole_x, hole_y = holes
+    motor_angles_deg, motor_radius, motor_x, motor_y = motor
+    d = Design(params=params, **dims, **heights, bearing=bearing, cap_thickness=cap_thickness, n_holes=n_holes,
+               theta=theta, x_rigid=x_rigid, y_rigid=y_rigid, r_rigid=r_rigid, min_thickness=min_thickness,
+               best_angle=best_angle, hole_x=hole_x, hole_y=hole_y, motor_angles_deg=motor_angles_deg,
+               motor_radius=motor_radius, motor_x=motor_x, motor_y=motor_y)
+    # Экстремумы уже посчитаны узлом features
+    d.features = features
+    return d
+
+
+def _scad(design, scad_points):
+    design.scad_text = scad.render(design, scad_points)
+    return design.scad_text
+
+
+# Узел: имя -> (функция, имена входов и узлов, от которых она зависит; по порядку аргументов)
+NODES = {
+    "params": (lambda *values: Params(*values), PARAM_NAMES),
+    "dims": (dimensions, ("i", "d_roller", "Rout", "u")),
+    **{name: (itemgetter(name), ("dims",))
+       for name in ("e", "zg", "z_rollers", "Rin", "r_roller", "rd", "hc", "Rsep_m", "Rsep_out", "Rsep_in")},
+    "heights": (heights, ("h_roller",)),
+    "bearing": (select_bearing, ("Rsep_out",)),
+    "cap_thickness": (cap_thickness, ("bearing",)),
+    "n_holes": (hole_count, ("D",)),
+    "geometry": (_geometry, ("Rin", "d_roller", "zg", "e", "rd", "r_roller", "clearance")),
+    "features": (lambda geometry, e, zg, rd, r_roller, clearance: profile_features(e, zg, rd, r_roller, clearance),
+                 ("geometry", "e", "zg", "rd", "r_roller", "clearance")),
+    "min_thickness": (lambda D, features: D / 2 - features.r_max, ("D", "features")),
+    "profile": (_profile, ("geometry", "e", "zg", "rd", "r_roller", "clearance", "resolution", "chord_tol", "float32",
+                           "low_memory")),
+    "holes": (_holes, ("features", "D", "min_thickness", "n_holes", "hole_step", "hole_refine", "e", "zg", "rd",
+                       "r_roller", "resolution", "chord_tol", "clearance")),
+    "motor": (lambda holes, D: motor_holes(*holes, D / 2), ("holes", "D")),
+    "design": (_design, ("params", "dims", "heights", "bearing", "cap_thickness", "n_holes", "features", "profile",
+                         "min_thickness", "holes", "motor")),
+    "scad_points": (lambda profile: None if profile[1] is None else scad.format_points(profile[1], profile[2]),
+                    ("profile",)),
+    "scad": (_scad, ("design", "scad_points")),
+    **{f"stl_{part}": (lambda design, fn, part=part: stl.stl_bytes(stl.PART_MESHES[part](design, fn), f"vptc {part}"),
+                       ("design", "fn"))
+       for part in stl.STL_PARTS},
+    "dxf": (dxf.dxf_bytes, ("design", "spline")),
+}
+
+
+def _same(old, new):
+    """Значение узла не изменилось: тогда зависящие от него узлы не пересчитываются."""
+    if old is new:
+        return True
+    if isinstance(old, np.ndarray) or isinstance(new, np.ndarray):
+        return False
+    try:
+        return bool(old == new)
+    except (ValueError, TypeError):
+        # Составные значения с массивами внутри не сравниваются
+        return False
+
+
+class DesignGraph:
+    """Расчёт редуктора как граф именованных узлов с запоминанием значений.
+
+    Входы — поля Params и настройки вывода (OUTPUT_INPUTS), узлы — производные
+    величины из NODES. Узел считается при первом обращении и пересчитывается,
+    только если изменилось значение хотя бы одного из его входов; если новое
+    значение равно старому, узлы ниже по графу не пересчитываются. Так после
+    set(D=...) профиль не строится заново, а после set(h_roller=...) не ищутся отверстия.
+    """
+
+    def __init__(self, params=None, **outputs):
+        self.inputs = {**(params or Params()).to_dict(), **OUTPUT_INPUTS, **outputs}
+        self._versions = dict.fromkeys(self.inputs, 0)
+        self._nodes = {}    # имя -> (значение, версия, версии входов)
+        self.computed = []  # узлы, пересчитанные после последнего set()
+
+    @property
+    def params(self):
+        return self.get("params")
+
+    def set(self, params=None, **changes):
+        """Меняет входы: поля Params (объектом или по имени) и настройки вывода."""
+        if params is not None:
+            changes = {**params.to_dict(), **changes}
+        outputs = {name: changes.pop(name) for name in OUTPUT_INPUTS if name in changes}
+        values = Params.from_dict({**self.params.to_dict(), **changes}).to_dict() if changes else {}
+        values.update(outputs)
+        for name, value in values.items():
+            if not _same(self.inputs[name], value):
+                self.inputs[name] = value
+                self._versions[name] += 1
+        self.computed = []
+        return self
+
+    def version(self, name):
+        if name in self.inputs:
+            return self._versions[name]
+        return self._nodes[name][1]
+
+    def get(self, name):
+        if name in self.inputs:
+            return self.inputs[name]
+        func, deps = NODES[name]
+        args = [self.get(dep) for dep in deps]
+        versions = tuple(self.version(dep) for dep in deps)
+        cached = self._nodes.get(name)
+        if cached is not None and cached[2] == versions:
+            return cached[0]
+        with stage(name):
+            value = func(*args)
+        self.computed.append(name)
+        if cached is None:
+            self._nodes[name] = (value, 1, versions)
+        elif _same(cached[0], value):
+            self._nodes[name] = (cached[0], cached[1], versions)
+        else:
+            self._nodes[name] = (value, cached[1] + 1, versions)
+        return self._nodes[name][0]
+
+    __getitem__ = get
+
+    def design(self):
+        return self.get("design")
@@ -0,0 +1,347 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .clearance import CONTACT_TOLERANCE
+
+# Углов входа на одну порцию расчёта: массивы (углы × ролики) порции занимают единицы МБ
+SIM_CHUNK = 32768
+# Ячеек сетки по каждую сторону окна поворота сепаратора, в которых ищутся смены знака зазора роликов;
+# сетка сгущается к δ = 0 квадратично — там лежат концы участков у роликов в контакте
+ROOT_GRID = 16
+ROOT_ITERATIONS = 60
+ROOT_TOL = 1e-12    # точность угла касания (рад)
+# Шаги порции, которые ищут концы сеткой; между ними каждый шаг начинает от концов предыдущего
+WARM_STRIDE = 32
+ARCMIN = 180 * 60 / np.pi
+
+
+# === Предельная кривая центров роликов ===
+def center_limit(x_rigid, y_rigid, r_roller):
+    """Внутренний эквидистант профиля на радиус ролика в полярном виде.
+
+    Возвращает (phi, rho): при угле паза phi центр ролика не может уйти дальше rho
+    от оси. Углы отсчитываются от оси Y, как в параметризации профиля (x = l·sin, y = l·cos).
+    """
+    tx = np.roll(x_rigid, -1) - np.roll(x_rigid, 1)
+    ty = np.roll(y_rigid, -1) - np.roll(y_rigid, 1)
+    length = np.hypot(tx, ty)
+    # Обход по часовой стрелке (как у профиля) — наружная нормаль (-ty, tx)
+    area = np.sum(x_rigid * np.roll(y_rigid, -1) - np.roll(x_rigid, -1) * y_rigid)
+    sign = 1.0 if area < 0 else -1.0
+    cx = x_rigid - r_roller * sign * -ty / length
+    cy = y_rigid - r_roller * sign * tx / length
+    phi = np.mod(np.arctan2(cx, cy), 2 * np.pi)
+    order = np.argsort(phi)
+    return phi[order], np.hypot(cx, cy)[order]
+
+
+def limit_table(phi, rho, size=None):
+    """Предельная кривая на равномерной сетке по углу: поиск ячейки — одно деление, без searchsorted."""
+    size = size or max(1 << 16, 4 * len(phi))
+    grid = np.linspace(0.0, 2 * np.pi, size + 1)
+    return np.interp(grid, phi, rho, period=2 * np.pi)
+
+
+def _limit_at(table, phi):
+    """Значение и наклон кусочно-линейной предельной кривой при углах phi."""
+    size = len(table) - 1
+    step = 2 * np.pi / size
+    position = np.mod(phi, 2 * np.pi)
+    position *= 1 / step
+    cell = np.minimum(position.astype(np.intp), size - 1)
+    rho0 = np.take(table, cell)
+    rise = np.take(table, cell + 1)
+    rise -= rho0
+    position -= cell
+    position *= rise
+    position += rho0
+    rise *= 1 / step
+    return position, rise
+
+
+def _eccentric(alpha, e, R):
+    """Радиус центра ролика от эксцентрика и его производная по alpha (l из center_radius,
+    синус и косинус считаются один раз на оба)."""
+    s, c = np.sin(alpha), np.cos(alpha)
+    S = np.sqrt(R ** 2 - (e * s) ** 2)
+    return e * c + S, -e * s - e**2 * s * c / S
+
+
+# === Результат моделирования ===
+@dataclass
+class Simulation:
+    ratio: int
+    psi: np.ndarray         # угол поворота эксцентрика (рад)
+    # Шаги, где упор не найден в окне поворота (ролик с натягом во всём окне или нет касания
+    # с одной из сторон), в этом и следующих массивах — NaN и не входят в статистику summary
+    output: np.ndarray      # угол сепаратора с нагрузкой на выходе (рад)
+    te: np.ndarray          # кинематическая погрешность: отставание от -psi/ratio (рад)
+    backlash: np.ndarray    # свободный ход сепаратора (рад), < 0 — натяг
+    clearance: np.ndarray   # наименьший радиальный зазор среди роликов (мм), < 0 — натяг
+    # Центры роликов и точки контакта с профилем (углы × ролики), если запрошены
+    roller_x: np.ndarray = field(default=None, repr=False)
+    roller_y: np.ndarray = field(default=None, repr=False)
+    contact_x: np.ndarray = field(default=None, repr=False)
+    contact_y: np.ndarray = field(default=None, repr=False)
+
+    @property
+    def resolved(self):
+        return ~np.isnan(self.backlash)
+
+    def summary(self):
+        ok = self.resolved
+        te = self.te[ok] * ARCMIN
+        backlash = self.backlash[ok] * ARCMIN
+        if not ok.any():
+            te = backlash = np.full(1, np.nan)
+        return {
+            "steps": len(self.psi),
+            "unresolved_steps": int(np.count_nonzero(~ok)),
+            "te_pp_arcmin": float(np.ptp(te)),
+            "te_rms_arcmin": float(np.sqrt(np.mean((te - te.mean()) ** 2))),
+            "backlash_mean_arcmin": float(backlash.mean()),
+            "backlash_min_arcmin": float(backlash.min()),
+            "backlash_max_arcmin": float(backlash.max()),
+            "clearance_min_mm": float(self.clearance[ok].min()) if ok.any() else float("nan"),
+        }
+
+
+def _refine(gap, at, lo, hi, g_lo, g_hi):
+    """Корни зазора роликов at в скобках [lo, hi] со сменой знака: Ньютон с защитой бисекцией
+    от точки ложного положения. Сошедшиеся корни выбывают из расчёта; несошедшиеся — NaN."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = lo - g_lo * (hi - lo) / (g_hi - g_lo)
+    delta = np.where((delta > lo) & (delta < hi), delta, (lo + hi) / 2)
+    root = np.full(len(at), np.nan)
+    active = np.arange(len(at))
+    for _ in range(ROOT_ITERATIONS):
+        g, dg, _, _ = gap(at[active], delta)
+        same = (g < 0) == (g_lo < 0)
+        lo = np.where(same, delta, lo)
+        g_lo = np.where(same, g, g_lo)
+        hi = np.where(same, hi, delta)
+        step = np.divide(g, dg, out=np.full_like(g, np.inf), where=dg != 0)
+        newton = delta - step
+        new = np.where((newton > lo) & (newton < hi), newton, (lo + hi) / 2)
+        done = (np.abs(new - delta) < ROOT_TOL) | (hi - lo < ROOT_TOL) | (g == 0)
+        root[active[done]] = delta[done]
+        keep = ~done
+        active, delta, lo, hi, g_lo = active[keep], new[keep], lo[keep], hi[keep], g_lo[keep]
+        if not len(active):
+            break
+    return root
+
+
+def _solve_chunk(psi, slots, table, ratio, zg, e, R, r_roller, rollers):
+    base = -psi / ratio
+    slot = base[:, None] + slots[None, :]
+    shape = slot.shape
+    # Ролики порции — плоским массивом: на каждом шаге поиска считаются только ещё не решённые
+    slot_k = slot.ravel()
+    psi_k = np.repeat(psi, len(slots))
+    # Поворот сепаратора относительно идеального ищется в пределах четверти шага впадин
+    limit = np.pi / (4 * zg)
+
+    def gap(at, delta):
+        phi = slot_k[at] + delta
+        rho_lim, slope = _limit_at(table, phi)
+        rho_ecc, drho_ecc = _eccentric(psi_k[at] - phi, e, R)
+        return rho_lim - rho_ecc, slope + drho_ecc, rho_ecc, slope
+
+    # Ролик ограничивает поворот концами участка знакопостоянства зазора, содержащего δ = 0:
+    # на участке зазора (g ≥ 0) левый конец — упор lead, правый — упор lag; на участке натяга
+    # (g < 0) наоборот, и люфт lag - lead отрицателен
+    everyone = np.arange(slot_k.size)
+    g0 = gap(everyone, 0.0)[0]
+    gap_at_zero = g0 >= 0
+    peak = g0.copy()
+    nodes = limit * (np.arange(ROOT_GRID + 1) / ROOT_GRID) ** 2
+    ends = np.full((2, slot_k.size), np.nan)
+    # Смена знака найдена, а корень не сошёлся — ролик отмечается отдельно от конца за краем окна
+    failed = np.zeros(slot_k.size, dtype=bool)
+    # Ролики, прошедшие по узлам сетки: для них peak — наибольший зазор по узлам
+    scanned = np.zeros(slot_k.size, dtype=bool)
+
+    def add(brackets, side, at, lo, hi, g_lo, g_hi):
+        for column, value in zip(brackets, (side, at, lo, hi, g_lo, g_hi)):
+            column.append(np.broadcast_to(value, len(at)))
+
+    def scan(rollers, brackets):
+        """Скобки концов участков: по узлам сетки от δ = 0 наружу до первой смены знака.
+
+        Узлы обеих сторон считаются одним массивом (ролики × узлы): роликов здесь мало —
+        опорные шаги и потерявшие скобку, — и цикл по узлам стоил бы лишь вызовов numpy.
+        """
+        scanned[rollers] = True
+        offsets = np.concatenate([-nodes[1:], nodes[1:]])
+        g = gap(np.repeat(rollers, len(offsets)), np.tile(offsets, len(rollers)))[0]
+        g = g.reshape(len(rollers), 2, ROOT_GRID)
+        peak[rollers] = np.maximum(g0[rollers], g.max(axis=(1, 2)))
+        g_near = np.concatenate([np.broadcast_to(g0[rollers, None, None], (len(rollers), 2, 1)), g[:, :, :-1]],
+                                axis=2)
+        change = (g < 0) != (g_near < 0)
+        first = np.argmax(change, axis=2)
+        found = change.any(axis=2)
+        for side, sign in enumerate((-1.0, 1.0)):
+            at = np.nonzero(found[:, side])[0]
+            k = first[at, side]
+            g_prev, g_next = g_near[at, side, k], g[at, side, k]
+            near, far = sign * nodes[k], sign * nodes[k + 1]
+            if sign > 0:
+                add(brackets, side, rollers[at], near, far, g_prev, g_next)
+            else:
+                add(brackets, side, rollers[at], far, near, g_next, g_prev)
+
+    def solve(brackets):
+        if brackets[0]:
+            side, at, lo, hi, g_lo, g_hi = (np.concatenate(column) for column in brackets)
+            root = _refine(gap, at, lo, hi, g_lo, g_hi)
+            ends[side, at] = root
+            failed[at[np.isnan(root)]] = True
+
+    # Сеткой решаются лишь опорные шаги через WARM_STRIDE; остальные — фазами, каждая от концов
+    # предыдущего шага: скобка шириной в ячейку сетки у δ = 0 вокруг прежнего конца или проверка
+    # края окна, если конца с этой стороны не было. Потерянная скобка — снова поиск по сетке,
+    # а ролики с натягом во всём окне проходят по узлам одной порцией после всех фаз
+    index = everyone.reshape(shape)
+    brackets = [[] for _ in range(6)]
+    scan(index[::WARM_STRIDE].ravel(), brackets)
+    solve(brackets)
+    for phase in range(1, min(WARM_STRIDE, len(psi))):
+        at = index[phase::WARM_STRIDE].ravel()
+        prev = at - len(slots)
+        lost = failed[prev].copy()
+        warm = []
+        for side, sign in enumerate((-1.0, 1.0)):
+            end = np.abs(ends[side, prev])
+            has = ~np.isnan(end)
+            inner = np.where(has, np.clip(end - nodes[1], 0.0, limit), 0.0)
+            outer = np.where(has, np.clip(end + nodes[1], 0.0, limit), limit)
+            g_in = g0[at]
+            moved = inner > 0
+            g_in[moved] = gap(at[moved], sign * inner[moved])[0]
+            g_out = gap(at, sign * outer)[0]
+            crossed = (g_out < 0) != (g_in < 0)
+            # От δ = 0 до скобки знак зазора не меняется, в скобке — меняется (или нет до края окна)
+            same = (g_in < 0) == (g0[at] < 0)
+            lost |= ~same | (crossed != has)
+            warm.append((side, sign, has, inner, outer, g_in, g_out))
+        brackets = [[] for _ in range(6)]
+        for side, sign, has, inner, outer, g_in, g_out in warm:
+            ok = has & ~lost
+            if sign > 0:
+                add(brackets, side, at[ok], inner[ok], outer[ok], g_in[ok], g_out[ok])
+            else:
+                add(brackets, side, at[ok], -outer[ok], -inner[ok], g_out[ok], g_in[ok])
+        scan(at[lost], brackets)
+        solve(brackets)
+    # Заклинило ли ролик с натягом во всём окне, решается по узлам сетки; смена знака между
+    # ними уточняется как обычно
+    brackets = [[] for _ in range(6)]
+    scan(everyone[np.isnan(ends).all(axis=0) & ~failed & ~gap_at_zero & ~scanned], brackets)
+    solve(brackets)
+
+    # Конец участка за краем окна поворот с этой стороны не ограничивает
+    lead_k = np.where(gap_at_zero, ends[0], ends[1]).reshape(shape)
+    lag_k = np.where(gap_at_zero, ends[1], ends[0]).reshape(shape)
+    has_lead = ~np.isnan(lead_k)
+    has_lag = ~np.isnan(lag_k)
+    lead = np.where(has_lead, lead_k, -np.inf).max(axis=1)
+    lag = np.where(has_lag, lag_k, np.inf).min(axis=1)
+    # Ролик с натягом во всём окне, несошедшийся корень или упор лишь с одной стороны — шаг
+    # не определён (NaN), а не упор на краю окна. Ролик на дне впадины касается профиля лишь
+    # во втором порядке по δ: натяг не больше прогиба хорд (CONTACT_TOLERANCE) поворот не ограничивает
+    through = np.isnan(ends).all(axis=0) & ~failed
+    jammed = (through & ~gap_at_zero & (peak < -CONTACT_TOLERANCE)).reshape(shape).any(axis=1)
+    unresolved = jammed | failed.reshape(shape).any(axis=1) | ~has_lead.any(axis=1) | ~has_lag.any(axis=1)
+    lead[unresolved] = np.nan
+    lag[unresolved] = np.nan
+
+    g, _, rho_ecc, slope = gap(everyone, np.repeat(np.where(unresolved, 0.0, lag), len(slots)))
+    g, rho_ecc, slope = g.reshape(shape), rho_ecc.reshape(shape), slope.reshape(shape)
+    result = [base + lag, lag, lag - lead, np.where(unresolved, np.nan, g.min(axis=1))]
+    if rollers:
+        phi = slot + lag[:, None]
+        x, y = rho_ecc * np.sin(phi), rho_ecc * np.cos(phi)   # NaN на неопределённых шагах
+        # Нормаль предельной кривой rho(phi) в полярных координатах с отсчётом от оси Y
+        nx = rho_ecc * np.sin(phi) - slope * np.cos(phi)
+        ny = rho_ecc * np.cos(phi) + slope * np.sin(phi)
+        norm = np.hypot(nx, ny)
+        result += [x, y, x + r_roller * nx / norm, y + r_roller * ny / norm]
+    return result
+
+
+def simulate(d, revolutions=1.0, steps=3600, e=None, r_roller=None, rd=None, rollers=False):
+    """Кинематика передачи при повороте эксцентрика на revolutions оборотов за steps шагов.
+
+    Ролик в пазу сепаратора прижат эксцентриком на расстояние l(ψ - φ) от оси
+    (те же S и l, что и при построении профиля) и не может выйти за внутренний
+    эквидистант фактического профиля (x_rigid, y_rigid). Для каждого ролика ищутся смены
+    знака зазора в окне поворота сепаратора — на сетке или в скобке вокруг конца с
+    предыдущего шага, — а в них поворот до касания с профилем (Ньютон с защитой
+    бисекцией); набегающие ролики ограничивают поворот
+    с одной стороны, сбегающие — с другой. Нагруженный
+    сепаратор отстаёт до упора, это и есть кинематическая погрешность, а разность
+    упоров — люфт. e, r_roller и rd позволяют подставить фактические размеры
+    эксцентрика и роликов вместо расчётных.
+    """
+    if steps < 1:
+        raise ValueError(f"Число шагов steps должно быть не меньше 1, получено {steps}")
+    e = d.e if e is None else e
+    r_roller = d.r_roller if r_roller is None else r_roller
+    rd = d.rd if rd is None else rd
+    # Корпус неподвижен, сепаратор — выход: φ = -ψ/(zg - 1) (для одноволнового генератора, u = 1)
+    ratio = d.zg - 1
+    table = limit_table(*center_limit(*d.profile_xy(), r_roller))
+    slots = 2 * np.pi * np.arange(d.z_rollers) / d.z_rollers
+
+    psi = np.linspace(0.0, 2 * np.pi * revolutions, steps, endpoint=False)
+    parts = [_solve_chunk(psi[start:start + SIM_CHUNK], slots, table, ratio, d.zg, e, rd + r_roller,
+                          r_roller, rollers)
+             for start in range(0, steps, SIM_CHUNK)]
+    columns = [np.concatenate(column) for column in zip(*parts)]
+    return Simulation(ratio, psi, *columns)
+
+
+# === Режим моделирования ===
+def add_arguments(parser):
+    from .cli import add_param_arguments
+
+    add_param_arguments(parser)
+    parser.add_argument("--revolutions", type=float, default=1.0, help="оборотов эксцентрика")
+    parser.add_argument("--steps", type=int, default=36000, help="шагов по углу эксцентрика")
+    parser.add_argument("-o", "--output", help="CSV с кривой погрешности (углы в градусах и угл. минутах)")
+
+
+def run(args):
+    from .cli import params_from_args
+    from .core import GeometryError, design
+
+    try:
+        d = design(params_from_args(args))
+        sim = simulate(d, args.revolutions, args.steps)
+    except (GeometryError, ValueError) as exc:
+        print(f"Ошибка: {exc}")
+        return 1
+    s = sim.summary()
+    print(f"\nКинематика ({s['steps']} шагов, передаточное число {sim.ratio}):")
+    print(f"- Кинематическая погрешность: размах {s['te_pp_arcmin']:.3f}′, СКО {s['te_rms_arcmin']:.3f}′")
+    print(f"- Люфт: {s['backlash_min_arcmin']:.3f}′ … {s['backlash_max_arcmin']:.3f}′ "
+          f"(в среднем {s['backlash_mean_arcmin']:.3f}′)")
+    print(f"- Наименьший радиальный зазор роликов: {s['clearance_min_mm']:.4f} мм")
+    # Профиль нарезан точно под номинальные ролики: натяг больше прогиба хорд — след грубой разбивки,
+    # погрешность и люфт тогда определяются хордами профиля, а не передачей
+    if s["clearance_min_mm"] < -CONTACT_TOLERANCE:
+        print(f"⚠️  Натяг роликов {-s['clearance_min_mm']:.4f} мм больше допуска {CONTACT_TOLERANCE} мм: профиль "
+              f"слишком груб для кинематики, увеличьте --resolution (или уменьшите --chord-tol)")
+    if s["unresolved_steps"]:
+        print(f"⚠️  Упор сепаратора не найден в пределах четверти шага впадин на {s['unresolved_steps']} шагах "
+              f"(натяг во всём окне или нет касания с одной стороны): они не входят в статистику")
+    if args.output:
+        data = np.column_stack([np.degrees(sim.psi), np.degrees(sim.output),
+                                sim.te * ARCMIN, sim.backlash * ARCMIN, sim.clearance])
+        np.savetxt(args.output, data, fmt="%.6f", delimiter=",", comments="",
+                   header="psi_deg,output_deg,te_arcmin,backlash_arcmin,clearance_mm")
+        print(f"✅ Кривая погрешности сохранена в: {args.output}")
+    return 0
@@ -0,0 +1,84 @@
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .scad import SCAD_PARTS
+
+# Путь к openscad можно переопределить переменной окружения
+OPENSCAD_ENV = "OPENSCAD"
+
+
+def find_openscad():
+    """Путь к программе openscad или None, если её нет."""
+    return shutil.which(os.environ.get(OPENSCAD_ENV, "openscad"))
+
+
+@dataclass
+class PartRender:
+    part: str
+    path: str           # STL-файл детали
+    returncode: int
+    seconds: float
+    log: str            # хвост вывода openscad (при ошибке)
+
+    @property
+    def ok(self):
+        return self.returncode == 0
+
+
+def _render(binary, directory, part, timeout):
+    scad_path = os.path.join(directory, f"{part}.scad")
+    stl_path = os.path.join(directory, f"{part}.stl")
+    started = time.perf_counter()
+    try:
+        result = subprocess.run([binary, "-o", stl_path, scad_path], capture_output=True, text=True,
+                                timeout=timeout)
+        returncode, log = result.returncode, result.stderr
+    except subprocess.TimeoutExpired:
+        returncode, log = -1, f"превышено время ожидания {timeout} с"
+    return PartRender(part, stl_path, returncode, time.perf_counter() - started,
+                      "" if returncode == 0 else log[-2000:])
+
+
+def render_parts(directory, parts=SCAD_PARTS, jobs=None, timeout=None, binary=None):
+    """Экспорт файлов деталей из write_parts() в STL параллельными процессами openscad.
+
+    Каждая деталь рендерится своим процессом (CGAL однопоточный), одновременно —
+    не больше jobs процессов. Возвращает список PartRender в порядке parts.
+    """
+    binary = binary or find_openscad()
+    if not binary:
+        raise RuntimeError("Для экспорта деталей в STL нужна программа openscad (https://openscad.org)")
+    jobs = jobs or min(len(parts), os.cpu_count() or 1)
+    with ThreadPoolExecutor(jobs) as pool:
+        return list(pool.map(lambda part: _render(binary, directory, part, timeout), parts))
+
+
+def print_renders(results):
+    for r in results:
+        if r.ok:
+            print(f"✅ {r.part}: {r.path} ({r.seconds:.1f} с)")
+        else:
+            print(f"⚠️  {r.part}: openscad завершился с ошибкой ({r.returncode})\n{r.log}")
+
+
+# === Режим экспорта деталей через openscad ===
+def add_arguments(parser):
+    parser.add_argument("directory", help="каталог с файлами деталей (design --scad-parts)")
+    parser.add_argument("--parts", default=",".join(SCAD_PARTS), help="детали через запятую")
+    parser.add_argument("-j", "--jobs", type=int, help="число процессов openscad (по умолчанию — по детали на ядро)")
+    parser.add_argument("--timeout", type=float, help="ограничение времени на деталь (с)")
+
+
+def run(args):
+    parts = [part.strip() for part in args.parts.split(",") if part.strip()]
+    try:
+        results = render_parts(args.directory, parts, args.jobs, args.timeout)
+    except RuntimeError as exc:
+        print(f"Ошибка: {exc}")
+        return 1
+    print_renders(results)
+    return 0 if all(r.ok for r in results) else 1
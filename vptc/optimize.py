@@ -0,0 +1,183 @@
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from .core import BEARINGS, Params, GeometryError, design, dimensions, min_inner_radius, profile_at
+from .scad import countersink_dia
+from .sweep import parse_range
+
+# Точек профиля на грубой сетке: внешний радиус впадин достигается при theta = 0 и попадает в любую сетку
+COARSE_RESOLUTION = 90
+# Уточнение Rout: столько точек на отрезке ±шаг вокруг лучшего значения, столько раз
+ZOOM_POINTS = 21
+ZOOM_LEVELS = 3
+# Rout и D округляются вверх до сотых миллиметра
+ROUND_TO = 0.01
+GRID_CHUNK = 2048
+
+_BEARING_LIMITS = np.array([limit for limit, _ in BEARINGS])
+_BEARING_NAMES = np.array([bearing["name"] for _, bearing in BEARINGS])
+_BEARING_INNER = np.array([bearing["inner"] for _, bearing in BEARINGS])
+_BEARING_OUTER = np.array([bearing["outer"] for _, bearing in BEARINGS])
+
+
+def profile_radius(i, d_roller, Rout, resolution=COARSE_RESOLUTION):
+    """Наибольший радиус профиля для массивов d_roller и Rout — только профиль, без отверстий и SCAD."""
+    dims = dimensions(i, d_roller, Rout)
+    theta = np.linspace(0, 2 * np.pi, resolution, endpoint=False)[None, :]
+    e, rd, r_roller = (np.ravel(dims[name])[:, None] for name in ("e", "rd", "r_roller"))
+    r_max = np.empty(len(e))
+    for start in range(0, len(e), GRID_CHUNK):
+        part = slice(start, start + GRID_CHUNK)
+        x, y = profile_at(theta, e[part], dims["zg"], rd[part], r_roller[part])
+        r_max[part] = np.sqrt(np.max(x**2 + y**2, axis=1))
+    return r_max.reshape(np.shape(d_roller)), dims
+
+
+def housing(i, d_roller, Rout, wall, bearing=None, resolution=COARSE_RESOLUTION):
+    """Наименьший внешний диаметр D и допустимость для массивов d_roller и Rout.
+
+    Ограничения:
+    - Rin > Rin_min (как в check_geometry);
+    - стенка от вершин профиля не тоньше wall и не тоньше потая под головку винта;
+    - подшипник сепаратора — выбранный (если задан), а заплечик под него помещается в сепаратор;
+    - потай отверстий крышки не заходит в гнездо подшипника.
+    """
+    d_roller, Rout = np.broadcast_arrays(np.asarray(d_roller, dtype=float), np.asarray(Rout, dtype=float))
+    # При rd + r_roller < e профиль не существует (NaN), такие узлы отсекаются ниже
+    with np.errstate(invalid="ignore"):
+        r_max, dims = profile_radius(i, d_roller, Rout, resolution)
+    index = np.searchsorted(_BEARING_LIMITS, 2 * dims["Rsep_out"], side="right")
+    inner, outer = _BEARING_INNER[index], _BEARING_OUTER[index]
+
+    # Отверстия ставятся на радиус D/2 - толщина/2 = D/4 + r_max/2
+    D = np.maximum(2 * (r_max + max(wall, countersink_dia)),
+                   2 * outer + 2 * countersink_dia - 2 * r_max)
+    feasible = ((dims["Rin"] > min_inner_radius(d_roller, dims["zg"])) & (dims["Rsep_out"] > inner / 2 + 2)
+                & np.isfinite(r_max))
+    if bearing:
+        feasible &= _BEARING_NAMES[index] == bearing
+    return D, feasible
+
+
+def _round_up(value):
+    return math.ceil(round(value / ROUND_TO, 6)) * ROUND_TO
+
+
+def _check_search(d_roller, Rout_range):
+    """Границы поиска: пустая сетка или нулевой шаг — ValueError, а не пустой ответ или деление на ноль."""
+    start, stop, step = Rout_range
+    if step <= 0:
+        raise ValueError(f"Шаг диапазона Rout должен быть > 0: {start:g}:{stop:g}:{step:g}")
+    if start >= stop:
+        raise ValueError(f"Начало диапазона Rout должно быть меньше конца: {start:g}:{stop:g}:{step:g}")
+    if not len(d_roller):
+        raise ValueError("Пустой список диаметров роликов")
+
+
+def optimize(i, d_roller, Rout_range, wall, bearing=None, minimize="D", resolution=600, h_roller=6.0):
+    """Наименьший корпус для передаточного числа i: Design или None, если ограничения несовместны.
+
+    d_roller — перебираемые диаметры роликов, Rout_range — (от, до, шаг) грубой сетки Rout.
+    Сетка (d_roller × Rout) считается одним массивом по грубому профилю, затем Rout
+    для каждого диаметра уточняется вокруг лучшего узла ZOOM_LEVELS раз. Полный расчёт
+    с resolution точек делается один раз — для найденного варианта.
+    """
+    _check_search(d_roller, Rout_range)
+    start, stop, step = Rout_range
+    d_roller = np.asarray(sorted(d_roller), dtype=float)[:, None]
+    Rout = np.arange(start, stop + step / 2, step)[None, :]
+
+    def score(D, Rout, feasible):
+        objective = D if minimize == "D" else Rout
+        return np.where(feasible, objective, np.inf)
+
+    D, feasible = housing(i, d_roller, Rout, wall, bearing)
+    scores = score(D, Rout, feasible)
+    best = np.take_along_axis(Rout, np.argmin(scores, axis=1)[:, None], axis=1)
+    found = np.isfinite(scores.min(axis=1))
+    if not found.any():
+        return None
+
+    offsets = np.linspace(-1.0, 1.0, ZOOM_POINTS)[None, :]
+    for _ in range(ZOOM_LEVELS):
+        grid = best + step * offsets
+        D, feasible = housing(i, d_roller, grid, wall, bearing)
+        scores = score(D, grid, feasible)
+        column = np.argmin(scores, axis=1)[:, None]
+        improved = np.isfinite(np.take_along_axis(scores, column, axis=1))
+        best = np.where(improved, np.take_along_axis(grid, column, axis=1), best)
+        step *= 2 / (ZOOM_POINTS - 1)
+
+    D, feasible = housing(i, d_roller, best, wall, bearing)
+    scores = score(D, best, feasible & found[:, None])[:, 0]
+    # Равные по цели варианты — по меньшему D, затем по меньшему ролику (он идёт первым)
+    k = int(np.lexsort((D[:, 0], scores))[0])
+    if not np.isfinite(scores[k]):
+        return None
+
+    d_best = float(d_roller[k, 0])
+    Rout_best = _round_up(float(best[k, 0]))
+    D_best, ok = housing(i, d_best, Rout_best, wall, bearing)
+    if not ok:
+        Rout_best = float(best[k, 0])
+        D_best, _ = housing(i, d_best, Rout_best, wall, bearing)
+    p = Params(resolution=resolution, i=i, d_roller=round(d_best, 6), h_roller=h_roller,
+               Rout=Rout_best, D=_round_up(float(D_best)))
+    return design(p)
+
+
+# === Режим оптимизации ===
+def add_arguments(parser):
+    defaults = Params()
+    parser.add_argument("-i", "--ratio", dest="i", default=str(defaults.i),
+                        help="передаточные числа: a:b:шаг или a,b,c")
+    parser.add_argument("--d-roller", dest="d_roller", default="3:12:0.05",
+                        help="допустимые диаметры роликов (мм): a:b:шаг или a,b,c; нижняя граница задаётся нагрузкой")
+    parser.add_argument("--h-roller", dest="h_roller", type=float, default=defaults.h_roller, help="высота роликов (мм)")
+    parser.add_argument("--rout", dest="Rout", default="10:80:0.5", help="границы и шаг поиска Rout (мм): a:b:шаг")
+    parser.add_argument("--wall", type=float, default=defaults.D / 2 - defaults.Rout,
+                        help="минимальная толщина стенки корпуса (мм)")
+    parser.add_argument("--bearing", choices=[bearing["name"] for _, bearing in BEARINGS],
+                        help="подшипник сепаратора (по умолчанию — любой)")
+    parser.add_argument("--minimize", choices=("D", "Rout"), default="D", help="что минимизировать")
+    parser.add_argument("--resolution", type=int, default=defaults.resolution,
+                        help="количество точек профиля при уточнении")
+    parser.add_argument("-o", "--output", help="каталог для JSON-конфигов найденных вариантов (для --config)")
+
+
+def run(args):
+    try:
+        Rout_range = tuple(float(v) for v in args.Rout.split(":"))
+        if len(Rout_range) != 3:
+            raise ValueError("--rout задаётся как a:b:шаг")
+        d_roller = parse_range(args.d_roller)
+        ratios = parse_range(args.i, int)
+        _check_search(d_roller, Rout_range)
+    except ValueError as exc:
+        print(f"Ошибка: {exc}")
+        return 1
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+    print(f"\n{'i':>4} {'d_roller':>9} {'Rout':>8} {'D':>8} {'стенка':>8}  подшипник   время")
+    for i in ratios:
+        started = time.perf_counter()
+        try:
+            d = optimize(i, d_roller, Rout_range, args.wall, args.bearing, args.minimize,
+                         args.resolution, args.h_roller)
+        except GeometryError:
+            d = None
+        elapsed = time.perf_counter() - started
+        if d is None:
+            print(f"{i:>4}  нет решения в заданных границах ({elapsed:.2f} с)")
+            continue
+        p = d.params
+        print(f"{i:>4} {p.d_roller:>9g} {p.Rout:>8.2f} {p.D:>8.2f} {d.min_thickness:>8.3f}  "
+              f"{d.bearing_name:<10} {elapsed:.2f} с")
+        if args.output:
+            with open(os.path.join(args.output, f"vptc_roller_i{i}.json"), "w", encoding="utf-8") as f:
+                json.dump(p.to_dict(), f, ensure_ascii=False, indent=2)
+    return 0
@@ -0,0 +1,141 @@
+import csv
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from .core import Params, GeometryError, design
+from .dxf import HOLE_RADIUS
+from .sweep import SWEEP_AXES
+
+# Точек на окружность в эскизе
+CIRCLE_POINTS = 72
+_CIRCLE = np.linspace(0, 2 * np.pi, CIRCLE_POINTS + 1)
+
+
+def _circles(cx, cy, r):
+    """Набор окружностей одной линией: контуры разделены NaN."""
+    cx, cy, r = np.broadcast_arrays(np.atleast_1d(cx), np.atleast_1d(cy), np.atleast_1d(r))
+    x = cx[:, None] + r[:, None] * np.cos(_CIRCLE)
+    y = cy[:, None] + r[:, None] * np.sin(_CIRCLE)
+    gap = np.full((len(r), 1), np.nan)
+    return np.hstack([x, gap]).ravel(), np.hstack([y, gap]).ravel()
+
+
+def preview_name(p):
+    return f"vptc_roller_{p.i}_{p.d_roller:g}_{p.h_roller:g}_{p.Rout:g}_{p.D:g}"
+
+
+class PreviewRenderer:
+    """Вид сверху на редуктор: профиль, ролики, радиусы сепаратора и обе группы отверстий.
+
+    Фигура строится один раз без pyplot, на холсте Agg, поэтому работает без дисплея.
+    draw() лишь подменяет данные линий, так что пакетная отрисовка тысяч вариантов
+    не пересоздаёт фигуру и оси.
+    """
+
+    def __init__(self, size=6.0, dpi=100):
+        try:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+        except ImportError:
+            raise RuntimeError("Для эскизов нужен пакет matplotlib (pip install matplotlib)")
+
+        self.figure = Figure(figsize=(size, size), dpi=dpi)
+        FigureCanvasAgg(self.figure)
+        ax = self.figure.add_subplot()
+        ax.set_aspect("equal")
+        ax.grid(True, linewidth=0.3)
+        self.ax = ax
+        self.lines = {
+            "outer": ax.plot([], [], color="0.3", linewidth=1.0, label="корпус")[0],
+            "profile": ax.plot([], [], color="tab:blue", linewidth=1.0, label="профиль")[0],
+            "separator": ax.plot([], [], color="tab:gray", linewidth=0.7, linestyle="--", label="сепаратор")[0],
+            "rollers": ax.plot([], [], color="tab:orange", linewidth=1.0, label="ролики")[0],
+            "holes_a": ax.plot([], [], color="tab:green", linewidth=1.0, label="отверстия A")[0],
+            "holes_b": ax.plot([], [], color="tab:red", linewidth=1.0, label="отверстия B")[0],
+        }
+        ax.legend(loc="upper right", fontsize="x-small")
+
+    def draw(self, d):
+        p = d.params
+        lines = self.lines
+        lines["outer"].set_data(*_circles(0.0, 0.0, p.D / 2))
+        x, y = d.profile_xy()
+        lines["profile"].set_data(np.append(x, x[0]), np.append(y, y[0]))
+        lines["separator"].set_data(*_circles(0.0, 0.0, [d.Rsep_in, d.Rsep_m, d.Rsep_out]))
+        angles = 2 * np.pi * np.arange(d.z_rollers) / d.z_rollers
+        lines["rollers"].set_data(*_circles(d.Rsep_m * np.cos(angles), d.Rsep_m * np.sin(angles), d.r_roller))
+        lines["holes_a"].set_data(*_circles(d.hole_x, d.hole_y, HOLE_RADIUS))
+        lines["holes_b"].set_data(*_circles(d.motor_x, d.motor_y, HOLE_RADIUS))
+        limit = p.D / 2 * 1.05
+        self.ax.set_xlim(-limit, limit)
+        self.ax.set_ylim(-limit, limit)
+        self.ax.set_title(f"i = {p.i}, D = {p.D:g} мм, ролики {d.z_rollers}×Ø{p.d_roller:g}, "
+                          f"стенка {d.min_thickness:.2f} мм", fontsize="small")
+        return self.figure
+
+    def save(self, d, path):
+        """Рисует модель и сохраняет картинку; формат (png, svg, ...) — по расширению файла."""
+        self.draw(d).savefig(path)
+        return path
+
+
+def write_preview(d, path):
+    return PreviewRenderer().save(d, path)
+
+
+# === Пакетная отрисовка результатов перебора ===
+_renderer = None
+
+
+def _init_worker(size, dpi):
+    global _renderer
+    _renderer = PreviewRenderer(size, dpi)
+
+
+def _render_row(task):
+    params, path = task
+    try:
+        _renderer.save(design(params), path)
+    except GeometryError:
+        return None
+    return path
+
+
+def read_sweep(path, resolution=600):
+    """Параметры допустимых вариантов из CSV перебора."""
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("feasible", "True") != "True":
+                continue
+            values = {name: row[name] for name in SWEEP_AXES}
+            yield Params.from_dict({**values, "resolution": resolution})
+
+
+def render_batch(params_list, out_dir, fmt="png", jobs=None, size=4.0, dpi=80):
+    """Эскизы для набора параметров; в каждом процессе переиспользуется одна фигура."""
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = ((p, os.path.join(out_dir, f"{preview_name(p)}.{fmt}")) for p in params_list)
+    if jobs == 1:
+        _init_worker(size, dpi)
+        results = map(_render_row, tasks)
+        return sum(1 for path in results if path)
+    with Pool(jobs or os.cpu_count(), initializer=_init_worker, initargs=(size, dpi)) as pool:
+        return sum(1 for path in pool.imap(_render_row, tasks, chunksize=16) if path)
+
+
+# === Режим эскизов ===
+def add_arguments(parser):
+    parser.add_argument("input", help="CSV с результатами перебора (режим sweep)")
+    parser.add_argument("-o", "--output", default="./output/previews", help="каталог для эскизов")
+    parser.add_argument("--format", default="png", choices=("png", "svg"), help="формат эскизов")
+    parser.add_argument("--resolution", type=int, default=Params().resolution,
+                        help="количество точек профиля жёсткого колеса")
+    parser.add_argument("-j", "--jobs", type=int, help="число процессов (по умолчанию — все ядра)")
+
+
+def run(args):
+    count = render_batch(read_sweep(args.input, args.resolution), args.output, args.format, args.jobs)
+    print(f"✅ Эскизов: {count}, сохранены в: {args.output}")
+    return 0
@@ -0,0 +1,167 @@
+import json
+import time
+import tracemalloc
+
+# Включённый профилировщик; None — замеры выключены и stage() ничего не делает
+_active = None
+
+
+class _NullStage:
+    """Заглушка этапа при выключенных замерах: один общий объект, без выделений памяти."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def note(self, **arrays):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Stage:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.depth = 0
+        self.start_s = 0.0
+        self.time_s = 0.0
+        self.peak_mb = 0.0
+        self.arrays = {}
+        self._base = 0
+        self._peak = 0
+        self._clock = 0.0
+
+    def __enter__(self):
+        self.profiler._enter(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._exit(self)
+        return False
+
+    def note(self, **arrays):
+        """Запоминает размеры массивов, которые этап построил."""
+        for name, value in arrays.items():
+            self.arrays[name] = {
+                "shape": list(getattr(value, "shape", (len(value),))),
+                "dtype": str(getattr(value, "dtype", type(value).__name__)),
+                "mb": getattr(value, "nbytes", 0) / 2**20,
+            }
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "depth": self.depth,
+            "start_s": self.start_s,
+            "time_s": self.time_s,
+            "peak_mb": self.peak_mb,
+            "arrays": self.arrays,
+        }
+
+
+def stage(name):
+    """Контекст замера этапа name; при выключенных замерах — общая заглушка."""
+    if _active is None:
+        return _NULL_STAGE
+    return Stage(_active, name)
+
+
+class Profiler:
+    """Замеры этапов расчёта: время, пиковая память по tracemalloc и размеры массивов.
+
+    Пока профилировщик открыт (with Profiler() as prof: ...), каждый блок
+    with stage(...) записывается в prof.stages. Этапы могут быть вложенными:
+    пик вложенного этапа учитывается и в объемлющем. При cprofile=True весь
+    блок дополнительно идёт под cProfile.
+    """
+
+    def __init__(self, memory=True, cprofile=False):
+        self.memory = memory
+        self.stages = []
+        self.total_s = 0.0
+        self.peak_mb = 0.0
+        self.profile = None
+        self._stack = []
+        self._started = 0.0
+        if cprofile:
+            import cProfile
+            self.profile = cProfile.Profile()
+
+    def __enter__(self):
+        global _active
+        if self.memory:
+            tracemalloc.start()
+        _active = self
+        self._started = time.perf_counter()
+        if self.profile:
+            self.profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        if self.profile:
+            self.profile.disable()
+        self.total_s = time.perf_counter() - self._started
+        _active = None
+        if self.memory:
+            # Этапы сбрасывают пик tracemalloc, поэтому общий пик — наибольший из их пиков и остатка
+            peak = max([self._traced_peak()] + [s._peak for s in self.stages])
+            self.peak_mb = peak / 2**20
+            tracemalloc.stop()
+        return False
+
+    def _traced_peak(self):
+        return tracemalloc.get_traced_memory()[1] if self.memory else 0
+
+    def _enter(self, s):
+        s.depth = len(self._stack)
+        if self.memory:
+            if self._stack:
+                parent = self._stack[-1]
+                parent._peak = max(parent._peak, self._traced_peak())
+            tracemalloc.reset_peak()
+            s._base = s._peak = tracemalloc.get_traced_memory()[0]
+        self._stack.append(s)
+        self.stages.append(s)
+        s.start_s = time.perf_counter() - self._started
+        s._clock = time.perf_counter()
+
+    def _exit(self, s):
+        s.time_s = time.perf_counter() - s._clock
+        self._stack.pop()
+        if self.memory:
+            s._peak = max(s._peak, self._traced_peak())
+            s.peak_mb = (s._peak - s._base) / 2**20
+            if self._stack:
+                parent = self._stack[-1]
+                parent._peak = max(parent._peak, s._peak)
+
+    def to_dict(self):
+        return {
+            "total_s": self.total_s,
+            "peak_mb": self.peak_mb,
+            "stages": [s.to_dict() for s in self.stages],
+        }
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def write_stats(self, path):
+        """Статистика cProfile в формате pstats (python -m pstats, snakeviz)."""
+        self.profile.dump_stats(path)
+        return path
+
+    def print_table(self):
+        print("\n=== ЗАМЕРЫ ЭТАПОВ ===")
+        print(f"{'этап':<24} {'время, мс':>10} {'пик, МБ':>9}  массивы")
+        for s in self.stages:
+            arrays = ", ".join(f"{name}[{'×'.join(str(n) for n in a['shape'])}]" for name, a in s.arrays.items())
+            print(f"{'  ' * s.depth + s.name:<24} {s.time_s * 1000:>10.2f} {s.peak_mb:>9.2f}  {arrays}")
+        memory = f", пик {self.peak_mb:.2f} МБ" if self.memory else ""
+        print(f"Всего: {self.total_s * 1000:.2f} мс{memory}")
@@ -0,0 +1,190 @@
+import math
+from dataclasses import dataclass, asdict, fields
+
+
+class GeometryError(ValueError):
+    """Недопустимое сочетание параметров редуктора."""
+
+
+# === Входные параметры ===
+@dataclass(frozen=True)
+class Params:
+    resolution: int = 600   # количество точек построения профиля жесткого колеса
+    i: int = 8              # передаточное число
+    d_roller: float = 7.83  # диаметр роликов (мм)
+    h_roller: float = 6.0   # высота роликов (мм)
+    Rout: float = 28.0      # внешний радиус впадин жесткого колеса (мм)
+    D: float = 70.0         # внешний диаметр редуктора (мм)
+    u: int = 1
+    hole_step: float = 1.0      # шаг перебора угла поворота отверстий A (градусы)
+    hole_refine: bool = False   # уточнять угол отверстий A между шагами перебора
+    chord_tol: float = 0.0      # допуск хорды профиля (мм); > 0 — адаптивная разбивка вместо resolution
+    float32: bool = False       # хранить точки профиля в float32
+    low_memory: bool = False    # не хранить профиль целиком: порции пересчитываются при каждом проходе
+    clearance: float = 0.0      # зазор печати (мм): профиль смещается по нормали от роликов
+
+    @classmethod
+    def from_dict(cls, data):
+        known = {f.name: f.type for f in fields(cls)}
+        unknown = set(data) - set(known)
+        if unknown:
+            raise ValueError(f"Неизвестные параметры: {', '.join(sorted(unknown))}")
+        defaults = cls()
+        values = {}
+        for name, value in data.items():
+            values[name] = _convert(name, value, type(getattr(defaults, name)))
+        return cls(**values)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+TRUE_STRINGS = ("1", "true", "yes", "on")
+FALSE_STRINGS = ("0", "false", "no", "off")
+
+
+def _convert(name, value, value_type):
+    """Значение параметра в типе поля; дробное число для целого поля и непонятная строка для флага — ошибка."""
+    if value_type is bool:
+        if isinstance(value, str) and value.strip().lower() in TRUE_STRINGS + FALSE_STRINGS:
+            return value.strip().lower() in TRUE_STRINGS
+        if isinstance(value, (bool, int)) and value in (0, 1):
+            return bool(value)
+        raise ValueError(f"Параметр {name}: ожидается true или false, получено {value!r}")
+    if value_type is int:
+        number = float(value) if isinstance(value, str) else value
+        if (isinstance(number, bool) or not isinstance(number, (int, float)) or not math.isfinite(number)
+                or number != int(number)):
+            raise ValueError(f"Параметр {name}: ожидается целое число, получено {value!r}")
+        return int(number)
+    return value_type(value)
+
+
+# === Допустимые диапазоны параметров ===
+# Параметры, которые должны быть строго положительны
+POSITIVE = ("d_roller", "h_roller", "Rout", "D", "hole_step")
+
+
+def check_ranges(p):
+    """Диапазоны параметров до любого расчёта: ValueError вместо деления на ноль или пустого профиля."""
+    for f in fields(p):
+        value = getattr(p, f.name)
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError(f"Параметр {f.name} должен быть конечным числом, получено {value}")
+    if p.i < 1:
+        raise ValueError(f"Передаточное число i должно быть не меньше 1, получено {p.i}")
+    if p.u < 1:
+        raise ValueError(f"Параметр u должен быть не меньше 1, получено {p.u}")
+    if p.resolution < 3:
+        raise ValueError(f"Разрешение профиля resolution должно быть не меньше 3, получено {p.resolution}")
+    for name in POSITIVE:
+        if getattr(p, name) <= 0:
+            raise ValueError(f"Параметр {name} должен быть больше нуля, получено {getattr(p, name)}")
+    if p.chord_tol < 0:
+        raise ValueError(f"Допуск хорды chord_tol не может быть отрицательным, получено {p.chord_tol}")
+
+
+# === Выбор подшипника для сепаратора ===
+# Подшипники сепаратора: (диаметр сепаратора, до которого подходит подшипник (не включая), размеры)
+BEARINGS = (
+    (80.0, {
+        "name": "6808-2RS",
+        "inner": 40.0,
+        "outer": 52.0,
+        "width": 7.0,
+        "flange_extra": 9.5,
+        "cut_z_offset": 11.0,
+        "chamfer_z_offset": 11.5,
+    }),
+    (math.inf, {
+        "name": "6810-2RS",
+        "inner": 50.0,
+        "outer": 65.0,
+        "width": 7.0,
+        "flange_extra": 9.5,
+        "cut_z_offset": 11.0,
+        "chamfer_z_offset": 11.5,
+    }),
+)
+
+
+def select_bearing(Rsep_out):
+    for limit, bearing in BEARINGS:
+        if 2 * Rsep_out < limit:
+            return dict(bearing)
+
+
+# === Определение количества отверстий по диаметру ===
+def hole_count(D):
+    if D <= 60:
+        return 4
+    elif D < 90:
+        return 6
+    return 8
+
+
+def dimensions(i, d_roller, Rout, u=1):
+    """Радиальные размеры передачи; принимает и массивы d_roller и Rout."""
+    e = 0.2 * d_roller
+    zg = (i + 1) * u
+    Rin = Rout - 2 * e
+    r_roller = d_roller / 2
+    rd = Rin + e - d_roller
+    hc = 2.2 * e  # толщина сепаратора (для радиусов)
+
+    # Радиусы сепаратора
+    Rsep_m = rd + r_roller
+    Rsep_out = Rsep_m + hc / 2
+    Rsep_in = Rsep_m - hc / 2
+    return {
+        "e": e,
+        "zg": zg,
+        "z_rollers": i,
+        "Rin": Rin,
+        "r_roller": r_roller,
+        "rd": rd,
+        "hc": hc,
+        "Rsep_m": Rsep_m,
+        "Rsep_out": Rsep_out,
+        "Rsep_in": Rsep_in,
+    }
+
+
+def heights(h_roller):
+    """Высоты деталей по высоте роликов."""
+    separator_h = h_roller + 4          # высота сепаратора
+    eccentric_h = h_roller + 2          # высота эксцентрика
+    # Общая высота корпуса с учётом вала (для справки, не влияет на сборку напрямую)
+    h_reducer = eccentric_h + 5 + 1 + 2.5
+    return {"separator_h": separator_h, "eccentric_h": eccentric_h, "h_reducer": h_reducer}
+
+
+def cap_thickness(bearing):
+    # Толщина крышки: подшипник + запас + возвышение
+    return bearing["width"] + 1 + 3
+
+
+def derive(p):
+    """Скалярные размеры редуктора, не требующие построения профиля."""
+    dims = dimensions(p.i, p.d_roller, p.Rout, p.u)
+    bearing = select_bearing(dims["Rsep_out"])
+    return {
+        **dims,
+        **heights(p.h_roller),
+        "cap_thickness": cap_thickness(bearing),
+        "bearing": bearing,
+        "n_holes": hole_count(p.D),
+    }
+
+
+# === Проверка геометрии ===
+def min_inner_radius(d_roller, zg):
+    return (1.03 * d_roller) / math.sin(math.pi / zg)
+
+
+def check_geometry(Rin, d_roller, zg):
+    limit = min_inner_radius(d_roller, zg)
+    if Rin <= limit:
+        raise GeometryError(
+            "Внутренний радиус впадин жесткого колеса Rin({0}мм) должен быть больше: {1}мм. Увеличьте Rout или "
+            "уменьшите передаточное число (i)!".format(Rin, limit))
@@ -0,0 +1,554 @@
+import io
+import os
+
+import numpy as np
+
+# === Параметры вала эксцентрика ===
+ECC_SHAFT = {
+    "ecc_shaft_h1": 5.0,    # основание под 6803ZZ в корпусе (ширина подшипника)
+    "ecc_spacer_h": 2.5,    # проставка
+    "ecc_shaft_h2": 6.0,    # эксцентриковая ступень под 6803ZZ в ECC
+    "ecc_pin_h": 6.0,       # шип под 688ZZ в сепараторе
+}
+
+# === Параметры защитного кожуха мотора ===
+MOTOR_COVER = {
+    "mc_motor_plate_d": 50.0,   # диаметр площадки под двигатель
+    "mc_base_thickness": 4.0,   # толщина нижней плиты
+    "mc_encoder_hole_d": 10.0,  # центральное отверстие под магнит
+    "mc_motor_hole_1": 16.0,    # расстояние между первой парой отверстий
+    "mc_motor_hole_2": 19.0,    # расстояние между второй парой отверстий
+    "mc_nut_pad_radius": 24.0,  # радиус закладных площадок
+    "mc_nut_pad_d": 6.0,        # диаметр площадки под гайку
+    "mc_nut_pad_h": 3.0,        # высота выступа площадки
+    "mc_ring_width": 4.0,       # ширина кольца
+    "mc_ring_height": 5.0,      # высота кольца
+    "mc_countersink_d": 6.0,    # диаметр потайного отверстия
+    "mc_countersink_h": 2.0,    # глубина потайного отверстия
+}
+
+# Параметры потайных отверстий
+countersink_dia = 6.0
+countersink_depth = 2.0
+
+
+# === Форматирование точек для OpenSCAD (по 5 в строке) ===
+POINTS_PER_LINE = 5
+# Сколько строк точек форматируется одной операцией
+POINTS_BLOCK_LINES = 4096
+POINT_FORMAT = "[%.5f, %.5f]"
+LINE_SEPARATOR = ",\n        "
+
+
+def _points_format(count):
+    full, rest = divmod(count, POINTS_PER_LINE)
+    lines = [", ".join([POINT_FORMAT] * POINTS_PER_LINE)] * full
+    if rest:
+        lines.append(", ".join([POINT_FORMAT] * rest))
+    return LINE_SEPARATOR.join(lines)
+
+
+def write_points(f, x, y):
+    """Пишет точки в f блоками строк: на блок — одна операция форматирования, без строки на каждую точку."""
+    xy = np.column_stack([x, y]).ravel()
+    block = POINTS_PER_LINE * POINTS_BLOCK_LINES
+    block_format = _points_format(block)
+    for start in range(0, len(xy) // 2, block):
+        values = xy[2 * start:2 * (start + block)].tolist()
+        count = len(values) // 2
+        if start:
+            f.write(LINE_SEPARATOR)
+        f.write((block_format if count == block else _points_format(count)) % tuple(values))
+
+
+def write_point_chunks(f, chunks):
+    """write_points для профиля порциями (theta, x, y); в каждой порции, кроме последней, — целое число строк."""
+    for k, (_, x, y) in enumerate(chunks):
+        if k:
+            f.write(LINE_SEPARATOR)
+        write_points(f, x, y)
+
+
+def format_points(x, y):
+    f = io.StringIO()
+    write_points(f, x, y)
+    return f.getvalue()
+
+
+def format_list(values, spec):
+    return ", ".join(format(v, spec) for v in values)
+
+
+def render(d, points=None):
+    """Текст OpenSCAD-модели для рассчитанного редуктора."""
+    f = io.StringIO()
+    write(d, f, points)
+    return f.getvalue()
+
+
+def write(d, f, points=None):
+    """Пишет OpenSCAD-модель в открытый текстовый файл f, точки профиля — потоком.
+
+    points — уже отформатированные точки профиля (format_points), если они есть.
+    """
+    write_params(d, f)
+    write_modules(d, f, points)
+    f.write(ASSEMBLY)
+
+
+def write_params(d, f):
+    """Переменные модели: размеры деталей, вала и кожуха мотора, координаты отверстий."""
+    p = d.params
+    d_roller = p.d_roller
+    h_roller = p.h_roller
+    D = p.D
+    separator_h = d.separator_h
+    eccentric_h = d.eccentric_h
+    Rsep_m = d.Rsep_m
+    Rsep_out = d.Rsep_out
+    Rsep_in = d.Rsep_in
+    h_reducer = d.h_reducer
+    cap_thickness = d.cap_thickness
+    eccentricity = d.e
+    hole_x = d.hole_x
+    hole_y = d.hole_y
+    adjusted_motor_angles_deg = d.motor_angles_deg
+    motor_radius = d.motor_radius
+
+    bearing_inner = d.bearing["inner"]
+
+    ecc_shaft_h1 = ECC_SHAFT["ecc_shaft_h1"]
+    ecc_spacer_h = ECC_SHAFT["ecc_spacer_h"]
+    ecc_shaft_h2 = ECC_SHAFT["ecc_shaft_h2"]
+    ecc_pin_h = ECC_SHAFT["ecc_pin_h"]
+
+    mc_motor_plate_d = MOTOR_COVER["mc_motor_plate_d"]
+    mc_base_thickness = MOTOR_COVER["mc_base_thickness"]
+    mc_encoder_hole_d = MOTOR_COVER["mc_encoder_hole_d"]
+    mc_motor_hole_1 = MOTOR_COVER["mc_motor_hole_1"]
+    mc_motor_hole_2 = MOTOR_COVER["mc_motor_hole_2"]
+    mc_nut_pad_radius = MOTOR_COVER["mc_nut_pad_radius"]
+    mc_nut_pad_d = MOTOR_COVER["mc_nut_pad_d"]
+    mc_nut_pad_h = MOTOR_COVER["mc_nut_pad_h"]
+    mc_ring_width = MOTOR_COVER["mc_ring_width"]
+    mc_ring_height = MOTOR_COVER["mc_ring_height"]
+    mc_countersink_d = MOTOR_COVER["mc_countersink_d"]
+    mc_countersink_h = MOTOR_COVER["mc_countersink_h"]
+    # Общая высота кожуха мотора
+    mc_total_height = 23.5 + mc_base_thickness
+
+    f.write(f"""// ВПТК редуктор с роликами (для 3D-печати)
+$fn = 60;
+// Параметры
+d_roller = {d_roller:.3f};
+h_roller = {h_roller:.3f};
+separator_h = {separator_h:.3f};
+eccentric_h = {eccentric_h:.3f};
+Rsep_m = {Rsep_m:.3f};
+Rsep_out = {Rsep_out:.3f};
+Rsep_in = {Rsep_in:.3f};
+D_out = {D:.3f};
+h_reducer = {h_reducer:.3f};
+bearing_inner = {bearing_inner:.1f};
+// Высота профильного выреза
+h_cut = h_roller + 5;
+cap_thickness = {cap_thickness:.1f};
+eccentricity = {eccentricity:.3f};
+// --- Параметры вала эксцентрика ---
+ecc_shaft_h1 = {ecc_shaft_h1:.3f};   // основание под 6803ZZ
+ecc_spacer_h = {ecc_spacer_h:.3f};   // проставка
+ecc_shaft_h2 = {ecc_shaft_h2:.3f};   // эксцентриковая ступень
+ecc_pin_h = {ecc_pin_h:.3f};      // шип под 688ZZ
+// --- Параметры кожуха мотора ---
+mc_motor_plate_d = {mc_motor_plate_d:.1f};
+mc_base_thickness = {mc_base_thickness:.1f};
+mc_encoder_hole_d = {mc_encoder_hole_d:.1f};
+mc_motor_hole_1 = {mc_motor_hole_1:.1f};
+mc_motor_hole_2 = {mc_motor_hole_2:.1f};
+mc_nut_pad_radius = {mc_nut_pad_radius:.1f};
+mc_nut_pad_d = {mc_nut_pad_d:.1f};
+mc_nut_pad_h = {mc_nut_pad_h:.1f};
+mc_total_height = {mc_total_height:.1f};
+mc_ring_width = {mc_ring_width:.1f};
+mc_ring_height = {mc_ring_height:.1f};
+mc_countersink_d = {mc_countersink_d:.1f};
+mc_countersink_h = {mc_countersink_h:.1f};
+
+// === Группа B: отверстия под кожух мотора нужны в двух функциях===
+motor_angles = [{format_list(adjusted_motor_angles_deg, '.1f')}];
+motor_radius = {motor_radius:.3f};
+
+// === Группа A: крепёжные отверстия корпуса и крышки ===
+hole_x = [{format_list(hole_x, '.5f')}];
+hole_y = [{format_list(hole_y, '.5f')}];
+
+""")
+
+
+def write_modules(d, f, points=None):
+    """Модули деталей; размеры берут из переменных write_params."""
+    rd = d.rd
+    z_rollers = d.z_rollers
+    n_holes = d.n_holes
+    bearing_outer = d.bearing["outer"]
+    flange_extra = d.bearing["flange_extra"]
+    cut_z_offset = d.bearing["cut_z_offset"]
+    chamfer_z_offset = d.bearing["chamfer_z_offset"]
+
+    f.write(f"""// === Корпус (жёсткое колесо) ===
+module rigid_gear() {{
+    difference() {{
+        cylinder(h = h_reducer, r = D_out / 2, center = false);
+        translate([0, 0, h_reducer - h_cut])
+            linear_extrude(height = h_cut, center = false)
+                polygon(points = [
+                """)
+    if points is None:
+        write_point_chunks(f, d.profile_chunks(POINTS_PER_LINE * POINTS_BLOCK_LINES))
+    else:
+        f.write(points)
+    f.write(f"""
+            ]);
+        // === Группа A: основные крепёжные отверстия ===
+        for (i = [0 : {n_holes - 1}]) {{
+            x_hole = hole_x[i];
+            y_hole = hole_y[i];
+            translate([x_hole, y_hole, 0])
+                cylinder(h = h_reducer, r = 1.6, center = false);
+            translate([x_hole, y_hole, 0])
+                cylinder(h = 3.0, r = 3.0, center = false);
+        }}
+
+        for (i = [0 : 3]) {{
+            angle = motor_angles[i];
+            rotate([0, 0, angle])
+                translate([motor_radius, 0, 0])
+                    cylinder(h = 8.0, r = 1.6, center = false);
+            rotate([0, 0, angle])
+                translate([motor_radius, 0, 5.0])
+                    cube(size = [6.0, 6.0, 3.0], center = true);
+        }}
+        // === Посадка подшипника 6803ZZ в корпусе ===
+        cylinder(h = 1, r = 24/2, center = false);
+        translate([0, 0, 1])
+            cylinder(h = 5.0, r = 26.0/2, center = false);
+    }}
+}}
+
+// === Сепаратор с фланцем под подшипник ===
+module separator() {{
+    difference() {{
+        cylinder(h = separator_h + {flange_extra}, r = Rsep_out, center = false);
+        // Фланец под основной подшипник (ступенчатая посадка)
+        translate([0, 0, {cut_z_offset}])
+            difference() {{
+                cylinder(h = {flange_extra}, r = Rsep_out, center = false);
+                cylinder(h = {flange_extra}, r = bearing_inner/2 + 2, center = false);  // +2 мм зазор
+            }}
+        translate([0, 0, {chamfer_z_offset}])
+            difference() {{
+                cylinder(h = {flange_extra}, r = Rsep_out, center = false);
+                cylinder(h = {flange_extra}, r = bearing_inner/2, center = false);      // точный диаметр
+            }}
+        // Посадочное место под мини-подшипник 688ZZ (8x16x5)
+        translate([0, 0, h_roller + 3])
+            cylinder(h = 5, r = 8, center = false);
+        translate([0, 0, h_roller + 3 + 0.5])
+            cylinder(h = 5, r = 7, center = false);
+        translate([0, 0, h_roller + 3 + 1])
+            cylinder(h = 5, r = 5, center = false);
+        cylinder(h = separator_h - 1, r = Rsep_in, center = false);
+        for (angle = [0 : 360/{z_rollers} : 359]) {{
+            rotate([0, 0, angle])
+                translate([Rsep_m, 0, separator_h/2])
+                    rotate([0, 90, 0])
+                        cube([h_roller + 0.4, d_roller + 0.4, separator_h + 1], center = true);
+        }}
+        // Посадочные места под крепеж нагрузки m3
+        for (angle = motor_angles) {{
+            rotate([0, 0, angle]) {{
+                translate([bearing_inner/2-4, 0, 0])
+                    cylinder(h = separator_h  + {flange_extra}, r = 1.6, center = false);
+                translate([bearing_inner/2-4, 0, 0])
+                    cylinder(h =separator_h+2, r = 3.0, center = false);
+            }}
+        }}
+       // Посадочные места под крепеж нагрузки m4
+        for (angle = motor_angles) {{
+            rotate([0, 0, angle+45]) {{
+                translate([bearing_inner/2-5, 0, 0])
+                    cylinder(h = separator_h  + {flange_extra}, r = 2.1, center = false);
+                translate([bearing_inner/2-5, 0, 0])
+                    cylinder(h =separator_h+2, r = 7.66/2, center = false);
+            }}
+        }}
+    }}
+}}
+
+// === Ролики ===
+module rollers() {{
+    for (i = [0 : {z_rollers - 1}]) {{
+        angle = i * 360 / {z_rollers};
+        rotate([0, 0, angle])
+            translate([Rsep_m, 0, 0])
+                cylinder(r = d_roller/2, h = h_roller, center = true);
+    }}
+}}
+
+// === Эксцентрик ===
+module eccentric() {{
+    difference() {{
+        cylinder(r = {rd:.3f}, h = eccentric_h, center = false);
+        // Посадка под подшипник 6803ZZ
+        cylinder(h = 1, r = 24/2, center = false);
+        translate([0, 0, 1])
+            cylinder(h = eccentric_h, r = 26.0/2, center = false);
+    }}
+}}
+
+// === Крышка редуктора ===
+module cap() {{
+    difference() {{
+        cylinder(h = cap_thickness, r = D_out / 2, center = false);
+        // Внутреннее отверстие под подшипник
+        translate([0, 0, -1])
+            cylinder(h = cap_thickness, r = {bearing_outer / 2:.1f}, center = false);
+        // Внутреннее отверстие под упор подшипника
+        cylinder(h = cap_thickness, r = {bearing_outer / 2:.1f} -2, center = false);
+        // Внутреннее отверстие под сепаратор
+        cylinder(h = 3, r = Rsep_out+1, center = false);
+        // Отверстия под винты (группа A)
+        for (i = [0 : {n_holes - 1}]) {{
+            x_hole = hole_x[i];
+            y_hole = hole_y[i];
+            // Сквозное отверстие
+            translate([x_hole, y_hole, 0])
+                cylinder(h = cap_thickness, r = 1.6, center = false);
+            // Потай под шляпку M3
+            translate([x_hole, y_hole, cap_thickness - {countersink_depth:.1f}])
+                cylinder(h = {countersink_depth:.1f}, r = {countersink_dia / 2:.1f}, center = false);
+        }}
+    }}
+}}
+
+// === Вал эксцентрика ===
+module eccentric_shaft() {{
+    difference() {{
+        union() {{
+            // Основание (в подшипник корпуса)
+            cylinder(h = ecc_shaft_h1, r = 17/2+0.07, center = false);
+            // Проставка ecc_spacer_h мм
+            translate([0, 0, ecc_shaft_h1])
+                cylinder(h = ecc_spacer_h, r = 17/2+2, center = false);
+            // Пподставка под подшипник в эксцентрике
+            translate([eccentricity, 0, ecc_shaft_h1+ecc_spacer_h])
+                cylinder(h = 0.5, r = 17/2+1, center = false);
+            // Эксцентриковая ступень (в подшипник эксцентрика)
+            translate([eccentricity, 0, ecc_shaft_h1 + ecc_spacer_h])
+                cylinder(h = ecc_shaft_h2, r = 17/2, center = false);
+            // Подставка под подшипник сепаратора)
+            translate([0, 0, ecc_shaft_h1 + ecc_spacer_h + ecc_shaft_h2])
+                cylinder(h = 0.5, r = 5, center = false);
+            // Шип по общей оси (в подшипник сепаратора)
+            translate([0, 0, ecc_shaft_h1 + ecc_spacer_h + ecc_shaft_h2])
+                cylinder(h = ecc_pin_h, r = 8/2, center = false);
+        }}
+        cylinder(h = 2.0, r = 2.0, center = false);
+        pas_angles = [0.0, 180.0];
+        for (angle = pas_angles) {{
+            rotate([0, 0, angle]) {{
+                translate([17/2-1.65, 0, 0])
+                    cylinder(h = 3, r = 3, center = false);
+                translate([17/2-1.65, -3, 0])
+                   cube([3,6,3]);
+            }}    
+        }}
+    }}
+}}
+
+// === Защитный кожух мотора ===
+module motor_cover() {{
+    difference() {{
+        union() {{
+            // --- Нижняя плита ---
+            cylinder(h = mc_base_thickness, r = mc_motor_plate_d / 2, center = false);
+
+            // --- Опоры и кольцо ---
+
+            for (angle = motor_angles) {{
+                rotate([0, 0, angle]) {{
+                    // Наклонные стойки
+                    hull() {{
+                        translate([mc_motor_plate_d/2-3, 0, 0])
+                            cylinder(h = 0.1, r1 = 4, center = false);
+                        translate([D_out / 2+4, 0, mc_total_height-0.1])
+                            cylinder(h = 0.1, r1 = 3, center = false);
+                    }}
+                }}
+            }}
+            
+            // --- Стойки вертикальные у отверстий B для усиления ---
+            for (angle = motor_angles) {{
+                rotate([0, 0, angle]) {{
+                    translate([motor_radius, 0, 0])
+                        cylinder(h = mc_total_height, r = 6.5, center = false);
+                }}
+            }}
+            
+            // --- Верхнее кольцо ---
+            translate([0, 0, mc_total_height - mc_ring_height])
+                difference() {{
+                    cylinder(h = mc_ring_height, r = D_out / 2, center = false);
+                    cylinder(h = mc_ring_height, r = D_out / 2 - mc_ring_width, center = false);
+                }}
+        }}
+        
+        // --- Удаление выступающих за D_out деталей ---
+        difference() {{
+            cylinder(h = mc_total_height, r = D_out / 2+10, center = false);
+            cylinder(h = mc_total_height, r = D_out / 2, center = false);
+        }}
+
+        // --- Удаление выступающих за стойки деталей пирамидой ---
+        translate([0, 0, 0])
+         difference() {{
+            cylinder(h = mc_total_height, r1 = mc_motor_plate_d / 2+10, r2=D_out / 2+10, center = false);
+            cylinder(h = mc_total_height, r1 = mc_motor_plate_d / 2, r2=D_out / 2+3, center = false);
+        }}
+        
+        // --- Закладные площадки под гайки (внутри кожуха, на верхней стороне плиты) ---
+        {{
+            for (angle = motor_angles) {{
+                rotate([0, 0, angle+45]){{
+                    translate([mc_nut_pad_radius/2, 0, mc_base_thickness-2])
+                        cylinder(h = mc_nut_pad_h, r = mc_nut_pad_d / 2, center = false);
+                     translate([mc_nut_pad_radius/2, 0, 0])
+                        cylinder(h = mc_base_thickness, r = 1.6, center = false);
+                }}
+            }}   
+        }}
+
+        // --- Отверстия в нижней плите ---
+
+        // Центральное отверстие под магнит
+        cylinder(h = mc_base_thickness + 0.1, r = mc_encoder_hole_d / 2, center = false);
+
+        // Отверстия под крепление двигателя (по осям)
+        // Пара 1: по X (16 мм)
+        translate([ mc_motor_hole_1/2, 0, 0]) cylinder(h = mc_base_thickness + 0.1, r = 1.6, center = false);
+        // Потайное отверстие под крепление двигателя под шляпку M3
+        translate([ mc_motor_hole_1/2, 0, 0]) cylinder(h = mc_countersink_h, r1 = mc_countersink_d / 2, r2 = 1.6, center = false);
+        translate([-mc_motor_hole_1/2, 0, 0]) cylinder(h = mc_base_thickness + 0.1, r = 1.6, center = false);
+        // Потайное отверстие под крепление двигателя под шляпку M3
+        translate([-mc_motor_hole_1/2, 0, 0]) cylinder(h = mc_countersink_h, r1 = mc_countersink_d / 2, r2 = 1.6, center = false);
+        // Пара 2: по Y (19 мм)
+        translate([0,  mc_motor_hole_2/2, 0]) cylinder(h = mc_base_thickness + 0.1, r = 1.6, center = false);
+        // Потайное отверстие под крепление двигателя под шляпку M3
+        translate([0,  mc_motor_hole_2/2, 0]) cylinder(h = mc_countersink_h, r1 = mc_countersink_d / 2, r2 = 1.6, center = false);
+        translate([0, -mc_motor_hole_2/2, 0]) cylinder(h = mc_base_thickness + 0.1, r = 1.6, center = false);
+        // Потайное отверстие под крепление двигателя под шляпку M3
+        translate([0, -mc_motor_hole_2/2, 0]) cylinder(h = mc_countersink_h, r1 = mc_countersink_d / 2, r2 = 1.6, center = false);       
+
+        // --- Отверстия в кольце и стойках под винты B ---
+        for (angle = motor_angles) {{
+            rotate([0, 0, angle]) {{
+                // Сквозное отверстие через кольцо и стойку под м3
+                translate([motor_radius, 0, 0])
+                    cylinder(h = mc_total_height + 0.1, r = 1.6, center = false);
+                // Сквозное отверстие через кольцо и стойку под шляпку м3
+                translate([motor_radius, 0, 0])
+                    cylinder(h = mc_total_height-4, r = 3.0, center = false);
+            }}
+        }}
+    }}
+}}
+
+module bearing_simple(inner_d, outer_d, height) {{
+    // Проверка параметров
+    assert(inner_d > 0, "Внутренний диаметр должен быть > 0");
+    assert(outer_d > inner_d, "Внешний диаметр должен быть больше внутреннего");
+    assert(height > 0, "Высота должна быть > 0");
+
+    // Радиусы
+    inner_r = inner_d / 2;
+    outer_r = outer_d / 2;
+
+
+        // Цельный подшипник
+    difference() {{
+        cylinder(r=outer_r, h=height, center=true, $fn=32);
+        cylinder(r=inner_r, h=height+1, center=true, $fn=32);
+    }}
+}}
+
+""")
+
+
+# Сборка в общем файле модели: детали расставлены по высоте
+ASSEMBLY = """zazor=1;
+difference() {
+union() {
+rigid_gear();
+//color("gray") translate([0, 0, 3]) bearing_simple(17,26,5);
+translate([0, 0, h_reducer+zazor]) cap();
+translate([0, 0, 0.5]) eccentric_shaft();
+//color("gray") translate([0, 0, 3.5+5+ecc_spacer_h]) bearing_simple(17,26,5);
+translate([0, 0, 14]) rotate([180,0,0]) eccentric();
+//color("gray") translate([0, 0, ecc_shaft_h1 + ecc_spacer_h + ecc_shaft_h2+3.5]) bearing_simple(8,16,5);
+translate([0, 0, ecc_shaft_h1 + ecc_spacer_h-1]) separator();
+//color("gray") translate([0, 0,ecc_shaft_h1 + ecc_spacer_h+separator_h+5]) bearing_simple(40,52,7);
+// translate([0, 0, ecc_shaft_h1 + ecc_spacer_h + ecc_shaft_h2]) rollers();
+//translate([0, 0, -mc_total_height-1]) motor_cover(); // кожух снизу
+}
+    // Куб-«нож», отсекающий правую половину (x > 0)
+//    translate([0, -100, -100]) 
+//        cube([100, 200, 200]);
+}
+"""
+
+
+# === Раздельные файлы деталей ===
+# Детали, для которых пишется отдельный файл верхнего уровня (имя файла = имя модуля)
+SCAD_PARTS = ("rigid_gear", "separator", "rollers", "eccentric", "cap", "eccentric_shaft", "motor_cover")
+PARAMS_FILE = "params.scad"
+MODULES_FILE = "modules.scad"
+
+PART_TEMPLATE = """// ВПТК редуктор с роликами: деталь {part}
+include <{params}>
+include <{modules}>
+
+{part}();
+"""
+
+MAKEFILE = """# Экспорт деталей в STL: make -j (по процессу openscad на деталь)
+OPENSCAD ?= openscad
+PARTS = {parts}
+
+all: $(PARTS:=.stl)
+
+%.stl: %.scad {params} {modules}
+\t$(OPENSCAD) -o $@ $<
+
+.PHONY: all
+"""
+
+
+def write_parts(d, directory, parts=SCAD_PARTS):
+    """Общие params.scad и modules.scad и по файлу на деталь, плюс Makefile для параллельного экспорта.
+
+    Возвращает пути файлов деталей.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, PARAMS_FILE), "w") as f:
+        write_params(d, f)
+    with open(os.path.join(directory, MODULES_FILE), "w") as f:
+        write_modules(d, f)
+    paths = []
+    for part in parts:
+        path = os.path.join(directory, f"{part}.scad")
+        with open(path, "w") as f:
+            f.write(PART_TEMPLATE.format(part=part, params=PARAMS_FILE, modules=MODULES_FILE))
+        paths.append(path)
+    with open(os.path.join(directory, "Makefile"), "w") as f:
+        f.write(MAKEFILE.format(parts=" ".join(parts), params=PARAMS_FILE, modules=MODULES_FILE))
+    return paths
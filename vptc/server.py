@@ -0,0 +1,367 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from . import __version__, dxf, profiling, stl
+from .cache import DesignCache, cache_key
+from .core import GeometryError, Params, design
+from .graph import DesignGraph
+from .rules import check_ranges
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 30.0
+# Сколько последних замеров каждого этапа держится для перцентилей в /metrics
+METRICS_WINDOW = 1024
+MAX_BODY = 1 << 20
+# Пределы параметров запроса: один запрос не должен занимать процесс пула минутами и гигабайтами
+MAX_RESOLUTION = 100000
+MIN_CHORD_TOL = 1e-6
+MAX_FN = 1024
+
+FORMATS = {
+    "scad": "text/plain; charset=utf-8",
+    "stl": "model/stl",
+    "dxf": "image/vnd.dxf",
+    "json": "application/json",
+}
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           422: "Unprocessable Entity", 500: "Internal Server Error", 503: "Service Unavailable",
+           504: "Gateway Timeout"}
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# === Работа в процессе пула ===
+_store = None
+# Без кэша процесс держит граф расчёта: следующий запрос (сдвиг ползунка в конфигураторе)
+# пересчитывает только узлы, зависящие от изменённых параметров
+_graph = None
+
+
+def _init_worker(cache):
+    """Прогрев процесса пула: импорты, numpy и один расчёт, чтобы первый запрос не платил за них."""
+    global _store, _graph
+    if cache:
+        _store = DesignCache(*cache)
+        design(Params())
+    else:
+        _graph = DesignGraph()
+        _graph.get("scad")
+
+
+def _summary(d):
+    values = {"key": cache_key(d.params), "params": d.params.to_dict()}
+    for name in ("e", "zg", "z_rollers", "Rin", "r_roller", "rd", "Rsep_m", "Rsep_out", "Rsep_in",
+                 "min_thickness", "n_holes", "h_reducer", "bearing_name"):
+        value = getattr(d, name)
+        values[name] = value.item() if isinstance(value, np.generic) else value
+    return values
+
+
+def render(values, fmt="scad", part="rigid_gear", fn=stl.DEFAULT_FN, spline=False, want_path=False, submitted=None):
+    """Расчёт одной модели в процессе пула.
+
+    Возвращает (статус, тип содержимого, тело, замеры этапов): тело — байты файла
+    или, при want_path, JSON с путём к файлу в кэше. Ошибки геометрии и параметров
+    возвращаются статусами 422 и 400, прочие — 500, а не исключениями.
+    """
+    started = time.time()
+    timings = {"queue": started - submitted} if submitted else {}
+    with profiling.Profiler(memory=False) as prof:
+        try:
+            p = Params.from_dict({**Params().to_dict(), **values})
+            with profiling.stage("model"):
+                d = _store.design(p) if _store else _graph.set(p, fn=fn, spline=spline).design()
+            with profiling.stage(f"format_{fmt}"):
+                status, content_type, body = 200, FORMATS[fmt], _body(d, fmt, part, fn, spline, want_path)
+        except GeometryError as exc:
+            status, content_type, body = 422, FORMATS["json"], _error(exc)
+        except (ValueError, TypeError, KeyError, RuntimeError) as exc:
+            status, content_type, body = 400, FORMATS["json"], _error(exc)
+        except Exception as exc:
+            status, content_type, body = 500, FORMATS["json"], _error(exc)
+    for s in prof.stages:
+        timings[s.name] = s.time_s
+    return status, content_type, body, timings
+
+
+def _error(exc):
+    return json.dumps({"error": str(exc)}, ensure_ascii=False).encode("utf-8")
+
+
+def _body(d, fmt, part, fn, spline, want_path):
+    if want_path:
+        if not _store:
+            raise RuntimeError("Пути к файлам выдаются только при включённом кэше (--cache-dir)")
+        if fmt == "scad":
+            path = _store.scad_path(d)
+        elif fmt == "stl":
+            path = _store.stl_path(d, part, fn)
+        elif fmt == "dxf":
+            path = _store.dxf_path(d, spline)
+        else:
+            raise ValueError(f"Путь к файлу для формата {fmt} не выдаётся")
+        return json.dumps({"path": os.path.abspath(path), "key": cache_key(d.params)}).encode("utf-8")
+    if fmt == "scad":
+        return (_graph.get("scad") if _graph else d.scad).encode("utf-8")
+    if fmt == "stl":
+        if part not in stl.PART_MESHES:
+            raise ValueError(f"Неизвестная деталь: {part}")
+        if _store:
+            return _store.stl(d, part, fn)
+        return _graph.get(f"stl_{part}")
+    if fmt == "dxf":
+        return _graph.get("dxf") if _graph else dxf.dxf_bytes(d, spline)
+    return json.dumps(_summary(d), ensure_ascii=False).encode("utf-8")
+
+
+# === Метрики ===
+class LatencyStats:
+    """Задержки этапов: всего замеров и перцентили по последним METRICS_WINDOW."""
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+
+    def add(self, name, seconds):
+        self.samples.setdefault(name, deque(maxlen=self.window)).append(seconds)
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def to_dict(self):
+        stats = {}
+        for name, samples in self.samples.items():
+            ms = np.array(samples) * 1000
+            p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+            stats[name] = {"count": self.counts[name], "mean_ms": ms.mean(), "p50_ms": p50, "p95_ms": p95,
+                           "p99_ms": p99, "max_ms": ms.max()}
+        return stats
+
+
+# === Сервер ===
+class DesignServer:
+    """Резидентный сервер расчёта: HTTP/1.1 поверх TCP на localhost или Unix-сокета.
+
+    Запросы разбираются в цикле asyncio, расчёт идёт в пуле из jobs прогретых
+    процессов. Если в пуле уже max_pending задач, новые получают 503 с Retry-After;
+    ожидание ответа ограничено timeout секундами (504). Задача, не дождавшаяся
+    ответа, досчитывается в пуле и занимает место до своего завершения.
+    """
+
+    def __init__(self, jobs=None, max_pending=None, timeout=DEFAULT_TIMEOUT, cache=None):
+        self.jobs = jobs or os.cpu_count()
+        self.max_pending = max_pending or 4 * self.jobs
+        self.timeout = timeout
+        self.cache = cache
+        self.pending = 0
+        self.started = time.time()
+        self.latency = LatencyStats()
+        self.responses = {}
+        self.pool = None
+
+    def start_pool(self):
+        # Процессы пула не наследуют состояние сервера (обработчики сигналов, сокеты цикла событий):
+        # forkserver запускает их из чистого процесса, в том числе при перезапуске пула
+        context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+        self.pool = ProcessPoolExecutor(self.jobs, mp_context=context, initializer=_init_worker,
+                                        initargs=(self.cache,))
+        # Процессы пула запускаются по первым задачам — отдаём каждому пустую, чтобы прогрев прошёл до запросов
+        for _ in range(self.jobs):
+            self.pool.submit(time.sleep, 0)
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def metrics(self):
+        return {
+            "version": __version__,
+            "uptime_s": time.time() - self.started,
+            "jobs": self.jobs,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "responses": self.responses,
+            "latency": self.latency.to_dict(),
+        }
+
+    def _release(self):
+        self.pending -= 1
+
+    def _restart_pool(self, broken):
+        """Новый пул вместо сломанного (процесс расчёта упал); повторный вызов по тому же пулу ничего не делает."""
+        if self.pool is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.start_pool()
+
+    async def design(self, values, options):
+        if self.pending >= self.max_pending:
+            raise RequestError(503, "Сервер перегружен, повторите запрос позже")
+        pool = self.pool
+        try:
+            future = pool.submit(render, values, submitted=time.time(), **options)
+        except BrokenProcessPool:
+            self._restart_pool(pool)
+            pool = self.pool
+            future = pool.submit(render, values, submitted=time.time(), **options)
+        self.pending += 1
+        # Обратный вызов приходит из потока пула, счётчик меняется в цикле событий
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        try:
+            status, content_type, body, timings = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise RequestError(504, f"Расчёт не уложился в {self.timeout:g} с")
+        except BrokenProcessPool:
+            self._restart_pool(pool)
+            raise RequestError(500, "Процесс расчёта аварийно завершился, пул перезапущен")
+        for name, seconds in timings.items():
+            self.latency.add(name, seconds)
+        return status, content_type, body
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        query = dict(parse_qsl(url.query))
+        if url.path == "/health":
+            return 200, FORMATS["json"], b'{"status": "ok"}'
+        if url.path == "/metrics":
+            return 200, FORMATS["json"], json.dumps(self.metrics()).encode("utf-8")
+        if url.path != "/design":
+            raise RequestError(404, f"Нет такого адреса: {url.path}")
+        if method not in ("GET", "POST"):
+            raise RequestError(405, "Расчёт принимает GET и POST")
+        # Параметры модели — в теле JSON (POST) или в строке запроса; настройки ответа — там же
+        try:
+            values = json.loads(body) if body else {}
+        except ValueError as exc:
+            raise RequestError(400, f"Тело запроса — не JSON: {exc}")
+        if not isinstance(values, dict):
+            raise RequestError(400, "Тело запроса должно быть JSON-объектом")
+        values.update(query)
+        options = {
+            "fmt": values.pop("format", "scad"),
+            "part": values.pop("part", "rigid_gear"),
+            "fn": int(values.pop("fn", stl.DEFAULT_FN)),
+            "spline": str(values.pop("spline", "")).lower() in ("1", "true", "yes"),
+            "want_path": str(values.pop("path", "")).lower() in ("1", "true", "yes"),
+        }
+        if options["fmt"] not in FORMATS:
+            raise RequestError(400, f"Неизвестный формат: {options['fmt']} (есть {', '.join(FORMATS)})")
+        if not 3 <= options["fn"] <= MAX_FN:
+            raise RequestError(400, f"fn должно быть от 3 до {MAX_FN}")
+        # Параметры проверяются до очереди: ошибочный запрос не занимает процесс пула
+        try:
+            p = Params.from_dict({**Params().to_dict(), **values})
+            check_ranges(p)
+        except (ValueError, TypeError) as exc:
+            raise RequestError(400, str(exc))
+        if p.resolution > MAX_RESOLUTION:
+            raise RequestError(400, f"Разрешение профиля resolution не больше {MAX_RESOLUTION} на сервере")
+        if 0 < p.chord_tol < MIN_CHORD_TOL:
+            raise RequestError(400, f"Допуск хорды chord_tol не меньше {MIN_CHORD_TOL:g} мм на сервере")
+        return await self.design(values, options)
+
+    async def handle(self, reader, writer):
+        """Соединение HTTP/1.1 с keep-alive: запросы обрабатываются по очереди до закрытия."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                received = time.perf_counter()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    method, target, _ = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length", 0))
+                    if length > MAX_BODY:
+                        raise RequestError(413, "Слишком большое тело запроса")
+                    body = await reader.readexactly(length) if length else b""
+                    status, content_type, payload = await self.dispatch(method, target, body)
+                except RequestError as exc:
+                    status, content_type, payload = exc.status, FORMATS["json"], _error(exc)
+                except ValueError as exc:
+                    status, content_type, payload = 400, FORMATS["json"], _error(exc)
+                except Exception as exc:
+                    status, content_type, payload = 500, FORMATS["json"], _error(exc)
+                self.responses[str(status)] = self.responses.get(str(status), 0) + 1
+                self.latency.add("total", time.perf_counter() - received)
+                head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", f"Content-Type: {content_type}",
+                        f"Content-Length: {len(payload)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                if status == 503:
+                    head.append("Retry-After: 1")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix=None, ready=None):
+        """Обслуживание до SIGINT или SIGTERM; затем пул останавливается, Unix-сокет удаляется."""
+        self.start_pool()
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        try:
+            if unix:
+                server = await asyncio.start_unix_server(self.handle, unix)
+            else:
+                server = await asyncio.start_server(self.handle, host, port)
+            if ready:
+                ready(server)
+            async with server:
+                await stop.wait()
+        finally:
+            self.close()
+            if unix and os.path.exists(unix):
+                os.unlink(unix)
+
+
+# === Режим сервера ===
+def add_arguments(parser):
+    from .cache import add_cache_arguments
+
+    parser.add_argument("--host", default=DEFAULT_HOST, help="адрес HTTP (по умолчанию только localhost)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="порт HTTP")
+    parser.add_argument("--unix", metavar="PATH", help="слушать Unix-сокет вместо TCP")
+    parser.add_argument("-j", "--jobs", type=int, help="процессов расчёта (по умолчанию — все ядра)")
+    parser.add_argument("--max-pending", type=int, help="задач в пуле, сверх которых отвечать 503 (по умолчанию 4×jobs)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="ограничение времени запроса (с)")
+    add_cache_arguments(parser)
+
+
+def run(args):
+    cache = (args.cache_dir, int(args.cache_size * 2**20)) if args.cache_dir else None
+    server = DesignServer(args.jobs, args.max_pending, args.timeout, cache)
+
+    def ready(s):
+        where = args.unix or "http://{}:{}".format(*s.sockets[0].getsockname()[:2])
+        print(f"✅ Сервер расчёта слушает {where} ({server.jobs} процессов)", flush=True)
+
+    asyncio.run(server.serve(args.host, args.port, args.unix, ready))
+    print("Сервер остановлен")
+    return 0
@@ -0,0 +1,633 @@
+import os
+
+import numpy as np
+
+
+# Разрешение окружностей по умолчанию, как $fn в генерируемой модели
+DEFAULT_FN = 60
+
+# Детали, которые умеем выводить в STL без OpenSCAD
+STL_PARTS = ("rigid_gear", "rollers", "eccentric", "cap")
+
+STL_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+
+# === Контуры ===
+def circle(r, fn=DEFAULT_FN, cx=0.0, cy=0.0):
+    """Окружность с вершинами в тех же местах, что у cylinder() OpenSCAD."""
+    a = 2 * np.pi * np.arange(fn) / fn
+    return np.column_stack([cx + r * np.cos(a), cy + r * np.sin(a)])
+
+
+def _signed_area(loop):
+    x, y = loop[:, 0], loop[:, 1]
+    return 0.5 * np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+
+
+def _ccw(loop):
+    loop = np.asarray(loop, dtype=float)
+    return loop if _signed_area(loop) > 0 else loop[::-1].copy()
+
+
+def _angles(points, center):
+    return np.arctan2(points[:, 1] - center[1], points[:, 0] - center[0])
+
+
+def _radii(points, center):
+    return np.hypot(points[:, 0] - center[0], points[:, 1] - center[1])
+
+
+def _insert_angles(loop, angles):
+    """Добавляет в контур вокруг начала координат точки на заданных углах.
+
+    Точки ложатся на существующие рёбра, поэтому форма контура не меняется;
+    нужны, чтобы границы окон вокруг отверстий совпадали с вершинами стенок.
+    """
+    phi = np.mod(_angles(loop, (0.0, 0.0)), 2 * np.pi)
+    targets = np.sort(np.mod(np.asarray(angles, dtype=float), 2 * np.pi))
+    targets = targets[np.diff(targets, prepend=-1.0) > 1e-12]
+    step = np.mod(np.roll(phi, -1) - phi, 2 * np.pi)
+    offset = np.mod(targets[:, None] - phi[None, :], 2 * np.pi)
+    near = np.minimum(offset, 2 * np.pi - offset).min(axis=1) < 1e-12
+    targets = targets[~near]
+    if len(targets) == 0:
+        return loop
+    offset = offset[~near]
+    # Ребро, которое пересекает луч: смещение от начала ребра меньше его раствора
+    edge = np.argmax(offset < step[None, :], axis=1)
+    a = loop[edge]
+    b = loop[(edge + 1) % len(loop)]
+    d = b - a
+    c, s = np.cos(targets), np.sin(targets)
+    # Пересечение луча (c, s) с отрезком a + t·d
+    t = (a[:, 1] * c - a[:, 0] * s) / (d[:, 0] * s - d[:, 1] * c)
+    points = a + t[:, None] * d
+    order = np.lexsort((offset[np.arange(len(edge)), edge], edge))
+    return np.insert(loop, edge[order] + 1, points[order], axis=0)
+
+
+# === Триангуляция горизонтальных граней ===
+def _zip(a, b, center, start=(), end=()):
+    """Полоса треугольников между цепочками a и b, монотонными по углу вокруг center.
+
+    Рёбра a[0]–b[0] и a[-1]–b[-1] замыкают полосу; вершины обеих цепочек
+    сливаются по возрастанию угла, как две отсортированные последовательности.
+    start и end — дополнительные вершины на замыкающих рёбрах (от b к a).
+    """
+    ref = np.arctan2(a[0, 1] - center[1], a[0, 0] - center[0])
+    ta = np.unwrap(_angles(a, center) - ref)
+    tb = np.unwrap(_angles(b, center) - ref)
+    tb += 2 * np.pi * np.round((ta[0] - tb[0]) / (2 * np.pi))
+    keys = np.concatenate([ta[1:], tb[1:]])
+    order = np.argsort(keys, kind="stable")
+    from_a = order < len(a) - 1
+    ia = np.concatenate([[0], np.cumsum(from_a)])[:-1]
+    ib = np.concatenate([[0], np.cumsum(~from_a)])[:-1]
+    tris = np.empty((len(order), 3, 2))
+    tris[:, 0] = a[ia]
+    tris[:, 1] = b[ib]
+    tris[:, 2] = np.where(from_a[:, None], a[np.minimum(ia + 1, len(a) - 1)], b[np.minimum(ib + 1, len(b) - 1)])
+    if len(start) == 0 and len(end) == 0:
+        return tris
+    # Крайние треугольники делим веером по вершинам на замыкающих рёбрах
+    first = _side_fan(a[0], np.reshape(start, (-1, 2))[::-1], b[0], tris[0, 2])
+    last_apex = a[-2] if from_a[-1] else b[-2]
+    last = _side_fan(b[-1], end, a[-1], last_apex)
+    return np.concatenate([first, tris[1:-1], last])
+
+
+def _side_fan(p, points, q, apex):
+    chain = np.vstack([p, np.reshape(points, (-1, 2)), q])
+    return np.stack([chain[:-1], chain[1:], np.broadcast_to(apex, chain[:-1].shape)], axis=1)
+
+
+def _distance(polygon, center):
+    """Расстояние от точки до границы замкнутого контура."""
+    seg = np.roll(polygon, -1, axis=0) - polygon
+    length2 = np.einsum("ij,ij->i", seg, seg)
+    t = np.einsum("ij,ij->i", np.asarray(center) - polygon, seg) / np.where(length2 > 0, length2, 1.0)
+    nearest = polygon + np.clip(t, 0, 1)[:, None] * seg
+    return _radii(nearest, center).min()
+
+
+def _check_clearance(polygon, center, hole):
+    """Отверстие должно целиком лежать внутри окна, не касаясь его границ."""
+    if _distance(polygon, center) <= _radii(hole, center).max():
+        raise ValueError("STL: отверстие в ({:.2f}, {:.2f}) пересекает стенку детали, "
+                         "деталь нужно рендерить в OpenSCAD".format(*center))
+
+
+def _inside(polygon, point):
+    """Точка внутри замкнутого контура (чётность пересечений луча)."""
+    x, y = polygon[:, 0] - point[0], polygon[:, 1] - point[1]
+    x2, y2 = np.roll(x, -1), np.roll(y, -1)
+    crosses = (y > 0) != (y2 > 0)
+    xs = x - y * (x2 - x) / np.where(crosses, y2 - y, 1.0)
+    return np.count_nonzero(crosses & (xs > 0)) % 2 == 1
+
+
+def _crossings(loop, polygon):
+    """Точки пересечения рёбер двух замкнутых контуров и номера рёбер polygon, на которых они лежат."""
+    da = np.roll(loop, -1, axis=0) - loop
+    db = np.roll(polygon, -1, axis=0) - polygon
+    w = polygon[None, :, :] - loop[:, None, :]
+    cross = lambda u, v: u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+    den = cross(da[:, None, :], db[None, :, :])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = cross(w, db[None, :, :]) / den
+        t = cross(w, da[:, None, :]) / den
+    # Касание в вершине (грань гнезда по касательной к вписанному многоугольнику) — не пересечение
+    eps = 1e-9
+    ia, ib = np.nonzero((den != 0) & (s > eps) & (s < 1 - eps) & (t > eps) & (t < 1 - eps))
+    return loop[ia] + s[ia, ib, None] * da[ia], ib
+
+
+def _pocket(outer, loop):
+    """Гнездо, выходящее на внешний контур: (точка входа, точка выхода, вершины гнезда внутри контура).
+
+    Внешний контур, обходя гнездо против часовой, уходит внутрь в точке входа, идёт по
+    вершинам гнезда в обратном порядке и возвращается в точке выхода.
+    """
+    points, edge = _crossings(outer, loop)
+    if len(points) != 2:
+        raise ValueError("STL: гнездо должно пересекать внешний контур ровно дважды, "
+                         "деталь нужно рендерить в OpenSCAD")
+    def within(points):
+        hits, _ = _ray_hits(outer, (0.0, 0.0), _angles(points, (0.0, 0.0)))
+        return np.all(_radii(points, (0.0, 0.0)) < _radii(hits, (0.0, 0.0)))
+
+    # Вершины гнезда между рёбрами пересечения (против часовой): одна из двух цепочек лежит внутри контура
+    n = len(loop)
+    chains = [loop[np.arange(edge[k] + 1, edge[k] + 1 + np.mod(edge[1 - k] - edge[k], n)) % n] for k in (0, 1)]
+    k = 0 if len(chains[0]) and within(chains[0]) else 1
+    if not len(chains[k]) or not within(chains[k]):
+        raise ValueError("STL: гнездо должно пересекать внешний контур ровно дважды, "
+                         "деталь нужно рендерить в OpenSCAD")
+    # Цепочка k начинается за пересечением на ребре edge[k] и кончается перед пересечением на edge[1 - k]
+    return points[1 - k], points[k], chains[k]
+
+
+def _ray_hits(polygon, center, angles):
+    """Первые пересечения лучей из center с замкнутым контуром и номера рёбер."""
+    e = np.roll(polygon, -1, axis=0) - polygon
+    w = polygon - np.asarray(center)
+    ux = np.cos(angles)[:, None]
+    uy = np.sin(angles)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        det = e[None, :, 0] * uy - ux * e[None, :, 1]
+        t = (e[None, :, 0] * w[None, :, 1] - w[None, :, 0] * e[None, :, 1]) / det
+        s = (ux * w[None, :, 1] - uy * w[None, :, 0]) / det
+    # Небольшой допуск, чтобы луч, идущий точно через вершину, не проскочил между рёбрами
+    t = np.where((t > 0) & (s >= -1e-9) & (s <= 1 + 1e-9), t, np.inf)
+    edge = np.argmin(t, axis=1)
+    dist = t[np.arange(len(angles)), edge]
+    if not np.all(np.isfinite(dist)):
+        raise ValueError("STL: окно вокруг отверстия не звёздное, деталь нужно рендерить в OpenSCAD")
+    hits = np.asarray(center) + dist[:, None] * np.column_stack([ux[:, 0], uy[:, 0]])
+    return hits, edge
+
+
+def _ring(outer, inner, center):
+    """Кольцо между двумя вложенными замкнутыми контурами."""
+    if _radii(inner, center).max() >= _radii(outer, center).min():
+        raise ValueError("STL: контуры кольца пересекаются, деталь нужно рендерить в OpenSCAD")
+    ang = _angles(outer, center)
+    k = int(np.argmin(np.abs(np.angle(np.exp(1j * (_angles(inner, center) - ang[0]))))))
+    inner = np.roll(inner, -k, axis=0)
+    return _zip(np.vstack([outer, outer[:1]]), np.vstack([inner, inner[:1]]), center)
+
+
+def _fan(loop, center):
+    c = np.broadcast_to(np.asarray(center, dtype=float), loop.shape)
+    return np.stack([c, loop, np.roll(loop, -1, axis=0)], axis=1)
+
+
+def _arc_chain(loop, a0, a1):
+    """Вершины контура вокруг начала координат от угла a0 до a1 (против часовой)."""
+    phi = _angles(loop, (0.0, 0.0))
+    i0 = int(np.argmin(np.abs(np.angle(np.exp(1j * (phi - a0))))))
+    i1 = int(np.argmin(np.abs(np.angle(np.exp(1j * (phi - a1))))))
+    if i1 < i0:
+        i1 += len(loop)
+    return np.take(loop, np.arange(i0, i1 + 1), axis=0, mode="wrap")
+
+
+def _orient(tris2d, z, up):
+    """Поднимает плоские треугольники на высоту z, нормаль вверх (up) или вниз."""
+    v = tris2d
+    area = (v[:, 1, 0] - v[:, 0, 0]) * (v[:, 2, 1] - v[:, 0, 1]) - \
+           (v[:, 2, 0] - v[:, 0, 0]) * (v[:, 1, 1] - v[:, 0, 1])
+    scale = np.abs(area).max() if len(area) else 0.0
+    if np.any(area > 1e-9 * scale) and np.any(area < -1e-9 * scale):
+        raise ValueError("STL: вывернутые треугольники в горизонтальной грани")
+    if (area.sum() > 0) != up:
+        v = v[:, ::-1]
+    out = np.empty(v.shape[:2] + (3,))
+    out[..., :2] = v
+    out[..., 2] = z
+    return out
+
+
+def _wall(loop, z0, z1, outward):
+    """Боковая стенка контура (против часовой) от z0 до z1."""
+    a = loop
+    b = np.roll(loop, -1, axis=0)
+    n = len(loop)
+    lo = lambda p: np.column_stack([p, np.full(n, z0)])
+    hi = lambda p: np.column_stack([p, np.full(n, z1)])
+    t1 = np.stack([lo(a), lo(b), hi(b)], axis=1)
+    t2 = np.stack([lo(a), hi(b), hi(a)], axis=1)
+    tris = np.concatenate([t1, t2])
+    return tris if outward else tris[:, ::-1]
+
+
+# === Деталь из слоёв ===
+def layered_solid(height, outer, bore=(), holes=(), fn=DEFAULT_FN, pockets=()):
+    """Водонепроницаемая сетка детали, собранной из горизонтальных слоёв.
+
+    outer — внешний контур на всю высоту; bore — центральные вырезы
+    [(контур, z0, z1)], в каждом слое действует самый широкий из них;
+    holes — вертикальные отверстия [(x, y, r, z0, z1)] в стенке детали,
+    соосные отверстия в одной точке образуют ступенчатое отверстие;
+    pockets — гнёзда [(выпуклый контур, z0, z1)], выходящие сбоку на внешний
+    контур внутри высоты детали: отверстия с центром в гнезде открываются в него.
+    Все контуры должны быть звёздными относительно своего центра.
+    """
+    outer = _ccw(outer)
+    zs = {0.0, float(height)}
+    for _, z0, z1 in bore:
+        zs.update((z0, z1))
+    for _, _, _, z0, z1 in holes:
+        zs.update((z0, z1))
+    pockets = [(_ccw(loop), float(z0), float(z1)) for loop, z0, z1 in pockets]
+    for _, z0, z1 in pockets:
+        if not 0.0 < z0 < z1 < height:
+            raise ValueError("STL: гнездо должно лежать внутри высоты детали, деталь нужно рендерить в OpenSCAD")
+        zs.update((z0, z1))
+    zs = np.array(sorted(z for z in zs if 0.0 <= z <= height))
+    mids = (zs[:-1] + zs[1:]) / 2
+
+    # Центральный вырез по слоям: самый широкий из действующих
+    bore_loops = [(_ccw(loop), z0, z1) for loop, z0, z1 in bore]
+    bore_layers = []
+    for zm in mids:
+        active = [loop for loop, z0, z1 in bore_loops if z0 < zm < z1]
+        if not active:
+            bore_layers.append(None)
+            continue
+        widest = max(active, key=lambda lp: _radii(lp, (0, 0)).min())
+        for loop in active:
+            if loop is not widest and _radii(loop, (0, 0)).max() > _radii(widest, (0, 0)).min():
+                raise ValueError("STL: центральные вырезы пересекаются, деталь нужно рендерить в OpenSCAD")
+        bore_layers.append(widest)
+    if any(b is None for b in bore_layers) and any(b is not None for b in bore_layers):
+        raise ValueError("STL: центральный вырез должен проходить через всю деталь")
+    has_bore = bore_layers[0] is not None
+    # Гнёзда по слоям: точки входа и выхода внешнего контура и вершины гнезда внутри него
+    pocket_cuts = [_pocket(outer, loop) for loop, _, _ in pockets]
+    pocket_layers = [frozenset(j for j, (_, z0, z1) in enumerate(pockets) if z0 < zm < z1) for zm in mids]
+
+    # Отверстия по слоям: в каждой точке действует самое широкое
+    centers = {}
+    for x, y, r, z0, z1 in holes:
+        centers.setdefault((x, y), []).append((r, z0, z1))
+    hole_tracks = []
+    # Слои, где отверстие открыто в гнездо: стенки отверстия прерываются, а торцы не закрываются
+    open_layers = {}
+    for (x, y), cuts in centers.items():
+        loops = {r: circle(r, fn, x, y) for r, _, _ in cuts}
+        layers = []
+        for zm in mids:
+            radii = [r for r, z0, z1 in cuts if z0 < zm < z1]
+            layers.append(loops[max(radii)] if radii else None)
+        inside = {j for j, (loop, _, _) in enumerate(pockets) if _inside(loop, (x, y))}
+        open_layers[(x, y)] = {k for k, active in enumerate(pocket_layers) if active & inside}
+        for k in open_layers[(x, y)]:
+            layers[k] = None
+        hole_tracks.append(((x, y), max(loops), layers))
+    if hole_tracks and not has_bore:
+        raise ValueError("STL: отверстия поддерживаются только в детали с центральным вырезом")
+
+    # Окна вокруг отверстий для нижней и верхней граней
+    windows = []
+    for (x, y), r_max, _ in hole_tracks:
+        rho = np.hypot(x, y)
+        phi = np.arctan2(y, x)
+        half = np.arcsin(min(1.0, 1.5 * r_max / rho))
+        tight = np.arcsin(min(1.0, r_max / rho))
+        windows.append([phi - half, phi + half, phi - tight, phi + tight])
+    order = np.argsort([w[0] for w in windows]) if windows else []
+    windows = [windows[k] for k in order]
+    hole_tracks = [hole_tracks[k] for k in order]
+    for k in range(len(windows)):
+        cur, nxt = windows[k], windows[(k + 1) % len(windows)]
+        gap = np.mod(nxt[0] - cur[1], 2 * np.pi)
+        if len(windows) > 1 and gap > np.pi:
+            # Соседние окна перекрываются: общая граница посередине между отверстиями
+            free = np.mod(nxt[2] - cur[3], 2 * np.pi)
+            if free > np.pi:
+                raise ValueError("STL: отверстия слишком близко друг к другу")
+            border = cur[3] + free / 2
+            cur[1] = border
+            nxt[0] = border
+    edges = [a for w in windows for a in w[:2]]
+    faces = ((0, zs[0], False), (len(mids) - 1, zs[-1], True))
+    ray_angles = 2 * np.pi * np.arange(fn) / fn
+
+    def remap_bore(insert):
+        mapped = {}
+        for k, loop in enumerate(bore_layers):
+            if loop is not None:
+                if id(loop) not in mapped:
+                    mapped[id(loop)] = insert(loop)
+                bore_layers[k] = mapped[id(loop)]
+
+    def windows_at(layer):
+        return [(w, center, layers[layer]) for w, (center, _, layers) in zip(windows, hole_tracks)
+                if layers[layer] is not None]
+
+    def cell_chains(bore_loop, w):
+        return _arc_chain(outer, w[0], w[1]), _arc_chain(bore_loop, w[0], w[1])[::-1]
+
+    # Все контуры вокруг начала координат получают вершины на границах окон, внешний — и на входах гнёзд
+    outer = _insert_angles(outer, edges + [a for entry, exit, _ in pocket_cuts for a in _angles(np.array([entry, exit]),
+                                                                                                (0.0, 0.0))])
+    remap_bore(lambda loop: _insert_angles(loop, edges))
+
+    # ...и там, где их пересекают лучи из центров отверстий к вершинам отверстий:
+    # так каждой вершине отверстия соответствует вершина на границе окна
+    outer_extra = []
+    bore_extra = {}
+    for layer, _, _ in faces:
+        bore_loop = bore_layers[layer]
+        for w, center, hole in windows_at(layer):
+            outer_chain, bore_chain = cell_chains(bore_loop, w)
+            _check_clearance(np.vstack([outer_chain, bore_chain]), center, hole)
+            n = len(outer_chain)
+            hits, edge = _ray_hits(np.vstack([outer_chain, bore_chain]), center, ray_angles)
+            phi = _angles(hits, (0.0, 0.0))
+            outer_extra.extend(phi[edge < n - 1])
+            bore_extra.setdefault(id(bore_loop), []).extend(phi[(edge >= n) & (edge < n + len(bore_chain) - 1)])
+    if outer_extra:
+        outer = _insert_angles(outer, outer_extra)
+    remap_bore(lambda loop: _insert_angles(loop, bore_extra[id(loop)]) if id(loop) in bore_extra else loop)
+
+    # Сечение гнезда: дуга внешнего контура от входа до выхода и вершины гнезда внутри
+    def pocket_region(j):
+        entry, exit, inside = pocket_cuts[j]
+        return np.vstack([_arc_chain(outer, *_angles(np.array([entry, exit]), (0.0, 0.0))), inside])
+
+    pocket_holes = []
+    for j, (entry, exit, inside) in enumerate(pocket_cuts):
+        region = pocket_region(j)
+        layers_in = [k for k, active in enumerate(pocket_layers) if j in active]
+        for k in layers_in:
+            loop = bore_layers[k]
+            if loop is not None and _radii(loop, (0.0, 0.0)).max() >= _radii(region, (0.0, 0.0)).min():
+                raise ValueError("STL: гнездо пересекает центральный вырез, деталь нужно рендерить в OpenSCAD")
+        for center, _, layers in hole_tracks:
+            present = [layers[k] for k in layers_in if layers[k] is not None]
+            if present and _distance(region, center) <= max(_radii(h, center).max() for h in present):
+                raise ValueError("STL: отверстие в ({:.2f}, {:.2f}) пересекает гнездо, "
+                                 "деталь нужно рендерить в OpenSCAD".format(*center))
+        opening = [center for center, _, _ in hole_tracks if open_layers[center] and _inside(region, center)]
+        if len(opening) > 1:
+            raise ValueError("STL: в гнездо открывается больше одного отверстия, деталь нужно рендерить в OpenSCAD")
+        pocket_holes.append(opening[0] if opening else None)
+        if not opening:
+            continue
+        # Как у окон: каждой вершине отверстия — вершина на границе сечения, на дуге и на стенках гнезда
+        arc = len(region) - len(inside)
+        hits, edge = _ray_hits(region, opening[0], ray_angles)
+        outer = _insert_angles(outer, _angles(hits[edge < arc - 1], (0.0, 0.0)))
+        path = np.vstack([region[arc - 1:], region[:1]])
+        chain = []
+        for k in range(len(path) - 1):
+            points = hits[edge == arc - 1 + k]
+            points = points[np.argsort(_radii(points, path[k]))]
+            far = (_radii(points, path[k]) > 1e-9) & (_radii(points, path[k + 1]) > 1e-9)
+            chain.extend([path[k:k + 1], points[far]])
+        pocket_cuts[j] = (entry, exit, np.vstack(chain[1:]))
+    regions = [pocket_region(j) for j in range(len(pocket_cuts))]
+
+    parts = []
+
+    def full_face(layer, z, up):
+        bore_loop = bore_layers[layer]
+        if bore_loop is None:
+            parts.append(_orient(_fan(outer, (0.0, 0.0)), z, up))
+            return
+        present = windows_at(layer)
+        if not present:
+            parts.append(_orient(_ring(outer, bore_loop, (0.0, 0.0)), z, up))
+            return
+
+        # Вершины на радиальных границах окон, по возрастанию радиуса
+        radial = {}
+        chains = []
+        for w, center, hole in present:
+            outer_chain, bore_chain = cell_chains(bore_loop, w)
+            n = len(outer_chain)
+            hits, edge = _ray_hits(np.vstack([outer_chain, bore_chain]), center, ray_angles)
+            radial.setdefault(w[1], []).extend(hits[edge == n - 1])
+            radial.setdefault(w[0], []).extend(hits[edge == n + len(bore_chain) - 1])
+            chains.append((outer_chain, bore_chain))
+        for key, points in radial.items():
+            points = np.reshape(points, (-1, 2))
+            # Лучи, попавшие точно в углы окна, новых вершин не дают
+            corners = np.array([_arc_chain(outer, key, key)[0], _arc_chain(bore_loop, key, key)[0]])
+            far = np.hypot(*(points[:, None, :] - corners[None]).transpose(2, 0, 1)).min(axis=1) > 1e-9
+            points = points[far]
+            radial[key] = points[np.argsort(np.hypot(points[:, 0], points[:, 1]))]
+
+        for k, ((w, center, hole), (outer_chain, bore_chain)) in enumerate(zip(present, chains)):
+            cell = np.vstack([outer_chain, radial[w[1]][::-1], bore_chain, radial[w[0]]])
+            parts.append(_orient(_ring(_ccw(cell), hole, center), z, up))
+            # Полоса от этого окна до следующего
+            b0 = w[1]
+            b1 = present[(k + 1) % len(present)][0][0]
+            if np.mod(b1 - b0, 2 * np.pi) > 1e-12:
+                strip = _zip(_arc_chain(outer, b0, b1), _arc_chain(bore_loop, b0, b1), (0.0, 0.0),
+                             start=radial[b0], end=radial[b1])
+                parts.append(_orient(strip, z, up))
+
+    # Нижняя и верхняя грани
+    for layer, z, up in faces:
+        full_face(layer, z, up)
+
+    # Внешний контур со входами в гнёзда по слоям
+    phi = _angles(outer, (0.0, 0.0))
+    outer_loops = {frozenset(): outer}
+    for active in set(pocket_layers) - {frozenset()}:
+        keep = np.ones(len(outer), dtype=bool)
+        inserts = {}
+        for j in active:
+            entry, exit, inside = pocket_cuts[j]
+            i_in, i_out = (int(np.argmin(np.abs(np.angle(np.exp(1j * (phi - a))))))
+                           for a in _angles(np.array([entry, exit]), (0.0, 0.0)))
+            k = (i_in + 1) % len(outer)
+            while k != i_out:
+                keep[k] = False
+                k = (k + 1) % len(outer)
+            inserts[i_in] = inside[::-1]
+        pieces = []
+        for k in range(len(outer)):
+            if keep[k]:
+                pieces.append(outer[k:k + 1])
+            if k in inserts:
+                pieces.append(inserts[k])
+        outer_loops[active] = np.vstack(pieces)
+    outer_layers = [outer_loops[active] for active in pocket_layers]
+
+    # Дно и потолок гнёзд; отверстие, открытое в гнездо, выходит в них
+    track_layers = {center: layers for center, _, layers in hole_tracks}
+    for region, center, (_, z0, z1) in zip(regions, pocket_holes, pockets):
+        for z, layer, up in ((z0, int(np.searchsorted(zs, z0)) - 1, True), (z1, int(np.searchsorted(zs, z1)), False)):
+            hole = None if center is None else track_layers[center][layer]
+            if hole is not None:
+                _check_clearance(region, center, hole)
+                parts.append(_orient(_ring(region, hole, center), z, up))
+            else:
+                parts.append(_orient(_fan(region, region.mean(axis=0)), z, up))
+
+    # Стенки и уступы между слоями
+    start = 0
+    for k in range(1, len(mids) + 1):
+        if k < len(mids) and outer_layers[k] is outer_layers[start]:
+            continue
+        parts.append(_wall(outer_layers[start], zs[start], zs[k], outward=True))
+        start = k
+    tracks = [((0.0, 0.0), bore_layers)] if has_bore else []
+    tracks += [(center, layers) for center, _, layers in hole_tracks]
+    for center, layers in tracks:
+        opened = open_layers.get(center, ())
+        start = 0
+        for k in range(1, len(layers) + 1):
+            if k < len(layers) and layers[k] is layers[start]:
+                continue
+            if layers[start] is not None:
+                parts.append(_wall(layers[start], zs[start], zs[k], outward=False))
+            if k < len(layers):
+                below, above = layers[k - 1], layers[k]
+                z = zs[k]
+                if below is None:
+                    if k - 1 not in opened:
+                        parts.append(_orient(_fan(above, center), z, up=True))
+                elif above is None:
+                    if k not in opened:
+                        parts.append(_orient(_fan(below, center), z, up=False))
+                elif abs(_signed_area(above)) < abs(_signed_area(below)):
+                    parts.append(_orient(_ring(below, above, center), z, up=False))
+                else:
+                    parts.append(_orient(_ring(above, below, center), z, up=True))
+            start = k
+    return np.concatenate(parts)
+
+
+def translate(tris, dx=0.0, dy=0.0, dz=0.0):
+    return tris + np.array([dx, dy, dz])
+
+
+# === Детали ===
+def rigid_gear_mesh(d, fn=DEFAULT_FN):
+    """Корпус: профильный вырез, посадка 6803ZZ, отверстия A/B и гнёзда под гайки у отверстий B."""
+    h = d.h_reducer
+    h_cut = d.params.h_roller + 5
+    profile = np.column_stack(d.profile_xy()).astype(float)
+    bore = [
+        (circle(24 / 2, fn), 0.0, 1.0),
+        (circle(26.0 / 2, fn), 1.0, 6.0),
+        (profile, h - h_cut, h),
+    ]
+    holes = []
+    for x, y in zip(d.hole_x, d.hole_y):
+        holes.append((float(x), float(y), 1.6, 0.0, h))
+        holes.append((float(x), float(y), 3.0, 0.0, 3.0))
+    for x, y in zip(d.motor_x, d.motor_y):
+        holes.append((float(x), float(y), 1.6, 0.0, 8.0))
+    # Гнёзда под гайки: cube([6, 6, 3], center = true) на motor_radius и высоте 5, повёрнутый на угол отверстия B
+    square = np.array([[-3.0, -3.0], [3.0, -3.0], [3.0, 3.0], [-3.0, 3.0]]) + [d.motor_radius, 0.0]
+    pockets = []
+    for angle in np.deg2rad(d.motor_angles_deg):
+        c, s = np.cos(angle), np.sin(angle)
+        pockets.append((square @ np.array([[c, s], [-s, c]]), 3.5, 6.5))
+    return layered_solid(h, circle(d.params.D / 2, fn), bore, holes, fn, pockets)
+
+
+def rollers_mesh(d, fn=DEFAULT_FN):
+    h = d.params.h_roller
+    roller = translate(layered_solid(h, circle(d.r_roller, fn), fn=fn), dz=-h / 2)
+    meshes = []
+    for k in range(d.z_rollers):
+        a = 2 * np.pi * k / d.z_rollers
+        meshes.append(translate(roller, d.Rsep_m * np.cos(a), d.Rsep_m * np.sin(a)))
+    return np.concatenate(meshes)
+
+
+def eccentric_mesh(d, fn=DEFAULT_FN):
+    h = d.eccentric_h
+    bore = [
+        (circle(24 / 2, fn), 0.0, 1.0),
+        (circle(26.0 / 2, fn), 1.0, h + 1),
+    ]
+    return layered_solid(h, circle(d.rd, fn), bore, fn=fn)
+
+
+def cap_mesh(d, fn=DEFAULT_FN):
+    from .scad import countersink_depth, countersink_dia
+
+    t = d.cap_thickness
+    r_bearing = round(d.bearing["outer"] / 2, 1)
+    bore = [
+        (circle(r_bearing, fn), -1.0, t - 1),
+        (circle(r_bearing - 2, fn), 0.0, t),
+        (circle(d.Rsep_out + 1, fn), 0.0, 3.0),
+    ]
+    holes = []
+    for x, y in zip(d.hole_x, d.hole_y):
+        holes.append((float(x), float(y), 1.6, 0.0, t))
+        holes.append((float(x), float(y), countersink_dia / 2, t - countersink_depth, t))
+    return layered_solid(t, circle(d.params.D / 2, fn), bore, holes, fn)
+
+
+PART_MESHES = {
+    "rigid_gear": rigid_gear_mesh,
+    "rollers": rollers_mesh,
+    "eccentric": eccentric_mesh,
+    "cap": cap_mesh,
+}
+
+
+# === Запись двоичного STL ===
+def stl_bytes(tris, name=""):
+    tris = np.asarray(tris, dtype=np.float64)
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, length, out=np.zeros_like(normals), where=length > 0)
+    data = np.zeros(len(tris), dtype=STL_DTYPE)
+    data["normal"] = normals
+    data["vertices"] = tris
+    header = name.encode("ascii", "replace")[:80].ljust(80, b" ")
+    return header + np.uint32(len(tris)).tobytes() + data.tobytes()
+
+
+def write_stl(path, tris, name=""):
+    with open(path, "wb") as f:
+        f.write(stl_bytes(tris, name))
+
+
+def export_stl(d, prefix, parts=STL_PARTS, fn=DEFAULT_FN):
+    """Пишет <prefix>_<деталь>.stl для каждой детали, возвращает список путей."""
+    out_dir = os.path.dirname(prefix)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for part in parts:
+        path = f"{prefix}_{part}.stl"
+        write_stl(path, PART_MESHES[part](d, fn), f"vptc {part}")
+        paths.append(path)
+    return paths
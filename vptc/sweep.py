@@ -0,0 +1,178 @@
+import csv
+import itertools
+import os
+from functools import partial
+from multiprocessing import Pool
+
+import numpy as np
+
+from .clearance import check_clearances
+from .contact import DEFAULT_TORQUE, add_load_arguments, check_contacts, materials_from_args, period_angles
+from .core import Params, derive, min_inner_radius, profile_features, rigid_profile
+
+# Входы, по которым строится сетка перебора
+SWEEP_AXES = ("i", "d_roller", "h_roller", "Rout", "D")
+
+COLUMNS = SWEEP_AXES + (
+    "e", "Rin", "rd", "Rsep_out", "min_thickness", "bearing_name", "n_holes", "Rin_min", "feasible",
+    "clearance_roller_profile", "clearance_roller_roller", "clearance_roller_separator",
+    "contact_stress", "h_roller_min",
+)
+
+# Сколько комбинаций отдаётся процессу за одну задачу
+CHUNK_SIZE = 512
+
+
+def parse_range(text, value_type=float):
+    """Значения оси перебора: "a:b:шаг" (b включительно), "a,b,c" или одно число."""
+    text = text.strip()
+    if ":" in text:
+        start, stop, step = (float(v) for v in text.split(":"))
+        if step <= 0:
+            raise ValueError(f"Шаг диапазона должен быть > 0: {text}")
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        values = start + step * np.arange(count)
+        return [value_type(round(v, 9)) for v in values]
+    return [value_type(v) for v in text.split(",") if v.strip()]
+
+
+def grid_size(grid):
+    size = 1
+    for name in SWEEP_AXES:
+        size *= len(grid[name])
+    return size
+
+
+def iter_grid(grid):
+    """Комбинации сетки по одной, без построения полного списка."""
+    return itertools.product(*(grid[name] for name in SWEEP_AXES))
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def evaluate(values, resolution=600, torque=DEFAULT_TORQUE, materials=None):
+    """Производные размеры одной комбинации; профиль строится и сразу отбрасывается.
+
+    Нагрузка роликов считается при моменте torque (Н·м) за один период 2π/zg.
+    """
+    p = Params(resolution=resolution, **dict(zip(SWEEP_AXES, values)))
+    d = derive(p)
+    Rin_min = min_inner_radius(p.d_roller, d["zg"])
+    feasible = d["Rin"] > Rin_min
+    min_thickness = p.D / 2 - profile_features(d["e"], d["zg"], d["rd"], d["r_roller"]).r_max
+    row = values + (
+        d["e"], d["Rin"], d["rd"], d["Rsep_out"], min_thickness,
+        d["bearing"]["name"], d["n_holes"], Rin_min, feasible,
+    )
+    if not feasible:
+        # Для недопустимой геометрии зазоры и нагрузки не считаются: колонки остаются пустыми
+        return row + (None,) * (len(COLUMNS) - len(row))
+    _, x_rigid, y_rigid = rigid_profile(d["e"], d["zg"], d["rd"], d["r_roller"], resolution)
+    checks = {c.name: c.value for c in check_clearances(
+        x_rigid, y_rigid, d["e"], d["zg"], d["z_rollers"], d["rd"], d["r_roller"], d["Rsep_in"], d["Rsep_out"])}
+    contacts = check_contacts(d["e"], d["zg"], d["z_rollers"], d["rd"], d["r_roller"], p.h_roller,
+                              period_angles(d["zg"]), torque, materials)
+    return row + (
+        checks["roller_profile"], checks["roller_roller"], checks["roller_separator"],
+        contacts.peak_stress, contacts.h_min,
+    )
+
+
+def _evaluate_chunk(chunk, resolution, torque, materials):
+    return [evaluate(values, resolution, torque, materials) for values in chunk]
+
+
+def sweep(grid, resolution=600, jobs=None, torque=DEFAULT_TORQUE, materials=None):
+    """Строки результатов по всем комбинациям сетки, в порядке перебора.
+
+    Комбинации отдаются пулу процессов порциями по CHUNK_SIZE, результаты
+    возвращаются по мере готовности, поэтому в памяти держится лишь несколько порций.
+    """
+    chunks = _chunks(iter_grid(grid), CHUNK_SIZE)
+    worker = partial(_evaluate_chunk, resolution=resolution, torque=torque, materials=materials)
+    if jobs == 1:
+        for chunk in chunks:
+            yield from worker(chunk)
+        return
+    with Pool(jobs or os.cpu_count()) as pool:
+        for rows in pool.imap(worker, chunks):
+            yield from rows
+
+
+# === Запись результатов ===
+def write_csv(rows, path):
+    count = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_parquet(rows, path, row_group=65536):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Для записи Parquet нужен пакет pyarrow (pip install pyarrow)")
+    count = 0
+    writer = None
+    try:
+        for chunk in _chunks(rows, row_group):
+            table = pa.table({name: column for name, column in zip(COLUMNS, zip(*chunk))})
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            count += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def write_rows(rows, path):
+    if path.endswith(".parquet"):
+        return write_parquet(rows, path)
+    return write_csv(rows, path)
+
+
+# === Режим перебора ===
+def add_arguments(parser):
+    defaults = Params()
+    parser.add_argument("-i", "--ratio", dest="i", default=str(defaults.i),
+                        help="передаточные числа: a:b:шаг или a,b,c")
+    parser.add_argument("--d-roller", dest="d_roller", default=str(defaults.d_roller), help="диаметры роликов (мм)")
+    parser.add_argument("--h-roller", dest="h_roller", default=str(defaults.h_roller), help="высоты роликов (мм)")
+    parser.add_argument("--rout", dest="Rout", default=str(defaults.Rout), help="внешние радиусы впадин (мм)")
+    parser.add_argument("-D", "--diameter", dest="D", default=str(defaults.D), help="внешние диаметры редуктора (мм)")
+    parser.add_argument("--resolution", type=int, default=defaults.resolution,
+                        help="количество точек профиля для проверки зазоров ролик — профиль "
+                             "(толщина стенки считается по точным вершинам и от него не зависит)")
+    add_load_arguments(parser)
+    parser.add_argument("-j", "--jobs", type=int, help="число процессов (по умолчанию — все ядра)")
+    parser.add_argument("-o", "--output", default="./output/sweep.csv", help="файл результатов (.csv или .parquet)")
+
+
+def run(args):
+    try:
+        grid = {name: parse_range(getattr(args, name), int if name == "i" else float) for name in SWEEP_AXES}
+        materials = materials_from_args(args)
+    except ValueError as exc:
+        print(f"Ошибка: {exc}")
+        return 1
+    out_dir = os.path.dirname(args.output)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    print(f"Комбинаций: {grid_size(grid)}")
+    count = write_rows(sweep(grid, args.resolution, args.jobs, args.torque, materials), args.output)
+    print(f"✅ Результаты перебора ({count} строк) сохранены в: {args.output}")
+    return 0
@@ -0,0 +1,235 @@
+import os
+from dataclasses import dataclass
+from multiprocessing import Pool
+
+import numpy as np
+
+from .core import center_radius
+from .kinematics import ARCMIN, ROOT_TOL
+
+# Выборок в одной порции: массивы (выборки × углы × ролики) порции занимают десятки МБ
+TOLERANCE_CHUNK = 16384
+# Углов эксцентрика на период 2π/zg, через который картина роликов повторяется
+TOLERANCE_ANGLES = 16
+# Допуски по умолчанию (мм): ролики покупные, эксцентрик и корпус печатные
+DEFAULT_TOLERANCES = {
+    "d_roller": "normal:0.01",
+    "e": "normal:0.02",
+    "Rout": "normal:0.05",
+    "rd": "normal:0.03",
+}
+PERCENTILES = (1, 5, 50, 95, 99)
+# Округление: номинальная сборка без отклонений даёт люфт и зазор порядка -1e-15, это не заклинивание
+JAM_ANGLE = ROOT_TOL    # рад
+JAM_GAP = 1e-9          # мм
+
+
+# === Распределения отклонений ===
+def parse_distribution(text):
+    """Распределение отклонения: "0.02" — постоянное смещение, "normal:σ", "normal:μ,σ",
+    "uniform:t" (±t) или "uniform:a,b"."""
+    kind, _, args = text.strip().partition(":")
+    if not args:
+        return ("const", float(kind))
+    values = [float(v) for v in args.split(",")]
+    if kind == "normal" and len(values) in (1, 2):
+        return ("normal", *([0.0] + values)[-2:])
+    if kind == "uniform" and len(values) == 1:
+        return ("uniform", -abs(values[0]), abs(values[0]))
+    if kind == "uniform" and len(values) == 2:
+        return ("uniform", *values)
+    raise ValueError(f"Неизвестное распределение: {text}")
+
+
+def draw(rng, distribution, size):
+    kind, *args = distribution
+    if kind == "normal":
+        return rng.normal(args[0], args[1], size)
+    if kind == "uniform":
+        return rng.uniform(args[0], args[1], size)
+    return np.full(size, args[0])
+
+
+# === Модель зазоров ===
+def nominal_state(d, angles=TOLERANCE_ANGLES):
+    """Величины номинальной передачи в узлах (углы × ролики), не зависящие от отклонений.
+
+    Ролик k стоит в пазу под углом φ = -ψ/(zg - 1) + 2πk/z, эксцентрик давит на него
+    под углом α = ψ - φ. Кривая центров роликов, по которой нарезан профиль, — ρ0(φ) = l0(zg·φ).
+    """
+    psi = np.linspace(0.0, 2 * np.pi / d.zg, angles, endpoint=False)
+    phi = -psi[:, None] / (d.zg - 1) + 2 * np.pi * np.arange(d.z_rollers)[None, :] / d.z_rollers
+    alpha = psi[:, None] - phi
+    R = d.rd + d.r_roller
+    rho, S = center_radius(d.zg * phi, d.e, R)
+    s = np.sin(d.zg * phi)
+    drho = d.zg * (-d.e * s - d.e**2 * s * np.cos(d.zg * phi) / S)
+    return {
+        "psi": psi,
+        "sin": np.sin(alpha).ravel(),
+        "cos": np.cos(alpha).ravel(),
+        "rho": rho.ravel(),
+        "drho": drho.ravel(),
+        # Смещение эквидистанты по нормали на δ сдвигает её радиус при том же угле на δ·sqrt(1 + (ρ'/ρ)²)
+        "offset": np.sqrt(1 + (drho / rho) ** 2).ravel(),
+        "shape": alpha.shape,
+        "limit": np.pi / (4 * d.zg),
+        "r_nominal": d.r_roller,
+        "clearance": d.params.clearance,
+    }
+
+
+def evaluate(state, e, rd, r_roller, offset):
+    """Свободный ход сепаратора и наименьший радиальный зазор для массивов выборок.
+
+    e, rd, r_roller — фактические эксцентриситет, радиус эксцентрика и ролика,
+    offset — отклонение профиля корпуса по нормали (мм, > 0 — профиль больше).
+    Как в kinematics.simulate, поворот сепаратора до касания ищется для каждого
+    ролика (здесь — одним шагом Ньютона от номинального положения), набегающие ролики
+    ограничивают его с одной стороны, сбегающие — с другой. Возвращает массивы
+    (выборки × углы) люфта (рад, < 0 — натяг) и (выборки,) наименьшего зазора (мм).
+    """
+    # Выборки — по последней оси: свёртка по роликам идёт вдоль непрерывной памяти
+    e, rd, r_roller, offset = (np.asarray(v, dtype=float)[None, :] for v in (e, rd, r_roller, offset))
+    sin, cos = state["sin"][:, None], state["cos"][:, None]
+    e_sin = e * sin
+    S = e_sin**2
+    np.subtract((rd + r_roller) ** 2, S, out=S)
+    np.sqrt(S, out=S)
+    # Профиль нарезан под номинальный ролик с зазором печати: зазор центра равен
+    # смещению профиля плюс зазор печати плюс недобор ролика
+    g = (offset + state["clearance"] + state["r_nominal"] - r_roller) * state["offset"][:, None]
+    g += state["rho"][:, None]
+    g -= e * cos
+    g -= S
+    dg = e_sin * cos
+    dg *= e
+    dg /= S
+    np.subtract(state["drho"][:, None] - e_sin, dg, out=dg)
+
+    limit = state["limit"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = np.divide(g, dg)
+    np.negative(delta, out=delta)
+    active = np.abs(delta) < limit
+    shape = state["shape"] + (e.shape[1],)
+    lead = np.where(active & (dg > 0), delta, -limit).reshape(shape).max(axis=1)
+    lag = np.where(active & (dg < 0), delta, limit).reshape(shape).min(axis=1)
+    lag -= lead
+    return lag.T, g.min(axis=0)
+
+
+@dataclass
+class ToleranceResult:
+    samples: int
+    backlash_mean: np.ndarray   # средний за оборот люфт выборки (рад)
+    backlash_min: np.ndarray    # наименьший люфт выборки (рад), < 0 — заклинивание
+    clearance: np.ndarray       # наименьший радиальный зазор роликов (мм)
+    roller_gap: np.ndarray      # наименьший зазор между соседними роликами (мм)
+
+    @property
+    def jammed(self):
+        return (self.backlash_min < -JAM_ANGLE) | (self.roller_gap < -JAM_GAP)
+
+    def summary(self):
+        # При натяге люфта нет; величина «отрицательного люфта» из линейной модели физического смысла не имеет
+        mean = np.maximum(self.backlash_mean, 0) * ARCMIN
+        worst = np.maximum(self.backlash_min, 0) * ARCMIN
+        return {
+            "samples": self.samples,
+            "jam_fraction": float(np.mean(self.jammed)),
+            "backlash_mean_arcmin": dict(zip(PERCENTILES, np.percentile(mean, PERCENTILES).tolist())),
+            "backlash_min_arcmin": dict(zip(PERCENTILES, np.percentile(worst, PERCENTILES).tolist())),
+            "clearance_mm": dict(zip(PERCENTILES, np.percentile(self.clearance, PERCENTILES).tolist())),
+        }
+
+
+def _chunk(task):
+    nominal, state, tolerances, size, seed = task
+    e0, rd0, r0, z_rollers = nominal
+    rng = np.random.default_rng(seed)
+    e = e0 + draw(rng, tolerances["e"], size)
+    rd = rd0 + draw(rng, tolerances["rd"], size)
+    r_roller = r0 + draw(rng, tolerances["d_roller"], size) / 2
+    offset = draw(rng, tolerances["Rout"], size)
+    backlash, clearance = evaluate(state, e, rd, r_roller, offset)
+    # Соседние ролики ближе всего друг к другу, когда эксцентрик прижал их к наименьшему радиусу R - e
+    gap = 2 * (rd + r_roller - e) * np.sin(np.pi / z_rollers) - 2 * r_roller
+    return backlash.mean(axis=1), backlash.min(axis=1), clearance, gap
+
+
+def analyze(d, samples=100000, tolerances=None, angles=TOLERANCE_ANGLES, seed=0, jobs=1):
+    """Монте-Карло по допускам: samples сборок со случайными отклонениями размеров от d.
+
+    tolerances — словарь распределений (parse_distribution) для d_roller, e, Rout
+    (смещение профиля корпуса по нормали) и rd. Выборки делятся на порции со своими
+    потомками seed, так что результат не зависит от числа процессов jobs.
+    """
+    if samples < 1:
+        raise ValueError(f"Число сборок samples должно быть не меньше 1, получено {samples}")
+    if angles < 1:
+        raise ValueError(f"Число углов angles должно быть не меньше 1, получено {angles}")
+    if jobs < 0:
+        raise ValueError(f"Число процессов jobs не может быть отрицательным, получено {jobs}")
+    tolerances = {name: parse_distribution(spec) if isinstance(spec, str) else spec
+                  for name, spec in {**DEFAULT_TOLERANCES, **(tolerances or {})}.items()}
+    state = nominal_state(d, angles)
+    nominal = (d.e, d.rd, d.r_roller, d.z_rollers)
+    sizes = [min(TOLERANCE_CHUNK, samples - start) for start in range(0, samples, TOLERANCE_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(nominal, state, tolerances, size, child) for size, child in zip(sizes, seeds)]
+    if jobs == 1:
+        parts = list(map(_chunk, tasks))
+    else:
+        with Pool(jobs or os.cpu_count()) as pool:
+            parts = pool.map(_chunk, tasks)
+    columns = [np.concatenate(column) for column in zip(*parts)]
+    return ToleranceResult(samples, *columns)
+
+
+# === Режим анализа допусков ===
+def add_arguments(parser):
+    from .cli import add_param_arguments
+
+    add_param_arguments(parser)
+    parser.add_argument("--samples", type=int, default=100000, help="число случайных сборок")
+    parser.add_argument("--angles", type=int, default=TOLERANCE_ANGLES,
+                        help="углов эксцентрика на период 2π/zg")
+    for name, flag, what in (("d_roller", "--tol-d-roller", "диаметра роликов"),
+                             ("e", "--tol-e", "эксцентриситета"),
+                             ("Rout", "--tol-rout", "профиля корпуса по нормали"),
+                             ("rd", "--tol-rd", "радиуса эксцентрика")):
+        parser.add_argument(flag, dest=f"tol_{name}", default=DEFAULT_TOLERANCES[name],
+                            help=f"отклонение {what}, мм: normal:σ, normal:μ,σ, uniform:t, uniform:a,b или "
+                                 f"число (по умолчанию {DEFAULT_TOLERANCES[name]})")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генератора случайных чисел")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="число процессов (0 — по числу ядер)")
+    parser.add_argument("-o", "--output", help="CSV с результатами каждой сборки")
+
+
+def run(args):
+    from .cli import params_from_args
+    from .core import GeometryError, design
+
+    try:
+        d = design(params_from_args(args))
+        tolerances = {name: parse_distribution(getattr(args, f"tol_{name}")) for name in DEFAULT_TOLERANCES}
+        result = analyze(d, args.samples, tolerances, args.angles, args.seed, args.jobs)
+    except (GeometryError, ValueError) as exc:
+        print(f"Ошибка: {exc}")
+        return 1
+    s = result.summary()
+    print(f"\nДопуски ({s['samples']} сборок, передаточное число {d.params.i}):")
+    print(f"- {'перцентили':<20}" + "".join(f"{f'P{q}':>9}" for q in PERCENTILES))
+    for title, key, fmt in (("люфт средний, ′", "backlash_mean_arcmin", ".3f"),
+                            ("люфт наименьший, ′", "backlash_min_arcmin", ".3f"),
+                            ("зазор роликов, мм", "clearance_mm", ".4f")):
+        print(f"- {title:<20}" + "".join(f"{s[key][q]:>9{fmt}}" for q in PERCENTILES))
+    print(f"- Заклинивает: {s['jam_fraction'] * 100:.2f}% сборок")
+    if args.output:
+        data = np.column_stack([result.backlash_mean * ARCMIN, result.backlash_min * ARCMIN,
+                                result.clearance, result.roller_gap, result.jammed])
+        np.savetxt(args.output, data, fmt=["%.6f"] * 4 + ["%d"], delimiter=",", comments="",
+                   header="backlash_mean_arcmin,backlash_min_arcmin,clearance_mm,roller_gap_mm,jammed")
+        print(f"✅ Результаты сборок сохранены в: {args.output}")
+    return 0